@@ -0,0 +1,64 @@
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from cli.interface import IncidentCLI
+from persistence.storage import IncidentStorageHandler
+from .workload import WorkloadSpec, generate_incidents
+
+
+def median_ms(operation, runs: int) -> float:
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def transition_microseconds(cli: IncidentCLI, cycles: int) -> float:
+
+    # One create, assign and resolve per cycle; reported per transition.
+    started = time.perf_counter()
+    for number in range(cycles):
+        incident = cli.create_incident("security", "high", f"benchmark incident {number}")
+        cli.assign_incident(incident.id)
+        cli.resolve_incident(incident.id)
+    return (time.perf_counter() - started) / (cycles * 3) * 1e6
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compare dashboard queries on running aggregates with rebuilding them from history.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=2_000, help="Create/assign/resolve cycles timed per size.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'rebuild ms':>10} | {'dashboard ms':>12} | {'transition us off':>17} | {'transition us on':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            file_path = os.path.join(directory, f"incidents-{size}.json")
+            IncidentStorageHandler(file_path).save_all_incidents_to_json(generate_incidents(WorkloadSpec(count=size, seed=args.seed)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli = IncidentCLI(IncidentStorageHandler(file_path))
+
+            # Without analytics built, transitions skip the aggregates entirely.
+            without = transition_microseconds(cli, args.cycles)
+            # Dropping the aggregates before each call makes every query scan the whole history,
+            # which is what a dashboard without running aggregates would cost.
+            rebuild = median_ms(lambda: (setattr(cli, "analytics", None), cli.analytics_dashboard()), max(1, args.runs // 10))
+            dashboard = median_ms(cli.analytics_dashboard, args.runs)
+            with_analytics = transition_microseconds(cli, args.cycles)
+            print(f"{size:>10} | {rebuild:>10.1f} | {dashboard:>12.2f} | {without:>17.1f} | {with_analytics:>16.1f}")
+            cli.close()
+            del cli
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+from typing import List
+from cli.batch import DEFAULT_BATCH_SIZE, run_batch
+from cli.interface import IncidentCLI
+from persistence.factory import create_storage_handler
+from .workload import DESCRIPTION_VOCABULARY
+
+
+def generate_commands(count: int, seed: int) -> List[str]:
+
+    # Creates make up half the stream; the rest assigns and then resolves the earliest of them.
+    rng = random.Random(seed)
+    creates = count // 2
+    assigns = count // 3
+    resolves = count - creates - assigns
+    commands = []
+    for _ in range(creates):
+        commands.append(json.dumps({
+            "op": "create",
+            "incident_type": rng.choice(("infrastructure", "application", "security")),
+            "priority_level": rng.choice(("low", "medium", "high")),
+            "description": " ".join(rng.choices(DESCRIPTION_VOCABULARY, k=rng.randint(4, 12))),
+        }))
+    for number in range(1, assigns + 1):
+        commands.append(json.dumps({"op": "assign", "id": str(number)}))
+    for number in range(1, resolves + 1):
+        commands.append(json.dumps({"op": "resolve", "id": str(number)}))
+    return commands
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Measure headless batch-mode throughput per storage backend.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--backends", nargs="+", default=["json", "journal", "sqlite"])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    commands = generate_commands(args.count, args.seed)
+    print(f"{'backend':<10} | {'commands':>9} | {'batches':>8} | {'seconds':>8} | {'commands/s':>11}")
+    for backend in args.backends:
+        with tempfile.TemporaryDirectory() as directory:
+            storage = create_storage_handler(backend, os.path.join(directory, "incidents.json"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli = IncidentCLI(storage)
+            summary = run_batch(cli, iter(commands), args.batch_size, output=io.StringIO())
+            storage.close()
+        print(f"{backend:<10} | {summary.commands:>9} | {summary.batches:>8} | {summary.seconds:>8.2f} | {summary.commands_per_second:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
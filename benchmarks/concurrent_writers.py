@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+from cli.interface import IncidentCLI, IncidentOperationError
+from persistence.storage import IncidentStorageHandler
+
+
+INCIDENT_TYPES = ("infrastructure", "application", "security")
+PRIORITY_LEVELS = ("low", "medium", "high")
+
+# (id, version, status, operator, description) of one successful transition.
+TransitionRecord = Tuple[str, int, str, str, str]
+
+
+def _record(incident) -> TransitionRecord:
+
+    return (incident.id, incident.version, incident.status, incident.assigned_operator, incident.description)
+
+
+class SaveWindow:
+
+    # Transitions enter shared, so threads drive the IncidentCLI concurrently; a save enters
+    # alone. That keeps a save from landing between a transition and the record of it, which
+    # would credit the transition to the wrong save.
+    def __init__(self):
+
+        self._condition = threading.Condition()
+        self._active = 0
+        self._saving = False
+
+    @contextlib.contextmanager
+    def transition(self) -> Iterator[None]:
+
+        with self._condition:
+            while self._saving:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if not self._active:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def save(self) -> Iterator[None]:
+
+        with self._condition:
+            while self._saving:
+                self._condition.wait()
+            # Claimed before waiting, so a steady stream of transitions cannot hold a save off.
+            self._saving = True
+            while self._active:
+                self._condition.wait()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._saving = False
+                self._condition.notify_all()
+
+
+def run_worker(file_path: str, worker: int, operations: int, threads: int, save_every: int, seed: int) -> Dict:
+
+    # One process: threads share an IncidentCLI and pick from create, claim-a-pending-incident
+    # and resolve. A transition only counts as acknowledged once the save that carries it
+    # succeeds; saves that lose to another process report the incidents whose updates lost.
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(IncidentStorageHandler(file_path))
+    window = SaveWindow()
+    totals_lock = threading.Lock()
+    unsaved: List[TransitionRecord] = []
+    totals = {"acknowledged": [], "rejected": 0, "stale": 0, "operations": 0}
+
+    def save() -> None:
+
+        with window.save():
+            # The per-incident conflict warnings are counted below instead.
+            with contextlib.redirect_stderr(io.StringIO()):
+                rejected_ids = {incident.id for incident in cli.save_all_incidents()}
+            for record in unsaved:
+                if record[0] in rejected_ids:
+                    totals["rejected"] += 1
+                else:
+                    totals["acknowledged"].append(record)
+            unsaved.clear()
+
+    def work(thread: int) -> None:
+
+        rng = random.Random(seed * 1000 + worker * 100 + thread)
+        for number in range(operations // threads):
+            choice = rng.random()
+            stale = False
+            with window.transition():
+                try:
+                    if choice < 0.4:
+                        incident = cli.create_incident(
+                            rng.choice(INCIDENT_TYPES), rng.choice(PRIORITY_LEVELS),
+                            f"worker {worker} thread {thread} incident {number}"
+                        )
+                    else:
+                        status = "pending" if choice < 0.7 else "in_progress"
+                        candidates = cli.page_incidents(status=status, page_size=16).incidents
+                        if not candidates:
+                            continue
+                        target = rng.choice(candidates)
+                        if status == "pending":
+                            incident = cli.assign_incident(target.id, expected_version=target.version)
+                        else:
+                            incident = cli.resolve_incident(target.id, expected_version=target.version)
+                    with totals_lock:
+                        unsaved.append(_record(incident))
+                except IncidentOperationError:
+                    stale = True
+            with totals_lock:
+                totals["stale"] += stale
+                totals["operations"] += 1
+                due = totals["operations"] % save_every == 0
+            if due:
+                save()
+
+    workers = [threading.Thread(target=work, args=(thread,)) for thread in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    save()
+    cli.close()
+    return totals
+
+
+def run_processes(file_path: str, processes: int, threads: int, operations: int, save_every: int, seed: int) -> List[Dict]:
+
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_worker_entry, args=((file_path, worker, operations, threads, save_every, seed), results))
+        for worker in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    totals = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    return totals
+
+
+def _worker_entry(arguments: tuple, results) -> None:
+
+    results.put(run_worker(*arguments))
+
+
+def find_lost_updates(file_path: str, acknowledged: List[TransitionRecord]) -> List[str]:
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        stored_records = json.load(file)
+    problems = []
+    stored: Dict[str, Dict] = {}
+    for item in stored_records:
+        if item["id"] in stored:
+            problems.append(f"{item['id']}: stored twice")
+        stored[item["id"]] = item
+
+    by_incident: Dict[str, Dict[int, TransitionRecord]] = {}
+    for record in acknowledged:
+        versions = by_incident.setdefault(record[0], {})
+        previous = versions.get(record[1])
+        if previous is not None and previous != record:
+            # Two writers both acknowledged a different state for the same version.
+            problems.append(f"{record[0]}: version {record[1]} acknowledged as both {previous[2:4]} and {record[2:4]}")
+        versions[record[1]] = record
+
+    for incident_id, versions in by_incident.items():
+        latest = versions[max(versions)]
+        item = stored.get(incident_id)
+        if item is None:
+            problems.append(f"{incident_id}: acknowledged but missing")
+        elif (item["version"], item["status"], item["assigned_operator"], item["description"]) != latest[1:]:
+            problems.append(f"{incident_id}: stored as version {item['version']} {item['status']}/{item['assigned_operator']}, "
+                            f"last acknowledged version {latest[1]} {latest[2]}/{latest[3]}")
+    return problems
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Run concurrent writer processes against one incidents.json and check for lost updates.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=2, help="Threads sharing each process's IncidentCLI.")
+    parser.add_argument("--operations", type=int, default=400, help="Operations per process.")
+    parser.add_argument("--save-every", type=int, default=5, help="Operations between saves in each process.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "incidents.json")
+        started = time.perf_counter()
+        totals = run_processes(file_path, args.processes, args.threads, args.operations, args.save_every, args.seed)
+        elapsed = time.perf_counter() - started
+
+        acknowledged = [record for total in totals for record in total["acknowledged"]]
+        problems = find_lost_updates(file_path, acknowledged)
+        with open(file_path, "r", encoding="utf-8") as file:
+            stored_count = len(json.load(file))
+
+    operations = sum(total["operations"] for total in totals)
+    print(f"{args.processes} processes x {args.threads} threads, {operations} operations in {elapsed:.2f}s "
+          f"({operations / elapsed:.0f} ops/s)")
+    print(f"Acknowledged transitions: {len(acknowledged)} | stored incidents: {stored_count}")
+    print(f"Rejected at save (changed by another process): {sum(total['rejected'] for total in totals)}")
+    print(f"Rejected in memory (stale version or status): {sum(total['stale'] for total in totals)}")
+    if problems:
+        for problem in problems[:20]:
+            print(f"✖ {problem}")
+        print(f"✖ {len(problems)} lost or conflicting updates.")
+        sys.exit(1)
+    print("✔ No acknowledged update was lost.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
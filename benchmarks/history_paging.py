@@ -0,0 +1,75 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from cli.interface import IncidentCLI
+from persistence.storage import IncidentStorageHandler
+from .workload import WorkloadSpec, generate_incidents
+
+
+def materialized_history(cli: IncidentCLI) -> None:
+
+    # The display path before pagination: collect, sort, then print every incident.
+    for incident in sorted(cli.history_log, key=lambda i: int(i.id)):
+        print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
+        print(f"Assigned to: {incident.assigned_operator}")
+        print(f"Description: {incident.description}\n")
+
+
+def page_through_history(cli: IncidentCLI, page_size: int) -> int:
+
+    pages = 0
+    resume_token = None
+    while True:
+        page = cli.page_incidents(status="resolved", page_size=page_size, resume_token=resume_token)
+        pages += 1
+        resume_token = page.next_token
+        if resume_token is None:
+            return pages
+
+
+def measure(operation) -> tuple:
+
+    # Output is discarded rather than captured, so the peak is the display pipeline's own memory.
+    with open(os.devnull, "w", encoding="utf-8") as sink, contextlib.redirect_stdout(sink):
+        tracemalloc.start()
+        started = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compare first-page latency and memory of paged history output.")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "incidents.json")
+        IncidentStorageHandler(file_path).save_all_incidents_to_json(generate_incidents(WorkloadSpec(count=args.size, seed=args.seed)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli = IncidentCLI(IncidentStorageHandler(file_path))
+
+    print(f"{len(cli.history_log)} resolved incidents, page size {args.page_size}")
+    print(f"{'operation':<32} | {'seconds':>8} | {'peak MB':>8}")
+    rows = (
+        ("first page", lambda: cli.page_incidents(status="resolved", page_size=args.page_size)),
+        ("page through all history", lambda: page_through_history(cli, args.page_size)),
+        ("display_history (streamed)", cli.display_history),
+        ("sort and print everything", lambda: materialized_history(cli)),
+    )
+    for name, operation in rows:
+        elapsed, peak = measure(operation)
+        print(f"{name:<32} | {elapsed:>8.3f} | {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Callable, List
+from incident.models import Incident
+from incident.store import IncidentStore
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def build_incidents(count: int) -> List[Incident]:
+
+    created_at = datetime.now()
+    return [
+        Incident(
+            id=str(number).zfill(3),
+            incident_type="security",
+            priority_level="high",
+            description=f"Incident number {number}",
+            created_at=created_at,
+            assigned_operator=None,
+            status="pending"
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def nanoseconds_per_call(operation: Callable[[str], None], incident_ids: List[str]) -> float:
+
+    start = time.perf_counter_ns()
+    for incident_id in incident_ids:
+        operation(incident_id)
+    return (time.perf_counter_ns() - start) / len(incident_ids)
+
+
+def run_benchmark(size: int, samples: int, seed: int) -> dict:
+
+    incidents = build_incidents(size)
+    store = IncidentStore(incidents)
+    rng = random.Random(seed)
+    sampled_ids = [str(rng.randint(1, size)) for _ in range(samples)]
+    unique_ids = list(dict.fromkeys(incident_id.zfill(3) for incident_id in sampled_ids))
+
+    def transition(incident_id: str) -> None:
+        incident = store.get(incident_id)
+        store.replace(Incident(
+            id=incident.id,
+            incident_type=incident.incident_type,
+            priority_level=incident.priority_level,
+            description=incident.description,
+            created_at=incident.created_at,
+            assigned_operator="carol",
+            status="in_progress"
+        ))
+
+    return {
+        "size": size,
+        "lookup_ns": nanoseconds_per_call(store.get, sampled_ids),
+        "transition_ns": nanoseconds_per_call(transition, sampled_ids),
+        "remove_ns": nanoseconds_per_call(store.remove, unique_ids),
+    }
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Micro-benchmark IncidentStore lookup, transition and removal.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--samples", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'lookup ns':>10} | {'transition ns':>13} | {'remove ns':>10}")
+    for size in args.sizes:
+        result = run_benchmark(size, args.samples, args.seed)
+        print(f"{result['size']:>10} | {result['lookup_ns']:>10.0f} | {result['transition_ns']:>13.0f} | {result['remove_ns']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
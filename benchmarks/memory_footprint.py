@@ -0,0 +1,96 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from incident.models import Incident, incident_from_dict
+from incident.compact import FlyweightPool, compact_incident_from_dict
+
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+
+
+def build_raw_archive(count: int, seed: int) -> str:
+
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    records = []
+    for number in range(1, count + 1):
+        status = rng.choice(("pending", "in_progress", "escalated", "resolved"))
+        records.append({
+            "id": str(number).zfill(3),
+            "incident_type": rng.choice(("infrastructure", "application", "security")),
+            "priority_level": rng.choice(("low", "medium", "high")),
+            "description": f"Synthetic incident {number} on host-{rng.randint(1, 500)}",
+            "created_at": (start + timedelta(seconds=number * 30)).isoformat(),
+            "assigned_operator": None if status == "pending" else rng.choice(("alice", "bob", "carol")),
+            "status": status
+        })
+    return json.dumps(records)
+
+
+def plain_incident_from_dict(item: Dict) -> Incident:
+
+    # The loader as it was before interning: every record keeps its own strings.
+    return Incident(
+        id=item["id"],
+        incident_type=item["incident_type"],
+        priority_level=item["priority_level"],
+        description=item["description"],
+        created_at=datetime.fromisoformat(item["created_at"]),
+        assigned_operator=item["assigned_operator"],
+        status=item["status"]
+    )
+
+
+def measure_bytes_per_incident(raw_archive: str, build: Callable[[List[Dict]], list]) -> float:
+
+    gc.collect()
+    tracemalloc.start()
+    raw_data = json.loads(raw_archive)
+    incidents = build(raw_data)
+    del raw_data
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(incidents)
+    del incidents
+    return current / count
+
+
+def build_plain(raw_data: List[Dict]) -> List[Incident]:
+
+    return [plain_incident_from_dict(item) for item in raw_data]
+
+
+def build_interned(raw_data: List[Dict]) -> List[Incident]:
+
+    return [incident_from_dict(item) for item in raw_data]
+
+
+def build_compact(raw_data: List[Dict]) -> list:
+
+    pool = FlyweightPool()
+    return [compact_incident_from_dict(item, pool) for item in raw_data]
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Report tracemalloc bytes per incident for the plain and compact models.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'Incident B/inc':>14} | {'interned B/inc':>14} | {'Compact B/inc':>13} | {'saving':>7}")
+    for size in args.sizes:
+        raw_archive = build_raw_archive(size, args.seed)
+        before = measure_bytes_per_incident(raw_archive, build_plain)
+        interned = measure_bytes_per_incident(raw_archive, build_interned)
+        after = measure_bytes_per_incident(raw_archive, build_compact)
+        print(f"{size:>10} | {before:>14.1f} | {interned:>14.1f} | {after:>13.1f} | {1 - after / before:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import argparse
+import os
+from incident.filters import filter_incidents_by_text
+from incident.parallel import ParallelQueryEngine
+from .suite import time_call
+from .workload import WorkloadSpec, generate_incidents
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Measure archive-wide scans across worker counts.")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    # A back-reference defeats the literal prefilters, so every description is really scanned.
+    parser.add_argument("--pattern", default=r"(\w+)\s+\1")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    incidents = generate_incidents(WorkloadSpec(count=args.size, seed=args.seed))
+    print(f"{args.size} incidents on {os.cpu_count()} CPUs")
+
+    baseline = time_call(lambda: list(filter_incidents_by_text(incidents, args.pattern)), args.repeat)
+    print(f"{'single-process list scan':<28} | text {baseline:>7.2f}s")
+
+    print(f"{'workers':>8} | {'text s':>8} | {'speedup':>7}")
+    first_text = None
+    for workers in args.workers:
+        with ParallelQueryEngine(incidents, workers=workers) as engine:
+            # Warm-up call so pool start-up and the first mmap are not counted.
+            engine.query(status="pending")
+            text = time_call(lambda: engine.filter_by_text(args.pattern), args.repeat)
+        first_text = first_text or text
+        print(f"{workers:>8} | {text:>8.2f} | {first_text / text:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
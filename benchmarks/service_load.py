@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from .workload import DESCRIPTION_VOCABULARY
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def free_port() -> int:
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def next_command(rng: random.Random, created_ids: List[str], read_ratio: float) -> dict:
+
+    if created_ids and rng.random() < read_ratio:
+        return {"op": "query", "status": rng.choice(("pending", "in_progress", "escalated")), "limit": 20}
+    if created_ids and rng.random() < 0.3:
+        # Each created incident is assigned at most once, so errors point at the server.
+        return {"op": "assign", "id": created_ids.pop(rng.randrange(len(created_ids)))}
+    return {
+        "op": "create",
+        "incident_type": rng.choice(("infrastructure", "application", "security")),
+        "priority_level": rng.choice(("low", "medium", "high")),
+        "description": " ".join(rng.choices(DESCRIPTION_VOCABULARY, k=rng.randint(4, 12))),
+    }
+
+
+async def run_client(host: str, port: int, requests: int, read_ratio: float, seed: int,
+                     latencies: List[float], errors: List[str]) -> None:
+
+    rng = random.Random(seed)
+    created_ids: List[str] = []
+    reader, writer = await asyncio.open_connection(host, port, limit=16 * 1024 * 1024)
+    try:
+        for _ in range(requests):
+            command = next_command(rng, created_ids, read_ratio)
+            started = time.perf_counter()
+            writer.write(json.dumps(command).encode("utf-8") + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            if not response.get("ok"):
+                errors.append(response.get("error", "unknown error"))
+            elif command["op"] == "create":
+                created_ids.append(response["id"])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(host: str, port: int, connections: int, requests: int, read_ratio: float, seed: int) -> None:
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(host, port, requests, read_ratio, seed + number, latencies, errors)
+        for number in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"connections: {connections} | requests: {len(latencies)} | errors: {len(errors)} | seconds: {elapsed:.2f}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms | p99: {percentile(latencies, 0.99) * 1000:.2f} ms | max: {latencies[-1] * 1000:.2f} ms")
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 30.0) -> None:
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Drive the incident service with concurrent JSON-lines clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Port of a running server. Without it a temporary server is started.")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="Requests sent by each connection.")
+    parser.add_argument("--read-ratio", type=float, default=0.5)
+    parser.add_argument("--backend", default="journal", help="Storage backend of the temporary server.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server: Optional[subprocess.Popen] = None
+    port = args.port
+    with tempfile.TemporaryDirectory() as directory:
+        if port is None:
+            port = free_port()
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            server = subprocess.Popen(
+                [sys.executable, "-m", "service", "--host", args.host, "--port", str(port)],
+                cwd=directory, stdout=subprocess.DEVNULL,
+                env={**os.environ, "INCIDENT_STORAGE_BACKEND": args.backend,
+                     "PYTHONPATH": os.pathsep.join(filter(None, (project_root, os.environ.get("PYTHONPATH"))))}
+            )
+        try:
+            asyncio.run(wait_for_server(args.host, port))
+            asyncio.run(run_load(args.host, port, args.connections, args.requests, args.read_ratio, args.seed))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
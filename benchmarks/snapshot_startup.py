@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+from persistence.snapshot import SnapshotReader, write_snapshot
+from persistence.storage import IncidentStorageHandler
+from .workload import WorkloadSpec, generate_incidents
+
+
+def time_call(operation: Callable[[], object]) -> float:
+
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compare cold-start cost of incidents.json and the mmap snapshot.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'json load':>10} | {'snap open':>10} | {'snap get':>10} | {'snap all':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "incidents.json")
+        snapshot_path = os.path.join(directory, "incidents.snap")
+        for size in args.sizes:
+            incidents = generate_incidents(WorkloadSpec(count=size, seed=args.seed))
+            IncidentStorageHandler(json_path).save_all_incidents_to_json(incidents)
+            write_snapshot(snapshot_path, incidents)
+            del incidents
+
+            json_seconds = time_call(IncidentStorageHandler(json_path).load_all_incidents_from_json)
+
+            started = time.perf_counter()
+            reader = SnapshotReader(snapshot_path)
+            open_seconds = time.perf_counter() - started
+            get_seconds = time_call(lambda: reader.get(str(size // 2).zfill(3)))
+            all_seconds = time_call(lambda: list(reader))
+            reader.close()
+
+            print(f"{size:>10} | {json_seconds * 1000:>8.1f}ms | {open_seconds * 1000:>8.3f}ms | "
+                  f"{get_seconds * 1000:>8.3f}ms | {all_seconds * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+from persistence.factory import create_storage_handler
+from .workload import WorkloadSpec, generate_incidents
+
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+PROMPT_MARKER = b"Select an option"
+
+
+def run_until_prompt(directory: str, environment: Dict[str, str], answer: bytes = b"") -> Tuple[float, str]:
+
+    # Starts main.py under -X importtime and returns the seconds until the first menu prompt
+    # is on stdout, plus the import timings from stderr. Without an answer the process is
+    # killed at the prompt so that nothing is saved.
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-u", MAIN_SCRIPT], cwd=directory, env=environment,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    output = b""
+    while PROMPT_MARKER not in output:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError(f"main.py exited before the first prompt: {output.decode(errors='replace')[-500:]}")
+        output += chunk
+    elapsed = time.perf_counter() - started
+    if answer:
+        _, errors = process.communicate(answer)
+    else:
+        process.kill()
+        _, errors = process.communicate()
+    return elapsed, errors.decode(errors="replace")
+
+
+def slowest_imports(importtime_output: str, limit: int) -> List[Tuple[int, str]]:
+
+    # Lines look like "import time: self [us] | cumulative | imported package".
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Time from process start to the first menu prompt, with and without fast start.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    # The open workload stays fixed while history grows.
+    parser.add_argument("--open", type=int, default=2_000)
+    parser.add_argument("--backend", choices=("json", "journal", "snapshot"), default="json")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=8, help="Slowest imports to list.")
+    parser.add_argument("--target-ms", type=float, default=100.0,
+                        help="Exit with status 1 if the fast-start median exceeds this.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    base_environment = dict(os.environ, INCIDENT_STORAGE_BACKEND=args.backend)
+    base_environment.pop("INCIDENT_EVENT_LOG", None)
+    base_environment.pop("INCIDENT_METRICS", None)
+    modes = (("full", dict(base_environment, INCIDENT_FAST_START="0")),
+             ("fast", dict(base_environment, INCIDENT_FAST_START="1")))
+
+    print(f"{'incidents':>10} | {'mode':>4} | {'median ms':>9} | {'min ms':>7}")
+    over_target = False
+    imports_report = ""
+    with tempfile.TemporaryDirectory() as root:
+        for size in args.sizes:
+            directory = os.path.join(root, str(size))
+            os.makedirs(directory)
+            open_share = min(1.0, args.open / size)
+            incidents = generate_incidents(WorkloadSpec(
+                count=size, seed=args.seed,
+                status_mix={"pending": open_share / 2, "in_progress": open_share / 2, "resolved": 1 - open_share}
+            ))
+            storage = create_storage_handler(args.backend, os.path.join(directory, "incidents.json"))
+            storage.save_all_incidents(incidents)
+            storage.close()
+            del incidents
+
+            for mode, environment in modes:
+                if mode == "fast":
+                    # One clean exit writes the manifest the measured runs start from.
+                    run_until_prompt(directory, environment, answer=b"8\n")
+                timings = []
+                for _ in range(args.runs):
+                    elapsed, importtime_output = run_until_prompt(directory, environment)
+                    timings.append(elapsed * 1000)
+                median = statistics.median(timings)
+                print(f"{size:>10} | {mode:>4} | {median:>9.1f} | {min(timings):>7.1f}")
+                if mode == "fast":
+                    over_target = over_target or median > args.target_ms
+                    imports_report = importtime_output
+
+    print("\nSlowest imports of the last fast start (cumulative ms):")
+    for cumulative, name in slowest_imports(imports_report, args.imports):
+        print(f"  {cumulative / 1000:>7.1f}  {name.strip()}")
+    if over_target:
+        print(f"✖ Fast start exceeded {args.target_ms:.0f} ms to the first prompt.")
+        sys.exit(1)
+    print(f"✔ Fast start stayed under {args.target_ms:.0f} ms to the first prompt.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+from incident.models import incident_from_dict
+from persistence.storage import IncidentStorageHandler
+from persistence.streaming import LazyIncidentArchive, iter_incidents_from_json
+from .workload import WorkloadSpec, generate_incidents
+
+
+def whole_file_load(file_path: str) -> int:
+
+    # The loader before streaming: whole file as a string, whole array parsed, then built.
+    with open(file_path, "r", encoding="utf-8") as file:
+        raw_data = json.loads(file.read().strip())
+    return len([incident_from_dict(item) for item in raw_data])
+
+
+def streaming_scan(file_path: str) -> int:
+
+    return sum(1 for _ in iter_incidents_from_json(file_path))
+
+
+def lazy_archive_load(file_path: str) -> int:
+
+    return len(LazyIncidentArchive(file_path))
+
+
+def measure(operation: Callable[[str], int], file_path: str) -> tuple:
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    operation(file_path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compare peak memory of whole-file and streaming incident loads.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'file MB':>8} | {'loader':<18} | {'seconds':>8} | {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            file_path = os.path.join(directory, "incidents.json")
+            IncidentStorageHandler(file_path).save_all_incidents_to_json(generate_incidents(WorkloadSpec(count=size, seed=args.seed)))
+            file_megabytes = os.path.getsize(file_path) / 1e6
+            for name, operation in (("whole file", whole_file_load), ("streaming scan", streaming_scan), ("lazy archive", lazy_archive_load)):
+                elapsed, peak = measure(operation, file_path)
+                print(f"{size:>10} | {file_megabytes:>8.1f} | {name:<18} | {elapsed:>8.2f} | {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from cli.interface import IncidentCLI
+from core.dispatcher import IncidentDispatcher
+from core.validator import IncidentAssignmentValidator
+from incident.filters import (
+    filter_incidents_by_status,
+    filter_incidents_by_operator,
+    filter_incidents_by_date,
+    filter_incidents_by_text
+)
+from persistence.storage import IncidentStorageHandler
+from rules.default_rules import INCIDENT_TYPE_ROLE_RULES
+from .workload import WorkloadSpec, generate_incidents
+
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def time_call(operation: Callable[[], object], repeat: int = 1) -> float:
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def current_commit() -> str:
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_size(size: int, seed: int, repeat: int, directory: str) -> List[Dict]:
+
+    results: List[Dict] = []
+
+    def record(operation: str, seconds: float) -> None:
+        results.append({"operation": operation, "size": size, "seconds": seconds})
+
+    spec = WorkloadSpec(count=size, seed=seed)
+    incidents = generate_incidents(spec)
+    file_path = os.path.join(directory, f"incidents-{size}.json")
+    storage = IncidentStorageHandler(file_path)
+
+    record("storage.save_all_incidents_to_json", time_call(lambda: storage.save_all_incidents_to_json(incidents), repeat))
+    record("storage.load_all_incidents_from_json", time_call(storage.load_all_incidents_from_json, repeat))
+
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        started = time.perf_counter()
+        cli = IncidentCLI(storage)
+        record("IncidentCLI.__init__", time.perf_counter() - started)
+
+    middle = spec.start + (incidents[-1].created_at - spec.start) / 2
+    start_date, end_date = middle, middle + timedelta(days=1)
+    filters = {
+        "status": (filter_incidents_by_status, ("resolved",)),
+        "operator": (filter_incidents_by_operator, ("bob",)),
+        "date": (filter_incidents_by_date, (start_date, end_date)),
+        "text": (filter_incidents_by_text, (r"\bdatabase\b.*lag",)),
+    }
+    for name, (filter_function, arguments) in filters.items():
+        record(f"filter_incidents_by_{name}[list]", time_call(lambda: list(filter_function(incidents, *arguments)), repeat))
+        # The first indexed call is timed on its own: text searches are cached afterwards.
+        record(f"filter_incidents_by_{name}[index]", time_call(lambda: list(filter_function(cli.index, *arguments))))
+        record(f"filter_incidents_by_{name}[index,warm]", time_call(lambda: list(filter_function(cli.index, *arguments)), repeat))
+
+    priority_ranks = {"high": 1, "medium": 2, "low": 3}
+
+    def sort_open_incidents() -> list:
+        open_incidents = [i for i in cli.incidents if i.status in ("pending", "in_progress", "escalated")]
+        return sorted(open_incidents, key=lambda i: (0 if i.status == "escalated" else 1, priority_ranks.get(i.priority_level, 3), i.created_at))[:50]
+
+    record("open incidents by priority[sort,top50]", time_call(sort_open_incidents, repeat))
+    record("IncidentIndex.iter_open_by_priority[top50]", time_call(lambda: list(cli.index.iter_open_by_priority(0, 50)), repeat))
+
+    with contextlib.redirect_stdout(quiet):
+        record("IncidentCLI.run_escalation_process[due]", time_call(cli.run_escalation_process))
+        record("IncidentCLI.run_escalation_process[idle]", time_call(cli.run_escalation_process, repeat))
+
+    pending = [incident for incident in incidents if incident.status == "pending"]
+    operators = {operator for operators in INCIDENT_TYPE_ROLE_RULES.values() for operator in operators}
+    validator = IncidentAssignmentValidator(INCIDENT_TYPE_ROLE_RULES)
+
+    def assign_one_by_one() -> None:
+        dispatcher = IncidentDispatcher(operators, validator)
+        for incident in pending:
+            dispatcher.assign_incident_to_operator(incident, dispatcher.eligible_operators(incident.incident_type)[0])
+
+    record("IncidentDispatcher.assign_incident_to_operator", time_call(assign_one_by_one, repeat))
+    record("IncidentDispatcher.assign_many", time_call(lambda: IncidentDispatcher(operators, validator).assign_many(pending), repeat))
+
+    with contextlib.redirect_stdout(quiet):
+        record("IncidentCLI.save_all_incidents", time_call(cli.save_all_incidents, repeat))
+
+    os.remove(file_path)
+    return results
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Time the core incident operations on synthetic workloads.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write machine-readable JSON results to this path instead of stdout.")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results.extend(run_size(size, args.seed, args.repeat, directory))
+
+    report = {
+        "commit": current_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+        for result in results:
+            print(f"{result['size']:>9} {result['operation']:<48} {result['seconds'] * 1000:>10.2f} ms")
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
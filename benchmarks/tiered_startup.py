@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from cli.interface import IncidentCLI
+from persistence.storage import IncidentStorageHandler
+from persistence.tiered import TieredIncidentStorageHandler, migrate_json_to_tiered
+from .workload import WorkloadSpec, generate_incidents
+
+
+def measure_startup(build) -> tuple:
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cli, elapsed, current
+
+
+def time_call(operation) -> float:
+
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compare start-up and history queries of the json and tiered backends.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    # The open workload stays fixed while history grows.
+    parser.add_argument("--open", type=int, default=10_000)
+    parser.add_argument("--codec", default="lzma")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'incidents':>10} | {'backend':>7} | {'start s':>8} | {'resident MB':>11} | {'history page ms':>15} | {'week filter ms':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            open_share = min(1.0, args.open / size)
+            incidents = generate_incidents(WorkloadSpec(
+                count=size, seed=args.seed,
+                status_mix={"pending": open_share / 2, "in_progress": open_share / 2, "resolved": 1 - open_share}
+            ))
+            week_start = incidents[size // 2].created_at
+            json_path = os.path.join(directory, f"incidents-{size}.json")
+            archive_path = os.path.join(directory, f"incidents-{size}.archive")
+            IncidentStorageHandler(json_path).save_all_incidents_to_json(incidents)
+            del incidents
+            migration = time_call(lambda: migrate_json_to_tiered(json_path, archive_path, codec=args.codec))
+
+            backends = (
+                ("json", lambda: IncidentCLI(IncidentStorageHandler(json_path))),
+                ("tiered", lambda: IncidentCLI(TieredIncidentStorageHandler(archive_path, codec=args.codec))),
+            )
+            for name, build in backends:
+                cli, startup, resident = measure_startup(build)
+                page = time_call(lambda: cli.page_incidents(status="resolved", page_size=50))
+                week = time_call(lambda: cli.query_incidents(start_date=week_start, end_date=week_start + timedelta(days=7)))
+                print(f"{size:>10} | {name:>7} | {startup:>8.2f} | {resident / 1e6:>11.1f} | {page * 1000:>15.2f} | {week * 1000:>14.2f}")
+                cli.close()
+                del cli
+            print(f"{'':>10} | migration to {len(os.listdir(archive_path))} tier files took {migration:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from incident.models import Incident
+from rules.default_rules import INCIDENT_TYPE_ROLE_RULES
+
+
+DESCRIPTION_VOCABULARY = (
+    "disk", "full", "latency", "timeout", "database", "replication", "lag", "login", "error",
+    "certificate", "expired", "router", "flap", "memory", "leak", "cpu", "spike", "deploy",
+    "failed", "firewall", "blocked", "port", "scan", "backup", "missing", "queue", "stalled",
+)
+
+
+@dataclass
+class WorkloadSpec:
+    count: int
+    seed: int = 7
+    type_mix: Dict[str, float] = field(default_factory=lambda: {"infrastructure": 0.4, "application": 0.4, "security": 0.2})
+    priority_mix: Dict[str, float] = field(default_factory=lambda: {"low": 0.5, "medium": 0.3, "high": 0.2})
+    status_mix: Dict[str, float] = field(default_factory=lambda: {"pending": 0.1, "in_progress": 0.1, "escalated": 0.05, "resolved": 0.75})
+    description_words: Tuple[int, int] = (4, 12)
+    start: datetime = datetime(2023, 1, 1)
+    spacing_seconds: int = 60
+    end: Optional[datetime] = None
+    # Mean minutes until assignment and until resolution, drawn from exponential distributions.
+    mean_minutes_to_assign: float = 15.0
+    mean_minutes_to_resolve: float = 600.0
+    escalation_minutes: int = 60
+
+
+def _weighted_choices(rng: random.Random, mix: Dict[str, float], count: int) -> List[str]:
+
+    return rng.choices(list(mix), weights=list(mix.values()), k=count)
+
+
+def generate_incidents(spec: WorkloadSpec) -> List[Incident]:
+
+    rng = random.Random(spec.seed)
+    types = _weighted_choices(rng, spec.type_mix, spec.count)
+    priorities = _weighted_choices(rng, spec.priority_mix, spec.count)
+    statuses = _weighted_choices(rng, spec.status_mix, spec.count)
+    spacing = timedelta(seconds=spec.spacing_seconds)
+    if spec.end is not None and spec.count > 1:
+        spacing = (spec.end - spec.start) / (spec.count - 1)
+
+    # Lifecycle times come from their own generator, so the other fields stay what they were
+    # for a given seed.
+    lifecycle_rng = random.Random(spec.seed + 1)
+    incidents = []
+    minimum_words, maximum_words = spec.description_words
+    for index in range(spec.count):
+        incident_type = types[index]
+        status = statuses[index]
+        operators = sorted(INCIDENT_TYPE_ROLE_RULES.get(incident_type, set()))
+        assigned_operator = None
+        if status != "pending" and operators:
+            assigned_operator = rng.choice(operators)
+        words = rng.choices(DESCRIPTION_VOCABULARY, k=rng.randint(minimum_words, maximum_words))
+        created_at = spec.start + spacing * index
+        assigned_at = escalated_at = resolved_at = None
+        if assigned_operator:
+            assigned_at = created_at + timedelta(minutes=lifecycle_rng.expovariate(1 / spec.mean_minutes_to_assign))
+        if status == "resolved" and assigned_at is not None:
+            resolved_at = assigned_at + timedelta(minutes=lifecycle_rng.expovariate(1 / spec.mean_minutes_to_resolve))
+        escalation_due = created_at + timedelta(minutes=spec.escalation_minutes)
+        if status == "escalated" or (resolved_at is not None and resolved_at > escalation_due):
+            escalated_at = escalation_due
+        incidents.append(Incident(
+            id=str(index + 1).zfill(3),
+            incident_type=incident_type,
+            priority_level=priorities[index],
+            description=f"{' '.join(words)} on host-{rng.randint(1, 999):03d}",
+            created_at=created_at,
+            assigned_operator=assigned_operator,
+            status=status,
+            assigned_at=assigned_at,
+            escalated_at=escalated_at,
+            resolved_at=resolved_at
+        ))
+    return incidents
\ No newline at end of file
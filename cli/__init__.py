@@ -1,5 +1,9 @@
-from .interface import IncidentCLI
+from .interface import IncidentCLI, IncidentOperationError
+from .batch import BatchCommandRunner, run_batch
 
 __all__ = [
-    'IncidentCLI'
+    'IncidentCLI',
+    'IncidentOperationError',
+    'BatchCommandRunner',
+    'run_batch'
 ]
\ No newline at end of file
@@ -0,0 +1,261 @@
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, TextIO
+from incident.models import INCIDENT_STATUSES, incident_to_dict
+from incident.store import normalize_incident_id
+from logs.instrumentation import capture_profile
+from .interface import IncidentCLI, IncidentOperationError
+
+
+PRIORITY_LEVELS = ("low", "medium", "high")
+BATCH_OPERATIONS = ("create", "assign", "resolve", "query", "timeline", "analytics")
+# Operations whose results are written to the output; mutations stay silent.
+REPORTED_OPERATIONS = ("query", "timeline", "analytics")
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BatchCommandError(Exception):
+    pass
+
+
+@dataclass
+class BatchSummary:
+    commands: int = 0
+    failures: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    by_operation: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def commands_per_second(self) -> float:
+
+        return self.commands / self.seconds if self.seconds > 0 else 0.0
+
+    def report(self) -> str:
+
+        operations = ", ".join(f"{operation}: {count}" for operation, count in sorted(self.by_operation.items()))
+        return (f"✔ Processed {self.commands} commands in {self.batches} batches "
+                f"({self.failures} failed) in {self.seconds:.2f}s: {self.commands_per_second:,.0f} commands/s"
+                + (f"\n  {operations}" if operations else ""))
+
+
+def _parse_datetime(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BatchCommandError(f"Invalid date: {value}. Use YYYY-MM-DD or an ISO timestamp.")
+    if parsed.tzinfo is not None:
+        # Incidents carry naive local times, and comparing those with aware values raises.
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    # A bare date as the upper bound covers that whole day, like the interactive date filter.
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def _expected_version(command: Dict) -> Optional[int]:
+
+    # An optional "version" makes assign and resolve fail unless the incident is still at that version.
+    version = command.get("version")
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool) or version < 0):
+        raise BatchCommandError(f"Invalid version: {version}. Use the incident's current version number.")
+    return version
+
+
+def _require(command: Dict, key: str, valid_options: Optional[Iterable[str]] = None) -> str:
+
+    value = command.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise BatchCommandError(f"Missing field: {key}")
+    value = value.strip()
+    if valid_options is not None and value not in valid_options:
+        raise BatchCommandError(f"Invalid {key}: {value}. Valid options are: {list(valid_options)}")
+    return value
+
+
+def _optional(command: Dict, key: str, valid_options: Optional[Iterable[str]] = None) -> Optional[str]:
+
+    value = command.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, str) or not value:
+        raise BatchCommandError(f"Invalid {key}: {value}. Use a non-empty string.")
+    if valid_options is not None and value not in valid_options:
+        raise BatchCommandError(f"Invalid {key}: {value}. Valid options are: {list(valid_options)}")
+    return value
+
+
+def _optional_count(command: Dict, key: str, minimum: int, default: Optional[int] = None) -> Optional[int]:
+
+    value = command.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise BatchCommandError(f"Invalid {key}: {value}. Use an integer of at least {minimum}.")
+    return value
+
+
+class BatchCommandRunner:
+
+    # Applies NDJSON commands to an IncidentCLI without prompts. Mutations are silent;
+    # query results and per-command errors are written to `output` as NDJSON lines.
+    # allow_profile is off for the service, whose commands come from the network.
+    def __init__(self, cli: IncidentCLI, batch_size: int = DEFAULT_BATCH_SIZE, output: TextIO = sys.stdout,
+                 allow_profile: bool = True):
+
+        self.cli = cli
+        self.batch_size = batch_size
+        self.output = output
+        self.allow_profile = allow_profile
+        self._handlers = {
+            "create": self._create,
+            "assign": self._assign,
+            "resolve": self._resolve,
+            "query": self._query,
+            "timeline": self._timeline,
+            "analytics": self._analytics,
+        }
+
+    def _create(self, command: Dict) -> Dict:
+
+        incident = self.cli.create_incident(
+            _require(command, "incident_type", self.cli.rules.compiled.incident_types),
+            _require(command, "priority_level", PRIORITY_LEVELS),
+            _require(command, "description"),
+            _parse_datetime(command.get("created_at"))
+        )
+        return {"op": "create", "id": incident.id, "version": incident.version}
+
+    def _assign(self, command: Dict) -> Dict:
+
+        operator_name = _optional(command, "operator")
+        incident = self.cli.assign_incident(_require(command, "id"), operator_name, _expected_version(command))
+        return {"op": "assign", "id": incident.id, "operator": incident.assigned_operator, "version": incident.version}
+
+    def _resolve(self, command: Dict) -> Dict:
+
+        incident = self.cli.resolve_incident(_require(command, "id"), _expected_version(command))
+        return {"op": "resolve", "id": incident.id, "version": incident.version}
+
+    def _query(self, command: Dict) -> Dict:
+
+        predicates = {
+            "status": _optional(command, "status", INCIDENT_STATUSES),
+            "operator_name": _optional(command, "operator"),
+            "start_date": _parse_datetime(command.get("start")),
+            "end_date": _parse_datetime(command.get("end"), end_of_day=True),
+            "search_pattern": _optional(command, "text"),
+        }
+        page_size = _optional_count(command, "page_size", 1)
+        limit = _optional_count(command, "limit", 0)
+        resume_token = _optional(command, "resume_token")
+
+        try:
+            if page_size is not None:
+                page = self.cli.page_incidents(**predicates, page_size=page_size, resume_token=resume_token)
+                incidents, next_token = page.incidents, page.next_token
+            else:
+                incidents, next_token = self.cli.query_incidents(**predicates), None
+        except re.error as error:
+            raise BatchCommandError(f"Error in search pattern: {error}")
+        except ValueError as error:
+            raise BatchCommandError(str(error))
+        if limit is not None:
+            incidents = incidents[:limit]
+        result = {"op": "query", "count": len(incidents), "incidents": [incident_to_dict(incident) for incident in incidents]}
+        if page_size is not None:
+            result["next_token"] = next_token
+        return result
+
+    def _timeline(self, command: Dict) -> Dict:
+
+        incident_id = normalize_incident_id(_require(command, "id"))
+        return {"op": "timeline", "id": incident_id, "events": self.cli.incident_timeline(incident_id)}
+
+    def _analytics(self, command: Dict) -> Dict:
+
+        hours, days = _optional_count(command, "hours", 0, 24), _optional_count(command, "days", 0, 7)
+        return {"op": "analytics", **self.cli.analytics_dashboard(hours, days)}
+
+    def execute(self, command: Dict) -> Dict:
+
+        if not isinstance(command, dict):
+            raise BatchCommandError("Each line must be a JSON object.")
+        operation = command.get("op")
+        handler = self._handlers.get(operation) if isinstance(operation, str) else None
+        if handler is None:
+            raise BatchCommandError(f"Unknown op: {operation}. Valid options are: {list(BATCH_OPERATIONS)}")
+        profile = command.get("profile", False)
+        if profile is not False:
+            if not self.allow_profile:
+                raise BatchCommandError("Profiling is not available here.")
+            if profile is not True:
+                raise BatchCommandError(f"Invalid profile: {profile}. Use true to report to stderr.")
+            # The report only ever goes to stderr; command input never names a file.
+            with capture_profile(trace_memory=True):
+                return handler(command)
+        return handler(command)
+
+    def apply(self, line_number: int, line: str) -> Dict:
+
+        try:
+            return self.execute(json.loads(line))
+        except json.JSONDecodeError as error:
+            return {"line": line_number, "error": f"Invalid JSON: {error}"}
+        except (BatchCommandError, IncidentOperationError) as error:
+            return {"line": line_number, "error": str(error)}
+        except Exception as error:
+            # Anything else is a bug, but it fails this command only, so the batch is still saved.
+            return {"line": line_number, "error": f"Internal error: {type(error).__name__}: {error}"}
+
+    def _finish_batch(self, summary: BatchSummary) -> None:
+
+        self.cli.run_escalation_process()
+        self.cli.save_all_incidents()
+        summary.batches += 1
+
+    def run(self, lines: Iterable[str]) -> BatchSummary:
+
+        summary = BatchSummary()
+        started = time.perf_counter()
+        in_batch = 0
+        write = self.output.write
+
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            result = self.apply(line_number, line)
+            summary.commands += 1
+            if "error" in result:
+                summary.failures += 1
+                write(json.dumps(result) + "\n")
+            else:
+                operation = result["op"]
+                summary.by_operation[operation] = summary.by_operation.get(operation, 0) + 1
+                if operation in REPORTED_OPERATIONS:
+                    write(json.dumps(result) + "\n")
+
+            in_batch += 1
+            if in_batch >= self.batch_size:
+                self._finish_batch(summary)
+                in_batch = 0
+
+        if in_batch:
+            self._finish_batch(summary)
+        self.output.flush()
+        summary.seconds = time.perf_counter() - started
+        return summary
+
+
+def run_batch(cli: IncidentCLI, source: TextIO, batch_size: int = DEFAULT_BATCH_SIZE,
+              output: TextIO = sys.stdout) -> BatchSummary:
+
+    return BatchCommandRunner(cli, batch_size, output).run(source)
\ No newline at end of file
@@ -1,226 +1,731 @@
+import heapq
+import json
+import sys
+import threading
 from datetime import datetime, timedelta
-from typing import List, Set
+from functools import wraps
+from itertools import chain, dropwhile
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from incident.models import Incident
+from incident.formatting import format_duration, format_incident_block, format_rate, format_timestamp
+from incident.pagination import DEFAULT_PAGE_SIZE, Page, decode_resume_token, take_page
+from incident.store import IncidentStore, INCIDENT_ID_WIDTH, normalize_incident_id
+from incident.indexes import RESOLVABLE_STATUSES, IncidentIndex, id_key
+from logs.events import EventLog
 from incident.filters import (
     filter_incidents_by_status,
     filter_incidents_by_operator,
-    filter_incidents_by_date,
     filter_incidents_by_text
 )
+from core.analytics import IncidentAnalytics
 from core.dispatcher import IncidentDispatcher
 from core.escalator import IncidentEscalator
+from core.scheduler import EscalationScheduler
 from core.validator import IncidentAssignmentValidator
 from rules.default_rules import INCIDENT_TYPE_ROLE_RULES
+from rules.engine import RulesEngine
+from persistence.manifest import StartupManifest, manifest_path, read_manifest, write_manifest
 from persistence.storage import IncidentStorageHandler
 
+if TYPE_CHECKING:
+    # numpy and the worker pool are only imported when the table or engine is actually built.
+    from incident.table import IncidentTable
+    from incident.parallel import ParallelQueryEngine
+
+
+STREAMING_PAGE_SIZE = 1000
+ID_BLOCK_SIZE = 64
+
+
+class IncidentOperationError(Exception):
+    pass
+
+
+def latest_incident_versions(incidents: Iterable[Incident]) -> Dict[str, Incident]:
+
+    unique_incidents = {}
+    for incident in incidents:
+        if incident.id not in unique_incidents:
+            unique_incidents[incident.id] = incident
+        else:
+            current = unique_incidents[incident.id]
+            if (incident.version, incident.created_at) > (current.version, current.created_at):
+                unique_incidents[incident.id] = incident
+    return unique_incidents
+
+
+def synchronized(method: Callable) -> Callable:
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class IncidentCLI:
-    def __init__(self):
+    def __init__(self, storage: Optional[IncidentStorageHandler] = None, use_columnar_table: bool = False,
+                 max_load_per_operator: Optional[int] = None, parallel_workers: Optional[int] = None,
+                 event_log: Optional[EventLog] = None, rules: Optional[RulesEngine] = None, fast_start: bool = False):
         self.current_incident_id = 1
-        self.incidents: List[Incident] = []
-        self.history_log: List[Incident] = []
-        self.available_operators: Set[str] = {"alice", "bob", "carol"}
-        self.validator = IncidentAssignmentValidator(INCIDENT_TYPE_ROLE_RULES)
-        self.dispatcher = IncidentDispatcher(self.available_operators, self.validator)
+        # Guards the in-memory state: stores, index, table, dispatcher loads and schedule. It is
+        # held only while state is read or changed. ID reservation and saves have locks of their
+        # own, and the event log and journal lock their own buffers, so a transition never waits
+        # for a file to be rewritten. Transitions also compare incident versions, so a caller
+        # holding a stale copy fails instead of overwriting a newer state.
+        self._lock = threading.RLock()
+        self._id_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # IDs below this one, from current_incident_id on, are already reserved for this process.
+        self._reserved_id_limit = 0
+        self.incidents = IncidentStore()
+        self.history_log = IncidentStore()
+        self.index = IncidentIndex()
+        self.table: Optional["IncidentTable"] = None
+        self.parallel_workers = parallel_workers
+        self.parallel_engine: Optional["ParallelQueryEngine"] = None
+        self._resolved_since_engine: List[Incident] = []
+        self.event_log = event_log
+        # Built from the loaded incidents on the first dashboard request, then kept current by
+        # _record_transition, so start-up does not pay for it and later requests scan nothing.
+        self.analytics: Optional[IncidentAnalytics] = None
+        self.rules = rules if rules is not None else RulesEngine.from_mapping(INCIDENT_TYPE_ROLE_RULES)
+        self.available_operators: Set[str] = set(self.rules.compiled.operators)
+        self.validator = IncidentAssignmentValidator(self.rules)
+        self.dispatcher = IncidentDispatcher(self.available_operators, self.validator, default_max_load=max_load_per_operator)
         self.escalator = IncidentEscalator(1)
-        self.storage = IncidentStorageHandler("incidents.json")
-        
-        loaded_incidents = self.storage.load_all_incidents_from_json()
+        self.escalation_scheduler = EscalationScheduler(self.escalator)
+        self.storage = storage if storage is not None else IncidentStorageHandler("incidents.json")
         
-        unique_incidents = {}
-        for incident in loaded_incidents:
-            if incident.id not in unique_incidents:
-                unique_incidents[incident.id] = incident
+        # Query-capable backends keep resolved history on disk and answer filters themselves.
+        self.query_storage = getattr(self.storage, "supports_queries", False)
+
+        # Fast start takes the open set and the next ID from the manifest written by the last
+        # close(), or from storage that can list open incidents cheaply, and loads resolved
+        # history on a background thread, merged in by _merge_history.
+        self.manifest_path: Optional[str] = None
+        # For plain-file storage: the version each incident changed since the last save had
+        # before that, or None for incidents created since then.
+        self._base_versions: Dict[str, Optional[int]] = {}
+        self._history_loader: Optional[threading.Thread] = None
+        self._loaded_history: Optional[Tuple[IncidentIndex, IncidentStore]] = None
+        self._history_error: Optional[Exception] = None
+        self._changes_during_history_load: List[Tuple[str, Incident]] = []
+        self._manifest_fingerprint = None
+        manifest = None
+        if fast_start and not self.query_storage and not use_columnar_table and hasattr(self.storage, "fingerprint"):
+            self.manifest_path = manifest_path(self.storage.file_path)
+            self._manifest_fingerprint = self.storage.fingerprint()
+            manifest = read_manifest(self.manifest_path, self._manifest_fingerprint)
+            if manifest is None and hasattr(self.storage, "iter_open_incidents"):
+                # Storage that picks out open incidents without decoding resolved history
+                # stands in for a missing or stale manifest.
+                try:
+                    open_incidents = list(self._read_storage(open_only=True).values())
+                    max_id = self.storage.max_incident_id()
+                except json.JSONDecodeError:
+                    # The full load below reports the damaged archive.
+                    pass
+                else:
+                    manifest = StartupManifest(self.current_incident_id if max_id is None else max_id + 1, open_incidents)
+
+        if manifest is not None:
+            clean_incidents = manifest.open_incidents
+            self._mark_synced_to_manifest()
+        else:
+            try:
+                unique_incidents = self._read_storage(open_only=self.query_storage)
+            except json.JSONDecodeError:
+                print("Warning: incidents.json is invalid or empty. Starting with an empty list.")
+                unique_incidents = {}
+            clean_incidents = unique_incidents.values()
+
+        self._load_incidents(clean_incidents)
+
+        if use_columnar_table:
+            from incident.table import IncidentTable, is_columnar_table_available
+            if is_columnar_table_available():
+                self.table = IncidentTable.from_incidents(self.index, self.rules.compiled.incident_types)
             else:
-                if incident.created_at > unique_incidents[incident.id].created_at:
-                    unique_incidents[incident.id] = incident
-        
-        clean_incidents = list(unique_incidents.values())
-        
-        for incident in clean_incidents:
+                print("Warning: numpy is not installed. Columnar incident table disabled.")
+
+        if manifest is not None:
+            self.current_incident_id = manifest.next_incident_id
+            self._history_loader = threading.Thread(
+                target=self._load_history, args=(manifest.open_incidents,), name="incident-history-loader", daemon=True
+            )
+            self._history_loader.start()
+        elif self.query_storage:
+            max_id = self.storage.max_incident_id()
+            if max_id is not None:
+                self.current_incident_id = max_id + 1
+        elif clean_incidents:
+            max_id = max(int(inc.id) for inc in clean_incidents)
+            self.current_incident_id = max_id + 1
+
+    def _load_incidents(self, incidents: Iterable[Incident]) -> None:
+        for incident in incidents:
             if incident.status in ("pending", "in_progress", "escalated"):
-                self.incidents.append(incident)
+                self.index.add(incident)
+                self.incidents.add(incident)
+                self.dispatcher.record_assignment(incident)
+                if incident.status != "escalated":
+                    self.escalation_scheduler.schedule(incident)
             elif incident.status == "resolved":
-                self.history_log.append(incident)
-        
+                self.index.add(incident)
+                self.history_log.add(incident)
+
+    def _replace_state(self, incidents: List[Incident]) -> None:
+        # Rebuilds everything in memory from an archive that other processes also wrote to.
+        self.incidents = IncidentStore()
+        self.history_log = IncidentStore()
+        self.index = IncidentIndex()
+        self.dispatcher.operator_loads = {operator_name: 0 for operator_name in self.available_operators}
+        self.escalation_scheduler = EscalationScheduler(self.escalator)
+        clean_incidents = latest_incident_versions(incidents).values()
+        self._load_incidents(clean_incidents)
+        if self.table is not None:
+            self.table = type(self.table).from_incidents(self.index, self.rules.compiled.incident_types)
+        if self.parallel_engine is not None:
+            self.parallel_engine.close()
+            self.parallel_engine = None
+        self._resolved_since_engine = []
+        self.analytics = None
         if clean_incidents:
-            max_id = max(int(inc.id) for inc in clean_incidents)
-            self.current_incident_id = max_id + 1
+            self.current_incident_id = max(self.current_incident_id, max(int(inc.id) for inc in clean_incidents) + 1)
 
     def generate_incident_id(self) -> str:
-        return str(self.current_incident_id).zfill(3)
-
-    def register_new_incident(self, incident_type: str, priority_level: str, description: str) -> None:
+        return str(self.current_incident_id).zfill(INCIDENT_ID_WIDTH)
+
+    def _allocate_incident_id(self) -> str:
+        with self._id_lock:
+            # Storage shared between processes hands out IDs, so concurrent creates never collide.
+            reserve_incident_ids = getattr(self.storage, "reserve_incident_ids", None)
+            if reserve_incident_ids is not None and self.current_incident_id >= self._reserved_id_limit:
+                # Reserved a block at a time, so the shared counter is locked once per block rather than per create.
+                self.current_incident_id = reserve_incident_ids(self.current_incident_id, ID_BLOCK_SIZE)
+                self._reserved_id_limit = self.current_incident_id + ID_BLOCK_SIZE
+            incident_id = self.generate_incident_id()
+            self.current_incident_id += 1
+            return incident_id
+
+    def _check_version(self, incident: Incident, expected_version: Optional[int]) -> None:
+        if expected_version is not None and incident.version != expected_version:
+            raise IncidentOperationError(
+                f"Incident {incident.id} has changed (version {incident.version}, expected {expected_version}). Reload it and try again."
+            )
+
+    def _all_incidents(self) -> Iterator[Incident]:
+        return chain(self.incidents, self.history_log)
+
+    def _mark_synced_to_manifest(self) -> None:
+        # The open set came from the archive the manifest describes, not from what the history
+        # loader reads later; if another process wrote in between, the next save must merge.
+        mark_synced = getattr(self.storage, "mark_synced", None)
+        if mark_synced is not None:
+            mark_synced(self._manifest_fingerprint)
+
+    def _read_storage(self, open_only: bool = False) -> Dict[str, Incident]:
+        # Storage streams records lazily, so the load is timed here where they are consumed.
+        incidents = self.storage.iter_open_incidents() if open_only else self.storage.iter_all_incidents()
+        return latest_incident_versions(incidents)
+
+    def _load_history(self, open_incidents: List[Incident]) -> None:
+
+        # Builds the full index and history on the side; nothing the prompt uses is touched here.
+        try:
+            open_ids = {incident.id for incident in open_incidents}
+            resolved = [
+                incident for incident in self._read_storage().values()
+                if incident.status == "resolved" and incident.id not in open_ids
+            ]
+            self._loaded_history = (IncidentIndex(chain(open_incidents, resolved)), IncidentStore(resolved))
+        except Exception as error:
+            self._history_error = error
+
+    @synchronized
+    def _merge_history(self, wait: bool = True) -> None:
+
+        loader = self._history_loader
+        if loader is None or (not wait and loader.is_alive()):
+            return
+        loader.join()
+        self._history_loader = None
+        self._mark_synced_to_manifest()
+        error, self._history_error = self._history_error, None
+        if isinstance(error, json.JSONDecodeError):
+            print("Warning: incidents.json is invalid or empty. Starting with an empty list.")
+            index, history = IncidentIndex(), IncidentStore()
+        elif error is not None:
+            raise error
+        else:
+            index, history = self._loaded_history
+        self._loaded_history = None
+
+        # Replays what happened at the prompt while the archive was loading; open incidents
+        # untouched since start-up are already in the loaded index unless the load failed.
+        for _, incident in self._changes_during_history_load:
+            if index.get(incident.id) is None:
+                index.add(incident)
+            else:
+                index.update(incident)
+        self._changes_during_history_load = []
+        for incident in self.incidents:
+            if index.get(incident.id) is None:
+                index.add(incident)
+        for incident in self.history_log:
+            if incident.id in history:
+                history.replace(incident)
+            else:
+                history.add(incident)
+        self.index = index
+        self.history_log = history
+
+    def _record_transition(self, action: str, incident: Incident, reason: Optional[str] = None) -> None:
+        if self._history_loader is not None:
+            self._changes_during_history_load.append((action, incident))
+        if not self.storage.journaled:
+            # Every transition moves the version up by exactly one.
+            self._base_versions.setdefault(incident.id, None if action == "create" else incident.version - 1)
+        if action == "create":
+            self.index.add(incident)
+        elif action == "resolve" and self.query_storage:
+            # Query-capable backends answer for resolved history, so it is not kept in memory.
+            self.index.remove(incident.id)
+        else:
+            self.index.update(incident)
+        if self.table is not None:
+            if action == "create":
+                self.table.append(incident)
+            else:
+                self.table.update(incident)
+        self.storage.record_incident_change(action, incident)
+        if self.analytics is not None:
+            self.analytics.observe(action, incident)
+        if self.event_log is not None:
+            self.event_log.record(action, incident, reason)
+
+    @synchronized
+    def refresh_rules(self) -> bool:
+        if not self.rules.refresh():
+            return False
+        # Operators dropped from the rules keep their open incidents but take no new ones.
+        self.available_operators.clear()
+        self.available_operators.update(self.rules.compiled.operators)
+        for operator_name in self.available_operators:
+            self.dispatcher.operator_loads.setdefault(operator_name, 0)
+        return True
+
+    @synchronized
+    def check_index_consistency(self) -> List[str]:
+        self._merge_history()
+        return self.index.check_consistency(self._all_incidents())
+
+    def _archive_engine(self) -> "ParallelQueryEngine":
+        # Resolved incidents never change again, so the engine is only rebuilt once the
+        # incidents resolved since the last build outgrow a quarter of its size.
+        from incident.parallel import ParallelQueryEngine
+        if self.parallel_engine is None or len(self._resolved_since_engine) > max(1024, len(self.parallel_engine) // 4):
+            if self.parallel_engine is not None:
+                self.parallel_engine.close()
+            self.parallel_engine = ParallelQueryEngine(self.history_log, workers=self.parallel_workers)
+            self._resolved_since_engine = []
+        return self.parallel_engine
+
+    def _iter_text_matches(self, search_pattern: str, after: Optional[Tuple[int, str]]) -> Iterator[Incident]:
+        # In ID order. The worker pool only pays off for patterns the text index cannot narrow
+        # down; those rescan the archive for every page anyway, so skipping to `after` is cheap.
+        if self.parallel_workers is None or self.index.narrows_text_search(search_pattern):
+            return self.index.iter_by_text(search_pattern, after)
+        recent = sorted(filter_incidents_by_text(chain(self.incidents, self._resolved_since_engine), search_pattern), key=id_key)
+        matches = heapq.merge(self._archive_engine().filter_by_text(search_pattern), recent, key=id_key)
+        if after is None:
+            return matches
+        return dropwhile(lambda incident: id_key(incident) <= after, matches)
+
+    def close(self) -> None:
+        if self.parallel_engine is not None:
+            self.parallel_engine.close()
+            self.parallel_engine = None
+        if self.event_log is not None:
+            self.event_log.close()
+        self.storage.close()
+        # A plain file only matches the session once it has been saved; until then the
+        # previous manifest still describes what is on disk.
+        if self.manifest_path is not None and not self._base_versions:
+            write_manifest(self.manifest_path, self.current_incident_id, self.incidents, self.storage.fingerprint())
+
+    def incident_timeline(self, incident_id: str) -> List[dict]:
+        if self.event_log is None:
+            raise IncidentOperationError("Event log is not enabled.")
+        return self.event_log.timeline(normalize_incident_id(incident_id))
+
+    def create_incident(self, incident_type: str, priority_level: str, description: str,
+                        created_at: Optional[datetime] = None) -> Incident:
 
         new_incident = Incident(
-            id=self.generate_incident_id(),
+            id=self._allocate_incident_id(),
             incident_type=incident_type,
             priority_level=priority_level,
             description=description,
-            created_at=datetime.now(),
+            created_at=created_at if created_at is not None else datetime.now(),
             assigned_operator=None,
-            status="pending"
+            status="pending",
+            version=1
         )
-        self.incidents.append(new_incident)
-        self.current_incident_id += 1
+        with self._lock:
+            self.incidents.add(new_incident)
+            self.escalation_scheduler.schedule(new_incident)
+            self._record_transition("create", new_incident)
+        return new_incident
+
+    def register_new_incident(self, incident_type: str, priority_level: str, description: str) -> None:
+
+        new_incident = self.create_incident(incident_type, priority_level, description)
         print(f"✔ Incident created with ID: {new_incident.id}")
 
-    def show_pending_incidents_by_priority(self) -> None:
+    def show_pending_incidents_by_priority(self, limit: Optional[int] = None, offset: int = 0) -> None:
 
-        pending_incidents = [i for i in self.incidents if i.status in ("pending", "in_progress", "escalated")]
-        if not pending_incidents:
+        with self._lock:
+            if self.table is not None:
+                rows = self.table.open_rows_by_priority()
+                sorted_incidents = self.table.to_incidents(rows[offset:None if limit is None else offset + limit])
+                total = len(rows)
+            else:
+                sorted_incidents = list(self.index.iter_open_by_priority(offset, limit))
+                total = self.index.count_open()
+        if not sorted_incidents:
             print("No open incidents (pending, in progress, or escalated).")
             return
         
-        priority_order = {"high": 1, "medium": 2, "low": 3}
-        
-        def sort_key(incident):
-            status_priority = 0 if incident.status == "escalated" else 1
-            priority_value = priority_order.get(incident.priority_level, 3)
-            return (status_priority, priority_value, incident.created_at)
-        
-        sorted_incidents = sorted(pending_incidents, key=sort_key)
-        
         for incident in sorted_incidents:
             operator_display = incident.assigned_operator if incident.assigned_operator else "Pending"
-            print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status} | Operator: {operator_display}")
+            print(f"Created: {format_timestamp(incident.created_at)} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status} | Operator: {operator_display}")
             print(f"Description: {incident.description}")
+        self._print_remaining(offset + len(sorted_incidents), total)
+
+    def _count_by_status(self, *statuses: str) -> int:
+
+        if self.table is not None:
+            counts = self.table.counts_by_status()
+            return sum(counts.get(status, 0) for status in statuses)
+        return sum(self.index.count_by_status(status) for status in statuses)
+
+    def _print_remaining(self, shown_until: int, total: int) -> None:
+
+        if shown_until < total:
+            print(f"... {total - shown_until} more not shown.")
 
-    def show_assignable_incidents(self) -> None:
+    def show_assignable_incidents(self, limit: Optional[int] = None, offset: int = 0) -> None:
 
-        pending_incidents = [i for i in self.incidents if i.status == "pending"]
+        with self._lock:
+            pending_incidents = list(self.index.iter_assignable(offset, limit))
+            total = self._count_by_status("pending")
         if not pending_incidents:
             print("No pending incidents available for assignment.")
             return
         
-        for incident in sorted(pending_incidents, key=lambda i: int(i.id)):
+        for incident in pending_incidents:
             print(f"[{incident.id}] {incident.incident_type} | Priority: {incident.priority_level}")
             print(f"Description: {incident.description}")
+        self._print_remaining(offset + len(pending_incidents), total)
 
-    def assign_incident_to_operator_by_id(self, incident_id: str, operator_name: str) -> None:
+    @synchronized
+    def assign_incident(self, incident_id: str, operator_name: Optional[str] = None,
+                        expected_version: Optional[int] = None) -> Incident:
 
-        formatted_id = incident_id.zfill(3)
+        formatted_id = normalize_incident_id(incident_id)
         
-        incident_found = False
-        for index, incident in enumerate(self.incidents):
-            if incident.id == formatted_id:
-                incident_found = True
-                if incident.status != "pending":
-                    print(f"✖ Incident {formatted_id} is not pending (current status: {incident.status}). Only pending incidents can be assigned.")
-                    return
-                
-                updated_incident = self.dispatcher.assign_incident_to_operator(incident, operator_name)
-                if updated_incident:
-                    self.incidents[index] = updated_incident
-                    print("✔ Assigned successfully.")
-                else:
-                    print("✖ Assignment failed. Operator may be unauthorized or unavailable.")
-                return
+        incident = self.incidents.get(formatted_id)
+        if incident is None:
+            raise IncidentOperationError("Incident not found.")
+        self._check_version(incident, expected_version)
+
+        if incident.status != "pending":
+            raise IncidentOperationError(f"Incident {formatted_id} is not pending (current status: {incident.status}). Only pending incidents can be assigned.")
         
-        if not incident_found:
-            print("✖ Incident not found.")
+        reason = None
+        if operator_name is None:
+            operator_name = self.dispatcher.select_operator(incident)
+            reason = "Selected by dispatcher"
+        updated_incident = self.dispatcher.assign_incident_to_operator(incident, operator_name) if operator_name else None
+        if not updated_incident:
+            raise IncidentOperationError("Assignment failed. Operator may be unauthorized or unavailable.")
+
+        self.incidents.replace(updated_incident)
+        self._record_transition("assign", updated_incident, reason)
+        return updated_incident
 
-    def show_resolvable_incidents(self) -> None:
+    def assign_incident_to_operator_by_id(self, incident_id: str, operator_name: str) -> None:
 
-        resolvable = [i for i in self.incidents if i.status in ("in_progress", "escalated")]
+        try:
+            self.assign_incident(incident_id, operator_name)
+        except IncidentOperationError as error:
+            print(f"✖ {error}")
+            return
+        print("✔ Assigned successfully.")
+
+    @synchronized
+    def auto_assign_pending_incidents(self) -> None:
+
+        priority_order = {"high": 1, "medium": 2, "low": 3}
+        pending_incidents = sorted(
+            (i for i in self.incidents if i.status == "pending"),
+            key=lambda i: (priority_order.get(i.priority_level, 3), i.created_at)
+        )
+        if not pending_incidents:
+            print("No pending incidents available for assignment.")
+            return
+
+        assigned_incidents = self.dispatcher.assign_many(pending_incidents)
+        for assigned_incident in assigned_incidents:
+            self.incidents.replace(assigned_incident)
+            self._record_transition("assign", assigned_incident, "Auto-assigned by dispatcher")
+        
+        print(f"✔ Assigned {len(assigned_incidents)} of {len(pending_incidents)} pending incidents.")
+        if len(assigned_incidents) < len(pending_incidents):
+            print("✖ Remaining incidents have no eligible operator with free capacity.")
+
+    def show_resolvable_incidents(self, limit: Optional[int] = None, offset: int = 0) -> None:
+
+        with self._lock:
+            resolvable = list(self.index.iter_resolvable(offset, limit))
+            total = self._count_by_status(*RESOLVABLE_STATUSES)
         if not resolvable:
             print("No incidents available for resolution (only in_progress or escalated incidents can be resolved).")
             return
         
         print("=== Incidents available for resolution ===")
 
-        for incident in sorted(resolvable, key=lambda i: int(i.id)):
-            print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
+        for incident in resolvable:
+            print(f"Created: {format_timestamp(incident.created_at)} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
             print(f"Assigned to: {incident.assigned_operator}")
             print(f"Description: {incident.description}\n")
+        self._print_remaining(offset + len(resolvable), total)
 
-    def resolve_incident_by_id(self, incident_id: str) -> None:
+    @synchronized
+    def resolve_incident(self, incident_id: str, expected_version: Optional[int] = None) -> Incident:
 
-        for index, incident in enumerate(self.incidents):
-            if incident.id == incident_id:
-                if incident.status not in ("in_progress", "escalated"):
-                    print(f"✖ Incident {incident.id} cannot be resolved (current status: {incident.status}). Only in_progress or escalated incidents can be resolved.")
-                    return
-                
-                if not incident.assigned_operator:
-                    print(f"✖ Incident {incident.id} has no assigned operator. Assign it before resolving.")
-                    return
-                
-                resolved_incident = Incident(
-                    id=incident.id,
-                    incident_type=incident.incident_type,
-                    priority_level=incident.priority_level,
-                    description=incident.description,
-                    created_at=incident.created_at,
-                    assigned_operator=incident.assigned_operator,
-                    status="resolved"
-                )
-                
-                self.history_log.append(resolved_incident)
-                self.incidents.pop(index)
-                print(f"✔ Incident {incident_id} resolved successfully.")
-                return
+        incident = self.incidents.get(incident_id)
+        if incident is None:
+            raise IncidentOperationError("Incident not found.")
+        self._check_version(incident, expected_version)
+
+        if incident.status not in ("in_progress", "escalated"):
+            raise IncidentOperationError(f"Incident {incident.id} cannot be resolved (current status: {incident.status}). Only in_progress or escalated incidents can be resolved.")
+        
+        if not incident.assigned_operator:
+            raise IncidentOperationError(f"Incident {incident.id} has no assigned operator. Assign it before resolving.")
         
-        print("✖ Incident not found.")
+        resolved_incident = Incident(
+            id=incident.id,
+            incident_type=incident.incident_type,
+            priority_level=incident.priority_level,
+            description=incident.description,
+            created_at=incident.created_at,
+            assigned_operator=incident.assigned_operator,
+            status="resolved",
+            version=incident.version + 1,
+            assigned_at=incident.assigned_at,
+            escalated_at=incident.escalated_at,
+            resolved_at=datetime.now()
+        )
+        
+        if not self.query_storage:
+            self.history_log.add(resolved_incident)
+        if self.parallel_engine is not None:
+            self._resolved_since_engine.append(resolved_incident)
+        self.incidents.remove(incident.id)
+        self.dispatcher.release_assignment(incident)
+        self.escalation_scheduler.cancel(incident.id)
+        self._record_transition("resolve", resolved_incident)
+        return resolved_incident
 
-    def run_escalation_process(self) -> None:
+    def resolve_incident_by_id(self, incident_id: str) -> None:
 
+        try:
+            resolved_incident = self.resolve_incident(incident_id)
+        except IncidentOperationError as error:
+            print(f"✖ {error}")
+            return
+        print(f"✔ Incident {resolved_incident.id} resolved successfully.")
+
+    def run_escalation_process(self) -> int:
+
+        # Every caller ticks escalations regularly, which makes this the place to pick up rule changes.
+        self.refresh_rules()
+        self._merge_history(wait=False)
         current_time = datetime.now()
         escalations_made = 0
         
-        for index, incident in enumerate(self.incidents):
-            escalated_incident, reason = self.escalator.escalate_if_needed(incident, current_time)
+        with self._lock:
+            due_incident_ids = self.escalation_scheduler.pop_due(current_time)
+
+        # Each escalation takes the lock on its own, so prompts and readers are not held up by a long tick.
+        for incident_id in due_incident_ids:
+            with self._lock:
+                incident = self.incidents.get(incident_id)
+                if incident is None:
+                    continue
+
+                escalated_incident, reason = self.escalator.escalate_if_needed(incident, current_time)
             
-            if escalated_incident:
-
-                if not escalated_incident.assigned_operator:
-
-                    available_ops = INCIDENT_TYPE_ROLE_RULES.get(escalated_incident.incident_type, set())
-                    if available_ops:
-
-                        assigned_operator = list(available_ops)[0]
-                        escalated_incident = Incident(
-                            id=escalated_incident.id,
-                            incident_type=escalated_incident.incident_type,
-                            priority_level=escalated_incident.priority_level,
-                            description=escalated_incident.description,
-                            created_at=escalated_incident.created_at,
-                            assigned_operator=assigned_operator,
-                            status="escalated"
-                        )
+                if escalated_incident:
+
+                    if not escalated_incident.assigned_operator:
+
+                        assigned_operator = (self.dispatcher.select_operator(escalated_incident) or
+                                             self.dispatcher.select_operator(escalated_incident, respect_capacity=False))
+                        if assigned_operator:
+
+                            escalated_incident = Incident(
+                                id=escalated_incident.id,
+                                incident_type=escalated_incident.incident_type,
+                                priority_level=escalated_incident.priority_level,
+                                description=escalated_incident.description,
+                                created_at=escalated_incident.created_at,
+                                assigned_operator=assigned_operator,
+                                status="escalated",
+                                version=escalated_incident.version,
+                                assigned_at=current_time,
+                                escalated_at=escalated_incident.escalated_at,
+                                resolved_at=escalated_incident.resolved_at
+                            )
+                            self.dispatcher.record_assignment(escalated_incident)
+                            reason = f"{reason}; assigned to {assigned_operator}"
                 
-                self.incidents[index] = escalated_incident
-                escalations_made += 1
+                    self.incidents.replace(escalated_incident)
+                    self._record_transition("escalate", escalated_incident, reason)
+                    escalations_made += 1
+
+        return escalations_made
+
+    def _iter_matches(self, status: Optional[str], operator_name: Optional[str], start_date: Optional[datetime],
+                      end_date: Optional[datetime], search_pattern: Optional[str], after: Optional[Tuple]) -> Iterator[Incident]:
+
+        self._merge_history()
+
+        if self.table is not None and search_pattern is None and (
+                status is not None or operator_name is not None or start_date is not None or end_date is not None):
+            return self._iter_table_matches(status, operator_name, start_date, end_date, after)
+
+        # Every filter streams in ID order, starting from the narrowest index ordering on
+        # offer; the remaining predicates are checked here.
+        if start_date is not None or end_date is not None:
+            candidates = self.index.iter_by_created_at(start_date or datetime.min, end_date or datetime.max, after)
+        elif status is not None:
+            candidates = self.index.iter_by_status(status, after=after)
+            status = None
+        elif operator_name is not None:
+            candidates = self.index.iter_by_operator(operator_name, after)
+            operator_name = None
+        elif search_pattern is not None:
+            candidates = self._iter_text_matches(search_pattern, after)
+            search_pattern = None
+        else:
+            candidates = self.index.iter_in_id_order(after)
+
+        if status is not None:
+            candidates = filter_incidents_by_status(candidates, status)
+        if operator_name is not None:
+            candidates = filter_incidents_by_operator(candidates, operator_name)
+        if search_pattern is not None:
+            candidates = filter_incidents_by_text(candidates, search_pattern)
+        return candidates
+
+    def _iter_table_matches(self, status: Optional[str], operator_name: Optional[str], start_date: Optional[datetime],
+                            end_date: Optional[datetime], after: Optional[Tuple]) -> Iterator[Incident]:
+
+        # The filters run as masks over the columnar copy; only incidents a page reads are decoded.
+        table = self.table
+        masks = []
+        if status is not None:
+            masks.append(table.mask_status(status))
+        if operator_name is not None:
+            masks.append(table.mask_operator(operator_name))
+        if start_date is not None or end_date is not None:
+            masks.append(table.mask_created_between(start_date or datetime.min, end_date or datetime.max))
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = mask & other
+
+        incidents = (table.incident_at(int(row)) for row in table.rows_matching(mask, after))
+        if after is None:
+            return incidents
+        return dropwhile(lambda incident: id_key(incident) <= after, incidents)
+
+    def query_incidents(self, status: Optional[str] = None, operator_name: Optional[str] = None,
+                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        search_pattern: Optional[str] = None) -> List[Incident]:
+
+        with self._lock:
+            if self.query_storage:
+                return list(self.storage.query_incidents(
+                    status=status, operator=operator_name, start_date=start_date, end_date=end_date, pattern=search_pattern
+                ))
+            matches = list(self._iter_matches(status, operator_name, start_date, end_date, search_pattern, None))
+        return sorted(matches, key=id_key)
+
+    def page_incidents(self, status: Optional[str] = None, operator_name: Optional[str] = None,
+                       start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                       search_pattern: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                       resume_token: Optional[str] = None) -> Page:
+
+        # Pages come in ID order whatever the filter, so a date range reads like the others.
+        after = decode_resume_token(resume_token, "id") if resume_token else None
+        with self._lock:
+            if self.query_storage:
+                matches = self.storage.query_incidents(
+                    status=status, operator=operator_name, start_date=start_date, end_date=end_date, pattern=search_pattern,
+                    order_by="id", after=after, limit=page_size + 1
+                )
+            else:
+                matches = self._iter_matches(status, operator_name, start_date, end_date, search_pattern, after)
+            return take_page(matches, page_size, id_key, "id")
+
+    def _display_pages(self, fetch_page: Callable[[int, Optional[str]], Page], header: str, empty_message: str,
+                       show_operator: bool = True, page_size: Optional[int] = None) -> None:
+
+        # Each page is formatted into one string and written once. Without a page size the
+        # results still stream in fixed-size pages, just without stopping between them.
+        resume_token = None
+        first_page = True
+        while True:
+            page = fetch_page(page_size or STREAMING_PAGE_SIZE, resume_token)
+            if first_page and not page.incidents:
+                print(empty_message)
+                return
+            text = format_incident_block(page.incidents, show_operator)
+            sys.stdout.write(f"{header}\n{text}" if first_page else text)
+            sys.stdout.flush()
+            first_page = False
 
-    def filter_and_display_incidents_by_status(self, status: str) -> None:
+            resume_token = page.next_token
+            if resume_token is None:
+                return
+            if page_size is not None and input("Press Enter for the next page (or 'q' to stop): ").strip().lower() == "q":
+                return
 
-        all_incidents = self.incidents + self.history_log
-        filtered = list(filter_incidents_by_status(all_incidents, status))
-        
-        if not filtered:
-            print(f"No incidents found with status: {status}")
-            return
-        
-        print(f"=== Incidents with status: {status} ===")
-        for incident in sorted(filtered, key=lambda i: int(i.id)):
-            print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
-            print(f"Assigned to: {incident.assigned_operator}")
-            print(f"Description: {incident.description}\n")
+    def filter_and_display_incidents_by_status(self, status: str, page_size: Optional[int] = None) -> None:
 
-    def filter_and_display_incidents_by_operator(self, operator_name: str) -> None:
+        self._display_pages(
+            lambda size, token: self.page_incidents(status=status, page_size=size, resume_token=token),
+            f"=== Incidents with status: {status} ===",
+            f"No incidents found with status: {status}",
+            page_size=page_size
+        )
 
-        all_incidents = self.incidents + self.history_log
-        filtered = list(filter_incidents_by_operator(all_incidents, operator_name))
-        
-        if not filtered:
-            print(f"No incidents found assigned to: {operator_name}")
-            return
-        
-        print(f"=== Incidents assigned to: {operator_name} ===")
-        for incident in sorted(filtered, key=lambda i: int(i.id)):
-            print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
-            print(f"Description: {incident.description}\n")
+    def filter_and_display_incidents_by_operator(self, operator_name: str, page_size: Optional[int] = None) -> None:
+
+        self._display_pages(
+            lambda size, token: self.page_incidents(operator_name=operator_name, page_size=size, resume_token=token),
+            f"=== Incidents assigned to: {operator_name} ===",
+            f"No incidents found assigned to: {operator_name}",
+            show_operator=False,
+            page_size=page_size
+        )
 
-    def filter_and_display_incidents_by_date_range(self) -> None:
+    def filter_and_display_incidents_by_date_range(self, page_size: Optional[int] = None) -> None:
 
         try:
             start_date_str = input("Start date (YYYY-MM-DD): ").strip()
@@ -228,63 +733,143 @@ class IncidentCLI:
             
             start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
             end_date = datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1)
-            
-            all_incidents = self.incidents + self.history_log
-            filtered = list(filter_incidents_by_date(all_incidents, start_date, end_date))
-            
-            if not filtered:
-                print(f"No incidents found between {start_date_str} and {end_date_str}")
-                return
-            
-            print(f"=== Incidents between {start_date_str} and {end_date_str} ===")
-            for incident in sorted(filtered, key=lambda i: int(i.id)):
-                print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
-                print(f"Assigned to: {incident.assigned_operator}")
-                print(f"Description: {incident.description}\n")
-        
         except ValueError:
             print("✖ Invalid date format. Please use YYYY-MM-DD format.")
+            return
+
+        self._display_pages(
+            lambda size, token: self.page_incidents(start_date=start_date, end_date=end_date, page_size=size, resume_token=token),
+            f"=== Incidents between {start_date_str} and {end_date_str} ===",
+            f"No incidents found between {start_date_str} and {end_date_str}",
+            page_size=page_size
+        )
 
-    def filter_and_display_incidents_by_text(self, search_pattern: str) -> None:
+    def filter_and_display_incidents_by_text(self, search_pattern: str, page_size: Optional[int] = None) -> None:
 
         try:
-            all_incidents = self.incidents + self.history_log
-            filtered = list(filter_incidents_by_text(all_incidents, search_pattern))
-            
-            if not filtered:
-                print(f"No incidents found matching pattern: {search_pattern}")
-                return
-            
-            print(f"=== Incidents matching pattern: {search_pattern} ===")
-            for incident in sorted(filtered, key=lambda i: int(i.id)):
-                print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
-                print(f"Assigned to: {incident.assigned_operator}")
-                print(f"Description: {incident.description}\n")
-        
+            self._display_pages(
+                lambda size, token: self.page_incidents(search_pattern=search_pattern, page_size=size, resume_token=token),
+                f"=== Incidents matching pattern: {search_pattern} ===",
+                f"No incidents found matching pattern: {search_pattern}",
+                page_size=page_size
+            )
         except Exception as e:
             print(f"✖ Error in search pattern: {e}")
 
     def export_incidents_to_json(self) -> None:
 
-        all_incidents = self.incidents + self.history_log
-        self.storage.save_all_incidents_to_json(all_incidents)
+        with self._save_lock:
+            with self._lock:
+                self._merge_history()
+                incidents = list(self._all_incidents())
+                base_versions, self._base_versions = self._base_versions, {}
+            rejected = self._write_incidents(incidents, base_versions)
+        for incident in rejected:
+            print(f"✖ Incident {incident.id} was changed by another process; this session's update to it was not exported.")
         print(f"✔ All incidents exported to {self.storage.file_path}")
 
-    def display_history(self) -> None:
+    def _build_analytics(self) -> IncidentAnalytics:
+
+        # Query-capable backends keep resolved history on disk, so it is streamed from there once.
+        self._merge_history()
+        if self.query_storage:
+            return IncidentAnalytics.from_incidents(chain(self.incidents, self.storage.query_incidents(status="resolved")))
+        return IncidentAnalytics.from_incidents(self._all_incidents())
+
+    @synchronized
+    def analytics_dashboard(self, hours: int = 24, days: int = 7) -> Dict:
+
+        if self.analytics is None:
+            self.analytics = self._build_analytics()
+        return self.analytics.dashboard(hours, days)
+
+    def show_analytics_dashboard(self) -> None:
 
-        if not self.history_log:
-            print("No incidents in history.")
+        dashboard = self.analytics_dashboard()
+        overall = dashboard["overall"]
+        if not overall["created"]:
+            print("No incidents recorded yet.")
             return
-        
-        print("=== Incident History (Resolved/Escalated) ===")
-        for incident in sorted(self.history_log, key=lambda i: int(i.id)):
-            print(f"Created: {incident.created_at.strftime('%Y-%m-%d %H:%M:%S')} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}")
-            print(f"Assigned to: {incident.assigned_operator}")
-            print(f"Description: {incident.description}\n")
 
-    def save_all_incidents(self) -> None:
+        def describe(summary: Dict) -> str:
+            return (f"open {summary['open']} | created {summary['created']} | resolved {summary['resolved']} | "
+                    f"assign {format_duration(summary['mean_time_to_assign'])} "
+                    f"(p90 {format_duration(summary['time_to_assign_quantiles']['p90'])}) | "
+                    f"resolve {format_duration(summary['mean_time_to_resolve'])} "
+                    f"(p90 {format_duration(summary['time_to_resolve_quantiles']['p90'])}) | "
+                    f"escalated {format_rate(summary['escalation_rate'])} | SLA breached {format_rate(summary['sla_breach_rate'])}")
+
+        print(f"All incidents: {describe(overall)}")
+        print("Time to resolve p50/p90/p99: " + " / ".join(
+            format_duration(value) for value in overall["time_to_resolve_quantiles"].values()
+        ))
+        for title, key in (("By type", "by_type"), ("By priority", "by_priority"), ("By operator", "by_operator")):
+            print(f"\n{title}:")
+            for name, summary in dashboard[key].items():
+                print(f"  {name}: {describe(summary)}")
+        print("\nRecent days:")
+        for bucket in dashboard["daily"]:
+            print(f"  {bucket['start'][:10]}: created {bucket['created']} | resolved {bucket['resolved']} | "
+                  f"escalated {bucket['escalated']} | SLA breaches {bucket['sla_breaches']} | "
+                  f"mean resolve {format_duration(bucket['mean_time_to_resolve'])}")
+
+    def display_history(self, page_size: Optional[int] = None) -> None:
+
+        self._display_pages(
+            lambda size, token: self.page_incidents(status="resolved", page_size=size, resume_token=token),
+            "=== Incident History (Resolved/Escalated) ===",
+            "No incidents in history.",
+            page_size=page_size
+        )
 
-        all_incidents = self.incidents + self.history_log
+    def _write_incidents(self, incidents: List[Incident], base_versions: Dict[str, Optional[int]]) -> List[Incident]:
+
+        # Runs without the state lock: transitions made meanwhile go into a fresh _base_versions
+        # and are saved next time. Storage that other processes may write too merges this
+        # session's changes into the archive; what they changed in the meantime is loaded, and
+        # losing updates are returned.
+        merge_and_save = getattr(self.storage, "merge_and_save", None)
+        rejected: List[Incident] = []
+        try:
+            if merge_and_save is None:
+                self.storage.save_all_incidents(incidents)
+            else:
+                merged, rejected = merge_and_save(incidents, base_versions)
+                if merged is not None:
+                    with self._lock:
+                        # Incidents changed during the write keep their newer in-memory state.
+                        latest = {incident.id: incident for incident in merged}
+                        for incident_id in self._base_versions:
+                            incident = self.index.get(incident_id)
+                            if incident is not None:
+                                latest[incident_id] = incident
+                        self._replace_state(list(latest.values()))
+        except BaseException:
+            with self._lock:
+                # Nothing was saved, so these changes stay unsaved from the versions they started at.
+                self._base_versions = {**self._base_versions, **base_versions}
+            raise
+        return rejected
+
+    def save_all_incidents(self) -> List[Incident]:
+
+        with self._save_lock:
+            if self.storage.journaled:
+                self.storage.flush()
+                return []
+            with self._lock:
+                final_incidents = self._latest_incidents()
+                base_versions, self._base_versions = self._base_versions, {}
+            rejected = self._write_incidents(final_incidents, base_versions)
+        for incident in rejected:
+            print(f"Warning: incident {incident.id} was changed by another process; this session's update to it was not saved.",
+                  file=sys.stderr)
+        return rejected
+
+    def _latest_incidents(self) -> List[Incident]:
+
+        self._merge_history()
+        all_incidents = self._all_incidents()
         
         unique_incidents = {}
         for incident in all_incidents:
@@ -301,5 +886,4 @@ class IncidentCLI:
                 if status_priority.get(incident.status, 0) >= status_priority.get(current.status, 0):
                     unique_incidents[incident.id] = incident
         
-        final_incidents = list(unique_incidents.values())
-        self.storage.save_all_incidents_to_json(final_incidents)
\ No newline at end of file
+        return list(unique_incidents.values())
\ No newline at end of file
@@ -1,9 +1,14 @@
-from .dispatcher import IncidentDispatcher
-from .escalator import IncidentEscalator
-from .validator import IncidentAssignmentValidator
+from incident.lazy import lazy_exports
 
-__all__ = [
-    'IncidentDispatcher',
-    'IncidentEscalator',
-    'IncidentAssignmentValidator'
-]
\ No newline at end of file
+# Names are imported from their submodule on first access.
+_EXPORTS = {
+    'IncidentDispatcher': '.dispatcher',
+    'IncidentEscalator': '.escalator',
+    'IncidentAssignmentValidator': '.validator',
+    'EscalationScheduler': '.scheduler',
+    'IncidentAnalytics': '.analytics',
+    'QuantileSketch': '.analytics'
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
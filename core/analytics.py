@@ -0,0 +1,273 @@
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from incident.models import EPOCH, Incident
+
+
+# Time from creation to resolution each priority is expected to stay within.
+DEFAULT_SLA_TARGETS = {"high": timedelta(hours=4), "medium": timedelta(hours=24), "low": timedelta(hours=72)}
+DASHBOARD_QUANTILES = (0.5, 0.9, 0.99)
+HOURLY_RETENTION = 48
+DAILY_RETENTION = 90
+
+
+class QuantileSketch:
+
+    def __init__(self, relative_accuracy: float = 0.01):
+
+        # Logarithmic buckets: every estimate is within relative_accuracy of a real value, and
+        # the bucket count depends on the spread of values rather than on how many were added.
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self._sorted_keys: Optional[List[int]] = None
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+
+        self.count += 1
+        self.total += value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        if key not in self.bins:
+            self.bins[key] = 0
+            self._sorted_keys = None
+        self.bins[key] += 1
+
+    @property
+    def mean(self) -> Optional[float]:
+
+        return self.total / self.count if self.count else None
+
+    def quantile(self, fraction: float) -> Optional[float]:
+
+        if not self.count:
+            return None
+        rank = fraction * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.bins)
+        for key in self._sorted_keys:
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** self._sorted_keys[-1] / (self._gamma + 1)
+
+
+@dataclass
+class LifecycleStats:
+
+    created: int = 0
+    assigned: int = 0
+    escalated: int = 0
+    resolved: int = 0
+    sla_breaches: int = 0
+    open: int = 0
+    # Seconds from creation to the first assignment and to resolution.
+    time_to_assign: QuantileSketch = field(default_factory=QuantileSketch)
+    time_to_resolve: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def summary(self) -> Dict:
+
+        # Escalation rates are per created incident, except for operators, who only see
+        # incidents once they are assigned.
+        return {
+            "created": self.created,
+            "assigned": self.assigned,
+            "escalated": self.escalated,
+            "resolved": self.resolved,
+            "open": self.open,
+            "escalation_rate": _rate(self.escalated, self.created or self.assigned),
+            "sla_breaches": self.sla_breaches,
+            "sla_breach_rate": _rate(self.sla_breaches, self.resolved),
+            "mean_time_to_assign": self.time_to_assign.mean,
+            "mean_time_to_resolve": self.time_to_resolve.mean,
+            "time_to_assign_quantiles": _quantiles(self.time_to_assign),
+            "time_to_resolve_quantiles": _quantiles(self.time_to_resolve),
+        }
+
+
+def _rate(count: int, total: int) -> Optional[float]:
+
+    return count / total if total else None
+
+
+def _group(groups: Dict[str, LifecycleStats], key: str) -> LifecycleStats:
+
+    stats = groups.get(key)
+    if stats is None:
+        stats = groups[key] = LifecycleStats()
+    return stats
+
+
+def _quantiles(sketch: QuantileSketch) -> Dict[str, Optional[float]]:
+
+    return {f"p{round(fraction * 100)}": sketch.quantile(fraction) for fraction in DASHBOARD_QUANTILES}
+
+
+class TimeRollup:
+
+    def __init__(self, width: timedelta, retention: int):
+
+        # Keeps the newest `retention` buckets; transitions older than all of them are dropped.
+        self.width = width
+        self.retention = retention
+        self.buckets: Dict[datetime, LifecycleStats] = {}
+
+    def bucket_start(self, timestamp: datetime) -> datetime:
+
+        return EPOCH + (timestamp - EPOCH) // self.width * self.width
+
+    def bucket(self, timestamp: datetime) -> Optional[LifecycleStats]:
+
+        start = self.bucket_start(timestamp)
+        stats = self.buckets.get(start)
+        if stats is not None:
+            return stats
+        if len(self.buckets) >= self.retention:
+            oldest = min(self.buckets)
+            if start < oldest:
+                return None
+            del self.buckets[oldest]
+        stats = self.buckets[start] = LifecycleStats()
+        return stats
+
+    def latest(self, count: int) -> List[Tuple[datetime, LifecycleStats]]:
+
+        # A slice from -0 would return every bucket.
+        if count <= 0:
+            return []
+        return sorted(self.buckets.items())[-count:]
+
+
+class IncidentAnalytics:
+
+    def __init__(self, sla_targets: Optional[Dict[str, timedelta]] = None):
+
+        # Running aggregates updated on every transition, so dashboards read counters and
+        # sketches instead of scanning history. Everything here can be rebuilt from the
+        # incidents themselves, because each one carries its lifecycle timestamps.
+        self.sla_targets = dict(sla_targets if sla_targets is not None else DEFAULT_SLA_TARGETS)
+        self.overall = LifecycleStats()
+        self.by_type: Dict[str, LifecycleStats] = {}
+        self.by_priority: Dict[str, LifecycleStats] = {}
+        self.by_operator: Dict[str, LifecycleStats] = {}
+        self.hourly = TimeRollup(timedelta(hours=1), HOURLY_RETENTION)
+        self.daily = TimeRollup(timedelta(days=1), DAILY_RETENTION)
+
+    @classmethod
+    def from_incidents(cls, incidents: Iterable[Incident], sla_targets: Optional[Dict[str, timedelta]] = None) -> "IncidentAnalytics":
+
+        analytics = cls(sla_targets)
+        for incident in incidents:
+            analytics.replay(incident)
+        return analytics
+
+    def _groups(self, incident: Incident, operator: bool) -> List[LifecycleStats]:
+
+        groups = [self.overall, _group(self.by_type, incident.incident_type), _group(self.by_priority, incident.priority_level)]
+        if operator and incident.assigned_operator:
+            groups.append(_group(self.by_operator, incident.assigned_operator))
+        return groups
+
+    def _rollups(self, timestamp: Optional[datetime]) -> List[LifecycleStats]:
+
+        if timestamp is None:
+            return []
+        return [bucket for bucket in (self.hourly.bucket(timestamp), self.daily.bucket(timestamp)) if bucket is not None]
+
+    def _created(self, incident: Incident) -> None:
+
+        for stats in self._groups(incident, operator=False):
+            stats.created += 1
+            stats.open += 1
+        for stats in self._rollups(incident.created_at):
+            stats.created += 1
+
+    def _assigned(self, incident: Incident) -> None:
+
+        waited = None
+        if incident.assigned_at is not None:
+            waited = (incident.assigned_at - incident.created_at).total_seconds()
+        for stats in self._groups(incident, operator=True) + self._rollups(incident.assigned_at):
+            stats.assigned += 1
+            if waited is not None:
+                stats.time_to_assign.add(waited)
+        if incident.assigned_operator:
+            self.by_operator[incident.assigned_operator].open += 1
+
+    def _escalated(self, incident: Incident) -> None:
+
+        for stats in self._groups(incident, operator=True) + self._rollups(incident.escalated_at):
+            stats.escalated += 1
+
+    def _resolved(self, incident: Incident) -> None:
+
+        took = breached = None
+        if incident.resolved_at is not None:
+            took = incident.resolved_at - incident.created_at
+            target = self.sla_targets.get(incident.priority_level)
+            breached = target is not None and took > target
+        groups = self._groups(incident, operator=True)
+        for stats in groups:
+            stats.open -= 1
+        for stats in groups + self._rollups(incident.resolved_at):
+            stats.resolved += 1
+            if took is not None:
+                stats.time_to_resolve.add(took.total_seconds())
+            if breached:
+                stats.sla_breaches += 1
+
+    def observe(self, action: str, incident: Incident) -> None:
+
+        if action == "create":
+            self._created(incident)
+        elif action == "assign":
+            self._assigned(incident)
+        elif action == "escalate":
+            # An escalation that finds no operator assigns one in the same step.
+            if incident.assigned_at is not None and incident.assigned_at == incident.escalated_at:
+                self._assigned(incident)
+            self._escalated(incident)
+        elif action == "resolve":
+            self._resolved(incident)
+
+    def replay(self, incident: Incident) -> None:
+
+        # Counts every transition a loaded incident went through. Records from before
+        # timestamps were kept still count, but add no durations or rollups.
+        self._created(incident)
+        if incident.assigned_operator or incident.assigned_at is not None:
+            self._assigned(incident)
+        if incident.escalated_at is not None or incident.status == "escalated":
+            self._escalated(incident)
+        if incident.status == "resolved":
+            self._resolved(incident)
+
+    def dashboard(self, hours: int = 24, days: int = 7) -> Dict:
+
+        def rollup(buckets: List[Tuple[datetime, LifecycleStats]]) -> List[Dict]:
+            return [
+                {"start": start.isoformat(), "created": stats.created, "assigned": stats.assigned,
+                 "escalated": stats.escalated, "resolved": stats.resolved, "sla_breaches": stats.sla_breaches,
+                 "mean_time_to_resolve": stats.time_to_resolve.mean}
+                for start, stats in buckets
+            ]
+
+        return {
+            "overall": self.overall.summary(),
+            "by_type": {key: stats.summary() for key, stats in sorted(self.by_type.items())},
+            "by_priority": {key: stats.summary() for key, stats in sorted(self.by_priority.items())},
+            "by_operator": {key: stats.summary() for key, stats in sorted(self.by_operator.items())},
+            "hourly": rollup(self.hourly.latest(hours)),
+            "daily": rollup(self.daily.latest(days)),
+            "sla_targets": {priority: target.total_seconds() for priority, target in self.sla_targets.items()},
+        }
\ No newline at end of file
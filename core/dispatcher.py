@@ -1,26 +1,135 @@
-from typing import Optional, Set
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from incident.models import Incident
 from .validator import IncidentAssignmentValidator
 
 
 class IncidentDispatcher:
-    
-    def __init__(self, available_operators: Set[str], validator: IncidentAssignmentValidator):
+
+    def __init__(self, available_operators: Set[str], validator: IncidentAssignmentValidator,
+                 max_load_per_operator: Optional[Dict[str, int]] = None, default_max_load: Optional[int] = None,
+                 priority_weights: Optional[Dict[str, int]] = None):
 
         self.available_operators = available_operators
         self.validator = validator
+        # Loads are measured in priority weight units; with no weights every incident counts as 1.
+        self.max_load_per_operator = max_load_per_operator or {}
+        self.default_max_load = default_max_load
+        self.priority_weights = priority_weights or {}
+        self.operator_loads: Dict[str, int] = {operator: 0 for operator in available_operators}
+
+    def incident_weight(self, incident: Incident) -> int:
+
+        return self.priority_weights.get(incident.priority_level, 1)
+
+    def max_load_for(self, operator_name: str) -> Optional[int]:
+
+        return self.max_load_per_operator.get(operator_name, self.default_max_load)
+
+    def has_capacity(self, operator_name: str, incident: Incident) -> bool:
+
+        max_load = self.max_load_for(operator_name)
+        if max_load is None:
+            return True
+        return self.operator_loads.get(operator_name, 0) + self.incident_weight(incident) <= max_load
+
+    def record_assignment(self, incident: Incident) -> None:
+
+        if incident.assigned_operator:
+            operator_name = incident.assigned_operator
+            self.operator_loads[operator_name] = self.operator_loads.get(operator_name, 0) + self.incident_weight(incident)
+
+    def release_assignment(self, incident: Incident) -> None:
+
+        if incident.assigned_operator in self.operator_loads:
+            operator_name = incident.assigned_operator
+            self.operator_loads[operator_name] = max(0, self.operator_loads[operator_name] - self.incident_weight(incident))
+
+    def eligible_operators(self, incident_type: str) -> List[str]:
+
+        # Compiled rules list each type's operators sorted, so the filter keeps that order.
+        available_operators = self.available_operators
+        return [
+            operator_name for operator_name in self.validator.eligible_operators(incident_type)
+            if operator_name in available_operators
+        ]
+
+    def select_operator(self, incident: Incident, respect_capacity: bool = True) -> Optional[str]:
+
+        candidates = [
+            (self.operator_loads.get(operator_name, 0), operator_name)
+            for operator_name in self.eligible_operators(incident.incident_type)
+            if not respect_capacity or self.has_capacity(operator_name, incident)
+        ]
+        return min(candidates)[1] if candidates else None
+
+    def _with_operator(self, incident: Incident, operator_name: str) -> Incident:
+
+        return Incident(
+            id=incident.id,
+            incident_type=incident.incident_type,
+            priority_level=incident.priority_level,
+            description=incident.description,
+            created_at=incident.created_at,
+            assigned_operator=operator_name,
+            status="in_progress",
+            version=incident.version + 1,
+            assigned_at=datetime.now(),
+            escalated_at=incident.escalated_at,
+            resolved_at=incident.resolved_at
+        )
 
     def assign_incident_to_operator(self, incident: Incident, operator_name: str) -> Optional[Incident]:
 
-        if (operator_name in self.available_operators and 
-            self.validator.is_assignment_valid(incident, operator_name)):
-            return Incident(
-                id=incident.id,
-                incident_type=incident.incident_type,
-                priority_level=incident.priority_level,
-                description=incident.description,
-                created_at=incident.created_at,
-                assigned_operator=operator_name,
-                status="in_progress"
-            )
-        return None
\ No newline at end of file
+        if (operator_name in self.available_operators and
+            self.validator.is_assignment_valid(incident, operator_name) and
+            self.has_capacity(operator_name, incident)):
+            assigned_incident = self._with_operator(incident, operator_name)
+            self.record_assignment(assigned_incident)
+            return assigned_incident
+        return None
+
+    def assign_many(self, incidents: Iterable[Incident]) -> List[Incident]:
+
+        # One lazy min-heap of (load, operator) per incident type. Loads are shared across
+        # types, so an entry whose load is out of date is refreshed when it reaches the top.
+        heaps: Dict[str, List[Tuple[int, str]]] = {}
+        assigned: List[Incident] = []
+
+        for incident in incidents:
+            if incident.status != "pending":
+                continue
+            heap = heaps.get(incident.incident_type)
+            if heap is None:
+                heap = [(self.operator_loads.get(name, 0), name) for name in self.eligible_operators(incident.incident_type)]
+                heapq.heapify(heap)
+                heaps[incident.incident_type] = heap
+
+            operator_name = None
+            while heap:
+                load, candidate = heap[0]
+                current_load = self.operator_loads.get(candidate, 0)
+                if load != current_load:
+                    heapq.heapreplace(heap, (current_load, candidate))
+                    continue
+                max_load = self.max_load_for(candidate)
+                if max_load is not None and current_load >= max_load:
+                    # Loads only grow during a batch, so a full operator stays full.
+                    heapq.heappop(heap)
+                    continue
+                if self.has_capacity(candidate, incident):
+                    operator_name = candidate
+                else:
+                    # Heavier incident than the least-loaded operator can absorb; operators
+                    # may have different limits, so look for anyone who still fits.
+                    operator_name = self.select_operator(incident)
+                break
+
+            if operator_name is None:
+                continue
+            assigned_incident = self._with_operator(incident, operator_name)
+            self.record_assignment(assigned_incident)
+            assigned.append(assigned_incident)
+
+        return assigned
\ No newline at end of file
@@ -9,6 +9,10 @@ class IncidentEscalator:
 
         self.escalation_threshold = timedelta(minutes=escalation_threshold_minutes)
 
+    def escalation_deadline(self, incident: Incident) -> datetime:
+
+        return incident.created_at + self.escalation_threshold
+
     def escalate_if_needed(self, incident: Incident, current_time: datetime) -> Tuple[Optional[Incident], str]:
 
         time_exceeded = (current_time - incident.created_at) > self.escalation_threshold
@@ -29,6 +33,10 @@ class IncidentEscalator:
             description=incident.description,
             created_at=incident.created_at,
             assigned_operator=incident.assigned_operator,
-            status="escalated"
+            status="escalated",
+            version=incident.version + 1,
+            assigned_at=incident.assigned_at,
+            escalated_at=current_time,
+            resolved_at=incident.resolved_at
         )
         return escalated_incident, f"Incident {incident.id}: Successfully escalated"
\ No newline at end of file
@@ -0,0 +1,44 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, Tuple
+from incident.models import Incident
+from .escalator import IncidentEscalator
+
+
+class EscalationScheduler:
+
+    def __init__(self, escalator: IncidentEscalator):
+
+        self.escalator = escalator
+        self._heap: List[Tuple[datetime, str]] = []
+        self._deadlines: Dict[str, datetime] = {}
+
+    def schedule(self, incident: Incident) -> None:
+
+        deadline = self.escalator.escalation_deadline(incident)
+        self._deadlines[incident.id] = deadline
+        heapq.heappush(self._heap, (deadline, incident.id))
+
+    def cancel(self, incident_id: str) -> None:
+
+        # Heap entries are invalidated lazily: an entry only counts while it still
+        # matches the deadline recorded for its incident.
+        if self._deadlines.pop(incident_id, None) is not None and len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, incident_id) for incident_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def pop_due(self, current_time: datetime) -> List[str]:
+
+        due_incident_ids = []
+        heap = self._heap
+        # Escalation requires the threshold to be strictly exceeded.
+        while heap and heap[0][0] < current_time:
+            deadline, incident_id = heapq.heappop(heap)
+            if self._deadlines.get(incident_id) == deadline:
+                del self._deadlines[incident_id]
+                due_incident_ids.append(incident_id)
+        return due_incident_ids
+
+    def __len__(self) -> int:
+
+        return len(self._deadlines)
\ No newline at end of file
@@ -1,11 +1,16 @@
-from typing import Dict, Set
+from typing import Dict, Set, Tuple, Union
 from incident.models import Incident
+from rules.engine import RulesEngine
 
 
 class IncidentAssignmentValidator:
     
-    def __init__(self, rules_by_type: Dict[str, Set[str]]):
-        self.rules_by_type = rules_by_type
+    def __init__(self, rules: Union[Dict[str, Set[str]], RulesEngine]):
+        self.rules = rules if isinstance(rules, RulesEngine) else RulesEngine.from_mapping(rules)
 
     def is_assignment_valid(self, incident: Incident, operator_name: str) -> bool:
-        return operator_name in self.rules_by_type.get(incident.incident_type, set())
\ No newline at end of file
+        # The engine swaps its compiled tables wholesale on reload, so one read sees a consistent set.
+        return self.rules.compiled.allows(operator_name, incident.incident_type)
+
+    def eligible_operators(self, incident_type: str) -> Tuple[str, ...]:
+        return self.rules.compiled.eligible_by_type.get(incident_type, ())
\ No newline at end of file
@@ -1,19 +1,21 @@
-from .models import Incident, incident_to_dict, clear_console, validate_input, validate_integer_input
-from .filters import (
-    filter_incidents_by_status,
-    filter_incidents_by_operator,
-    filter_incidents_by_date,
-    filter_incidents_by_text
-)
+from .lazy import lazy_exports
 
-__all__ = [
-    'Incident',
-    'incident_to_dict',
-    'clear_console',
-    'validate_input',
-    'validate_integer_input',
-    'filter_incidents_by_status',
-    'filter_incidents_by_operator',
-    'filter_incidents_by_date',
-    'filter_incidents_by_text'
-]
\ No newline at end of file
+# Names are imported from their submodule on first access.
+_EXPORTS = {
+    'Incident': '.models',
+    'incident_to_dict': '.models',
+    'incident_from_dict': '.models',
+    'clear_console': '.models',
+    'validate_input': '.models',
+    'validate_integer_input': '.models',
+    'filter_incidents_by_status': '.filters',
+    'filter_incidents_by_operator': '.filters',
+    'filter_incidents_by_date': '.filters',
+    'filter_incidents_by_text': '.filters',
+    'IncidentStore': '.store',
+    'normalize_incident_id': '.store',
+    'IncidentIndex': '.indexes'
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+from .models import datetime_to_epoch_microseconds
+
+
+@dataclass(frozen=True, slots=True)
+class CompactIncident:
+    # Types, priorities, statuses and operators are shared strings from a FlyweightPool, so
+    # any value a rules file defines fits without a code table. The ID stays the stored
+    # string, because not every ID is numeric.
+    id: str
+    incident_type: str
+    priority_level: str
+    description: str
+    created_at: int
+    assigned_operator: Optional[str]
+    status: str
+    version: int = 0
+    # Epoch microseconds of each lifecycle transition, None until it happens.
+    assigned_at: Optional[int] = None
+    escalated_at: Optional[int] = None
+    resolved_at: Optional[int] = None
+
+
+class FlyweightPool:
+
+    # Shares one object per distinct value (operator, type, priority, status) across every
+    # compact incident.
+    def __init__(self):
+
+        self._values: Dict[str, str] = {}
+
+    def value(self, value: str) -> str:
+
+        return self._values.setdefault(value, sys.intern(value))
+
+    def operator(self, operator_name: Optional[str]) -> Optional[str]:
+
+        if operator_name is None:
+            return None
+        return self.value(operator_name)
+
+
+def compact_incident_from_dict(item: Dict, pool: FlyweightPool) -> CompactIncident:
+
+    # Parses the ISO timestamp straight into epoch microseconds without keeping the datetime.
+    created_at = epoch_microseconds_from_isoformat(item["created_at"])
+    return CompactIncident(
+        id=item["id"],
+        incident_type=pool.value(item["incident_type"]),
+        priority_level=pool.value(item["priority_level"]),
+        description=item["description"],
+        created_at=created_at,
+        assigned_operator=pool.operator(item["assigned_operator"]),
+        status=pool.value(item["status"]),
+        version=item.get("version", 0),
+        assigned_at=_optional_epoch_microseconds_from_isoformat(item.get("assigned_at")),
+        escalated_at=_optional_epoch_microseconds_from_isoformat(item.get("escalated_at")),
+        resolved_at=_optional_epoch_microseconds_from_isoformat(item.get("resolved_at"))
+    )
+
+
+def epoch_microseconds_from_isoformat(value: str) -> int:
+
+    return datetime_to_epoch_microseconds(datetime.fromisoformat(value))
+
+
+def _optional_epoch_microseconds_from_isoformat(value: Optional[str]) -> Optional[int]:
+
+    return None if value is None else epoch_microseconds_from_isoformat(value)
\ No newline at end of file
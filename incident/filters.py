@@ -1,20 +1,29 @@
 import re
 from datetime import datetime
-from typing import List, Iterator
+from typing import Iterable, Iterator, Union
 from .models import Incident
+from .indexes import IncidentIndex
 
 
-def filter_incidents_by_status(incidents: List[Incident], status: str) -> Iterator[Incident]:
+def filter_incidents_by_status(incidents: Union[Iterable[Incident], IncidentIndex], status: str) -> Iterator[Incident]:
+    if isinstance(incidents, IncidentIndex):
+        return incidents.iter_by_status(status)
     return (incident for incident in incidents if incident.status == status)
 
 
-def filter_incidents_by_operator(incidents: List[Incident], operator_name: str) -> Iterator[Incident]:
+def filter_incidents_by_operator(incidents: Union[Iterable[Incident], IncidentIndex], operator_name: str) -> Iterator[Incident]:
+    if isinstance(incidents, IncidentIndex):
+        return incidents.iter_by_operator(operator_name)
     return (incident for incident in incidents if incident.assigned_operator == operator_name)
 
 
-def filter_incidents_by_date(incidents: List[Incident], start_date: datetime, end_date: datetime) -> Iterator[Incident]:
+def filter_incidents_by_date(incidents: Union[Iterable[Incident], IncidentIndex], start_date: datetime, end_date: datetime) -> Iterator[Incident]:
+    if isinstance(incidents, IncidentIndex):
+        return incidents.iter_by_created_at(start_date, end_date)
     return (incident for incident in incidents if start_date <= incident.created_at <= end_date)
 
-def filter_incidents_by_text(incidents: List[Incident], search_pattern: str) -> Iterator[Incident]:
+def filter_incidents_by_text(incidents: Union[Iterable[Incident], IncidentIndex], search_pattern: str) -> Iterator[Incident]:
+    if isinstance(incidents, IncidentIndex):
+        return incidents.iter_by_text(search_pattern)
     pattern = re.compile(search_pattern)
     return (incident for incident in incidents if pattern.search(incident.description))
\ No newline at end of file
@@ -0,0 +1,47 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Optional
+from .models import Incident
+
+
+@lru_cache(maxsize=4096)
+def _date_prefix(ordinal: int) -> str:
+
+    return datetime.fromordinal(ordinal).strftime("%Y-%m-%d ")
+
+
+def format_timestamp(value: datetime) -> str:
+
+    # Same text as strftime('%Y-%m-%d %H:%M:%S'); the date half is cached per day.
+    return f"{_date_prefix(value.toordinal())}{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+
+
+def format_duration(seconds: Optional[float]) -> str:
+
+    if seconds is None:
+        return "-"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m" if minutes else f"{int(seconds)}s"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 48:
+        return f"{hours}h {minutes:02d}m"
+    return f"{hours // 24}d {hours % 24}h"
+
+
+def format_rate(rate: Optional[float]) -> str:
+
+    return "-" if rate is None else f"{rate:.1%}"
+
+
+def format_incident_details(incident: Incident, show_operator: bool = True) -> str:
+
+    lines = f"Created: {format_timestamp(incident.created_at)} | [{incident.id}] {incident.incident_type} | Priority: {incident.priority_level} | Status: {incident.status}\n"
+    if show_operator:
+        lines += f"Assigned to: {incident.assigned_operator}\n"
+    return lines + f"Description: {incident.description}\n\n"
+
+
+def format_incident_block(incidents: Iterable[Incident], show_operator: bool = True) -> str:
+
+    return "".join(format_incident_details(incident, show_operator) for incident in incidents)
\ No newline at end of file
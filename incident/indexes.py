@@ -0,0 +1,266 @@
+import bisect
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Incident
+from .sorted_blocks import SortedBlockList
+from .text_index import DescriptionTextIndex, incident_id_key
+
+
+OPEN_STATUSES = ("pending", "in_progress", "escalated")
+RESOLVABLE_STATUSES = ("in_progress", "escalated")
+PRIORITY_RANKS = {"high": 1, "medium": 2, "low": 3}
+# A date window holding more than this share of all incidents is read by walking the ID
+# ordering instead of sorting the window.
+DATE_WINDOW_SCAN_SHARE = 8
+
+
+def id_key(incident: Incident) -> Tuple[int, str]:
+
+    return incident_id_key(incident.id)
+
+
+def priority_key(incident: Incident) -> Tuple[int, int, datetime, int, str]:
+
+    # The open-incident view: escalated first, then high/medium/low, then oldest first.
+    return (
+        0 if incident.status == "escalated" else 1,
+        PRIORITY_RANKS.get(incident.priority_level, 3),
+        incident.created_at
+    ) + id_key(incident)
+
+
+def created_at_key(incident: Incident) -> Tuple[datetime, int, str]:
+
+    # Ends in the id_key, so ties within one timestamp break by ID.
+    numeric_id = int(incident.id) if incident.id.isdigit() else -1
+    return (incident.created_at, numeric_id, incident.id)
+
+
+class IncidentIndex:
+
+    def __init__(self, incidents: Optional[Iterable[Incident]] = None):
+
+        self._by_id: Dict[str, Incident] = {}
+        self._by_status: Dict[str, SortedBlockList] = {}
+        self._by_operator: Dict[str, SortedBlockList] = {}
+        self._by_created_at = SortedBlockList()
+        self._by_priority = SortedBlockList()
+        self._resolvable = SortedBlockList()
+        self._text = DescriptionTextIndex()
+        for incident in incidents or []:
+            self.add(incident)
+
+    def add(self, incident: Incident) -> None:
+
+        if incident.id in self._by_id:
+            raise KeyError(f"Incident {incident.id} is already indexed")
+        self._by_id[incident.id] = incident
+        self._add_to_orderings(incident)
+        if incident.assigned_operator:
+            self._by_operator.setdefault(incident.assigned_operator, SortedBlockList()).add(id_key(incident))
+        self._by_created_at.add(created_at_key(incident))
+        self._text.add(incident.id, incident.description)
+
+    def _add_to_orderings(self, incident: Incident) -> None:
+
+        self._by_status.setdefault(incident.status, SortedBlockList()).add(id_key(incident))
+        if incident.status in OPEN_STATUSES:
+            self._by_priority.add(priority_key(incident))
+        if incident.status in RESOLVABLE_STATUSES:
+            self._resolvable.add(id_key(incident))
+
+    def _remove_from_orderings(self, incident: Incident) -> None:
+
+        self._discard(self._by_status, incident.status, id_key(incident))
+        if incident.status in OPEN_STATUSES:
+            self._by_priority.remove(priority_key(incident))
+        if incident.status in RESOLVABLE_STATUSES:
+            self._resolvable.remove(id_key(incident))
+
+    def update(self, incident: Incident) -> None:
+
+        previous = self._by_id[incident.id]
+        self._by_id[incident.id] = incident
+        if (previous.status, previous.priority_level, previous.created_at) != (incident.status, incident.priority_level, incident.created_at):
+            self._remove_from_orderings(previous)
+            self._add_to_orderings(incident)
+        if previous.assigned_operator != incident.assigned_operator:
+            if previous.assigned_operator:
+                self._discard(self._by_operator, previous.assigned_operator, id_key(previous))
+            if incident.assigned_operator:
+                self._by_operator.setdefault(incident.assigned_operator, SortedBlockList()).add(id_key(incident))
+        if previous.created_at != incident.created_at:
+            self._by_created_at.remove(created_at_key(previous))
+            self._by_created_at.add(created_at_key(incident))
+        if previous.description != incident.description:
+            self._text.remove(incident.id)
+            self._text.add(incident.id, incident.description)
+
+    def remove(self, incident_id: str) -> Incident:
+
+        incident = self._by_id.pop(incident_id)
+        self._remove_from_orderings(incident)
+        if incident.assigned_operator:
+            self._discard(self._by_operator, incident.assigned_operator, id_key(incident))
+        self._by_created_at.remove(created_at_key(incident))
+        self._text.remove(incident_id)
+        return incident
+
+    @staticmethod
+    def _discard(buckets: Dict[str, SortedBlockList], key: str, value: Tuple) -> None:
+
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.remove(value)
+            if not bucket:
+                del buckets[key]
+
+    def get(self, incident_id: str) -> Optional[Incident]:
+
+        return self._by_id.get(incident_id)
+
+    def iter_by_status(self, status: str, offset: int = 0, limit: Optional[int] = None,
+                       after: Optional[Tuple[int, str]] = None) -> Iterator[Incident]:
+
+        # In ID order; `after` resumes past that id_key.
+        bucket = self._by_status.get(status)
+        if bucket is None:
+            return iter(())
+        if after is not None:
+            return self._resume(bucket, after)
+        return self._page(bucket, offset, limit)
+
+    def _resume(self, ordering: SortedBlockList, after: Tuple) -> Iterator[Incident]:
+
+        by_id = self._by_id
+        return (by_id[key[-1]] for key in ordering.irange(after, include_minimum=False))
+
+    def iter_in_id_order(self, after: Optional[Tuple[int, str]] = None) -> Iterator[Incident]:
+
+        buckets = [bucket.irange(after, include_minimum=False) if after is not None else iter(bucket)
+                   for bucket in self._by_status.values()]
+        by_id = self._by_id
+        return (by_id[key[-1]] for key in heapq.merge(*buckets))
+
+    def _page(self, ordering: SortedBlockList, offset: int, limit: Optional[int]) -> Iterator[Incident]:
+
+        by_id = self._by_id
+        stop = None if limit is None else offset + limit
+        return (by_id[key[-1]] for key in ordering.islice(offset, stop))
+
+    def iter_open_by_priority(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Incident]:
+
+        return self._page(self._by_priority, offset, limit)
+
+    def iter_assignable(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Incident]:
+
+        return self.iter_by_status("pending", offset, limit)
+
+    def iter_resolvable(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Incident]:
+
+        return self._page(self._resolvable, offset, limit)
+
+    def count_open(self) -> int:
+
+        return len(self._by_priority)
+
+    def iter_by_operator(self, operator_name: str, after: Optional[Tuple[int, str]] = None) -> Iterator[Incident]:
+
+        # In ID order; `after` resumes past that id_key.
+        bucket = self._by_operator.get(operator_name)
+        if bucket is None:
+            return iter(())
+        if after is not None:
+            return self._resume(bucket, after)
+        return self._page(bucket, 0, None)
+
+    def iter_by_created_at(self, start_date: datetime, end_date: datetime,
+                           after: Optional[Tuple[int, str]] = None) -> Iterator[Incident]:
+
+        # In ID order; `after` resumes past that id_key. created_at does not have to grow with
+        # the ID (back-dated creates, IDs reserved by another process), so the window found by
+        # two bisects is sorted by ID here. A window covering a large share of the archive is
+        # cheaper to find by walking the ID ordering and checking each created_at.
+        by_id = self._by_id
+        scan_above = len(by_id) // DATE_WINDOW_SCAN_SHARE
+        window: List[Tuple[int, str]] = []
+        for _, numeric_id, incident_id in self._by_created_at.irange((start_date,), (end_date, float("inf"))):
+            window.append((numeric_id, incident_id))
+            if len(window) > scan_above:
+                return (
+                    incident for incident in self.iter_in_id_order(after)
+                    if start_date <= incident.created_at <= end_date
+                )
+        window.sort()
+        start = 0 if after is None else bisect.bisect_right(window, after)
+        return (by_id[incident_id] for _, incident_id in window[start:])
+
+    def iter_by_text(self, search_pattern: str, after: Optional[Tuple[int, str]] = None) -> Iterator[Incident]:
+
+        # In ID order; `after` resumes past that id_key with one bisect over the cached matches.
+        matches = self._text.search(search_pattern)
+        low, high = 0, len(matches)
+        while after is not None and low < high:
+            middle = (low + high) // 2
+            if incident_id_key(matches[middle]) <= after:
+                low = middle + 1
+            else:
+                high = middle
+        by_id = self._by_id
+        return (by_id[matches[position]] for position in range(low, len(matches)))
+
+    def narrows_text_search(self, search_pattern: str) -> bool:
+
+        # False when the pattern has no literal or word the text index could look up, so a
+        # search would have to scan every description.
+        return self._text.candidate_ids(search_pattern) is not None
+
+    def count_by_status(self, status: str) -> int:
+
+        return len(self._by_status.get(status, ()))
+
+    def __iter__(self) -> Iterator[Incident]:
+
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+
+        return len(self._by_id)
+
+    def check_consistency(self, incidents: Iterable[Incident]) -> List[str]:
+
+        problems = []
+        expected = {}
+        for incident in incidents:
+            if incident.id in expected:
+                problems.append(f"Incident {incident.id} appears more than once in the source")
+            expected[incident.id] = incident
+
+        for incident_id in expected.keys() - self._by_id.keys():
+            problems.append(f"Incident {incident_id} is missing from the index")
+        for incident_id in self._by_id.keys() - expected.keys():
+            problems.append(f"Incident {incident_id} is indexed but not in the source")
+        for incident_id in expected.keys() & self._by_id.keys():
+            if self._by_id[incident_id] != expected[incident_id]:
+                problems.append(f"Incident {incident_id} is stale in the index")
+
+        expected_status: Dict[str, List[Tuple[int, str]]] = {}
+        expected_operator: Dict[str, List[Tuple[int, str]]] = {}
+        for incident in self._by_id.values():
+            expected_status.setdefault(incident.status, []).append(id_key(incident))
+            if incident.assigned_operator:
+                expected_operator.setdefault(incident.assigned_operator, []).append(id_key(incident))
+        if {status: sorted(keys) for status, keys in expected_status.items()} != {status: list(bucket) for status, bucket in self._by_status.items()}:
+            problems.append("Status index does not match the indexed incidents")
+        if {operator: sorted(keys) for operator, keys in expected_operator.items()} != {operator: list(bucket) for operator, bucket in self._by_operator.items()}:
+            problems.append("Operator index does not match the indexed incidents")
+        if list(self._by_created_at) != sorted(created_at_key(incident) for incident in self._by_id.values()):
+            problems.append("Created-at index does not match the indexed incidents")
+        open_incidents = [incident for incident in self._by_id.values() if incident.status in OPEN_STATUSES]
+        if list(self._by_priority) != sorted(priority_key(incident) for incident in open_incidents):
+            problems.append("Priority ordering does not match the open incidents")
+        if list(self._resolvable) != sorted(id_key(incident) for incident in open_incidents if incident.status in RESOLVABLE_STATUSES):
+            problems.append("Resolvable ordering does not match the open incidents")
+
+        return sorted(problems)
\ No newline at end of file
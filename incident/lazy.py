@@ -0,0 +1,26 @@
+import sys
+from importlib import import_module
+from typing import Callable, List, Mapping, Tuple
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+
+    # Builds a package's module-level __getattr__ and __dir__ (PEP 562): each exported name
+    # is imported from its submodule on first access and cached in the package namespace,
+    # so importing the package, or one of its submodules, does not pull in the rest of it.
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str):
+
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
\ No newline at end of file
@@ -1,9 +1,17 @@
 import os
+import sys
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 
 
+EPOCH = datetime(1970, 1, 1)
+# Stands for a missing timestamp in fixed-width integer columns and records.
+NO_TIMESTAMP = -(2 ** 63)
+INCIDENT_STATUSES = ("pending", "in_progress", "escalated", "resolved")
+PRIORITY_LEVELS = ("high", "medium", "low")
+
+
 @dataclass(frozen=True, slots=True)
 class Incident:
     id: str
@@ -13,6 +21,13 @@ class Incident:
     created_at: datetime
     assigned_operator: Optional[str]
     status: str
+    # Bumped by every transition; records written before versioning read as 0.
+    version: int = 0
+    # When the incident was first assigned, escalated and resolved; records written before
+    # these were tracked read as None.
+    assigned_at: Optional[datetime] = None
+    escalated_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
 
 
 def incident_to_dict(incident: Incident) -> Dict:
@@ -24,10 +39,65 @@ def incident_to_dict(incident: Incident) -> Dict:
         "description": incident.description,
         "created_at": incident.created_at.isoformat(),
         "assigned_operator": incident.assigned_operator,
-        "status": incident.status
+        "status": incident.status,
+        "version": incident.version,
+        "assigned_at": _optional_isoformat(incident.assigned_at),
+        "escalated_at": _optional_isoformat(incident.escalated_at),
+        "resolved_at": _optional_isoformat(incident.resolved_at)
     }
 
 
+def incident_from_dict(item: Dict) -> Incident:
+
+    # Categorical fields repeat across every record, so share one string object per value.
+    assigned_operator = item["assigned_operator"]
+    return Incident(
+        id=item["id"],
+        incident_type=sys.intern(item["incident_type"]),
+        priority_level=sys.intern(item["priority_level"]),
+        description=item["description"],
+        created_at=datetime.fromisoformat(item["created_at"]),
+        assigned_operator=sys.intern(assigned_operator) if assigned_operator else assigned_operator,
+        status=sys.intern(item["status"]),
+        version=item.get("version", 0),
+        assigned_at=_optional_fromisoformat(item.get("assigned_at")),
+        escalated_at=_optional_fromisoformat(item.get("escalated_at")),
+        resolved_at=_optional_fromisoformat(item.get("resolved_at"))
+    )
+
+
+def _optional_isoformat(value: Optional[datetime]) -> Optional[str]:
+
+    return value.isoformat() if value is not None else None
+
+
+def _optional_fromisoformat(value: Optional[str]) -> Optional[datetime]:
+
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def datetime_to_epoch_microseconds(value: datetime) -> int:
+
+    if value.tzinfo is not None:
+        raise ValueError("Only naive timestamps can be converted to epoch microseconds.")
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def epoch_microseconds_to_datetime(value: int) -> datetime:
+
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def optional_datetime_to_epoch_microseconds(value: Optional[datetime]) -> int:
+
+    return NO_TIMESTAMP if value is None else datetime_to_epoch_microseconds(value)
+
+
+def optional_epoch_microseconds_to_datetime(value: int) -> Optional[datetime]:
+
+    return None if value == NO_TIMESTAMP else epoch_microseconds_to_datetime(value)
+
+
 def clear_console() -> None:
 
     os.system('cls' if os.name == 'nt' else 'clear')
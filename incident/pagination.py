@@ -0,0 +1,59 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+from .models import Incident
+
+
+DEFAULT_PAGE_SIZE = 50
+# Orderings a page can be read in, with the types of the sort key a token for each carries.
+KEY_TYPES = {
+    "id": (int, str),
+}
+
+
+@dataclass
+class Page:
+    incidents: List[Incident]
+    next_token: Optional[str]
+
+
+def encode_resume_token(key: Tuple, ordering: str) -> str:
+
+    # Keyset tokens: the sort key of the last incident shown, so a resumed page starts
+    # right after it even when incidents were added or resolved in between. The ordering
+    # is kept with it, so a token cannot resume a query that sorts by something else.
+    values = [ordering] + [{"t": value.isoformat()} if isinstance(value, datetime) else value for value in key]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def _is_key_value(value, value_type: type) -> bool:
+
+    return isinstance(value, value_type) and not isinstance(value, bool)
+
+
+def decode_resume_token(token: str, ordering: str) -> Tuple:
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        if not isinstance(values, list) or not values or values[0] != ordering:
+            raise ValueError(token)
+        key = tuple(datetime.fromisoformat(value["t"]) if isinstance(value, dict) else value for value in values[1:])
+        value_types = KEY_TYPES[ordering]
+        if len(key) != len(value_types) or not all(map(_is_key_value, key, value_types)):
+            raise ValueError(token)
+        return key
+    except (ValueError, TypeError, KeyError, AttributeError, UnicodeError):
+        raise ValueError(f"Invalid resume token: {token}")
+
+
+def take_page(incidents: Iterable[Incident], page_size: int, key: Callable[[Incident], Tuple], ordering: str) -> Page:
+
+    # Reads one incident past the page to learn whether another page follows.
+    page: List[Incident] = []
+    for incident in incidents:
+        if len(page) == page_size:
+            return Page(page, encode_resume_token(key(page[-1]), ordering))
+        page.append(incident)
+    return Page(page, None)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models import Incident, datetime_to_epoch_microseconds
+from .text_index import compile_search_pattern
+
+
+# row count, then the byte offset of each column: numeric ids, created_at, status codes,
+# operator codes, description offsets (row count + 1 entries) and the UTF-8 description heap
+COLUMNS_HEADER = struct.Struct("<QQQQQQQ")
+
+# Worker-side cache of the mapped column file, reopened only when the engine rebuilds it.
+_attached: Dict[str, Tuple] = {}
+
+
+def _attach(path: str) -> Tuple:
+
+    columns = _attached.get(path)
+    if columns is not None:
+        return columns
+    _detach_all()
+
+    file = open(path, "rb")
+    mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    count, ids_at, created_at, statuses_at, operators_at, offsets_at, heap_at = COLUMNS_HEADER.unpack_from(view, 0)
+    columns = (
+        file, mapping, view,
+        view[ids_at:ids_at + count * 8].cast("q"),
+        view[created_at:created_at + count * 8].cast("q"),
+        view[statuses_at:statuses_at + count],
+        view[operators_at:operators_at + count * 4].cast("i"),
+        view[offsets_at:offsets_at + (count + 1) * 8].cast("q"),
+        view[heap_at:],
+    )
+    _attached[path] = columns
+    return columns
+
+
+def _detach_all() -> None:
+
+    for columns in _attached.values():
+        file, mapping, view = columns[:3]
+        for column in columns[3:]:
+            column.release()
+        view.release()
+        mapping.close()
+        file.close()
+    _attached.clear()
+
+
+def _scan_shard(path: str, row_start: int, row_end: int, predicates: Dict) -> List[int]:
+
+    _, _, _, _, created_at, statuses, operators, offsets, heap = _attach(path)
+    status_codes = predicates.get("status_codes")
+    operator_code = predicates.get("operator_code")
+    start = predicates.get("start")
+    end = predicates.get("end")
+    pattern = predicates.get("pattern")
+    search = compile_search_pattern(pattern).search if pattern is not None else None
+
+    rows = []
+    for row in range(row_start, row_end):
+        if status_codes is not None and statuses[row] not in status_codes:
+            continue
+        if operator_code is not None and operators[row] != operator_code:
+            continue
+        if start is not None and created_at[row] < start:
+            continue
+        if end is not None and created_at[row] > end:
+            continue
+        if search is not None and search(str(heap[offsets[row]:offsets[row + 1]], "utf-8")) is None:
+            continue
+        rows.append(row)
+    return rows
+
+
+class ParallelQueryEngine:
+
+    # Freezes a set of incidents into an mmap'd column file ordered by ID. Queries split the
+    # rows into contiguous ID ranges, scan them in worker processes that map the same file,
+    # and concatenate the matching rows shard by shard, which keeps them in ID order.
+    def __init__(self, incidents: Iterable[Incident], workers: Optional[int] = None, shards_per_worker: int = 4):
+
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.shards_per_worker = shards_per_worker
+        self.incidents: List[Incident] = sorted(
+            incidents, key=lambda incident: (int(incident.id) if incident.id.isdigit() else -1, incident.id)
+        )
+        self.statuses: Dict[str, int] = {}
+        self.operators: Dict[Optional[str], int] = {None: 0}
+        self.path = self._write_columns()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def _write_columns(self) -> str:
+
+        numeric_ids = array("q")
+        created_at = array("q")
+        statuses = bytearray()
+        operators = array("i")
+        offsets = array("q", [0])
+        heap = bytearray()
+        for incident in self.incidents:
+            numeric_ids.append(int(incident.id) if incident.id.isdigit() else -1)
+            created_at.append(datetime_to_epoch_microseconds(incident.created_at))
+            statuses.append(self.statuses.setdefault(incident.status, len(self.statuses)))
+            operators.append(self.operators.setdefault(incident.assigned_operator, len(self.operators)))
+            heap += incident.description.encode("utf-8")
+            offsets.append(len(heap))
+
+        sections = [numeric_ids.tobytes(), created_at.tobytes(), bytes(statuses), operators.tobytes(), offsets.tobytes(), heap]
+        positions = []
+        position = COLUMNS_HEADER.size
+        for section in sections:
+            # Eight-byte alignment keeps every column castable in place.
+            position += -position % 8
+            positions.append(position)
+            position += len(section)
+
+        descriptor, path = tempfile.mkstemp(prefix="incident-columns-")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(COLUMNS_HEADER.pack(len(self.incidents), *positions))
+            for section, position in zip(sections, positions):
+                file.write(b"\0" * (position - file.tell()))
+                file.write(section)
+        return path
+
+    def __enter__(self) -> "ParallelQueryEngine":
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def close(self) -> None:
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.path in _attached:
+            _detach_all()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __len__(self) -> int:
+
+        return len(self.incidents)
+
+    def _shards(self) -> List[Tuple[int, int]]:
+
+        count = len(self.incidents)
+        shard_count = max(1, min(count, self.workers * self.shards_per_worker))
+        bounds = [count * shard // shard_count for shard in range(shard_count + 1)]
+        return [(bounds[shard], bounds[shard + 1]) for shard in range(shard_count) if bounds[shard] < bounds[shard + 1]]
+
+    def _run(self, predicates: Dict) -> List[Incident]:
+
+        shards = self._shards()
+        if self._executor is None:
+            shard_rows = [_scan_shard(self.path, start, end, predicates) for start, end in shards]
+        else:
+            shard_rows = self._executor.map(
+                _scan_shard,
+                [self.path] * len(shards),
+                [start for start, _ in shards],
+                [end for _, end in shards],
+                [predicates] * len(shards)
+            )
+        incidents = self.incidents
+        return [incidents[row] for rows in shard_rows for row in rows]
+
+    def query(self, status: Optional[str] = None, operator_name: Optional[str] = None,
+              start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+              search_pattern: Optional[str] = None) -> List[Incident]:
+
+        if search_pattern is not None:
+            # Compiled here so a bad pattern raises re.error in the caller, not in a worker.
+            compile_search_pattern(search_pattern)
+        if status is not None and status not in self.statuses:
+            return []
+        if operator_name is not None and operator_name not in self.operators:
+            return []
+        return self._run({
+            "status_codes": None if status is None else (self.statuses[status],),
+            "operator_code": None if operator_name is None else self.operators[operator_name],
+            "start": None if start_date is None else datetime_to_epoch_microseconds(start_date),
+            "end": None if end_date is None else datetime_to_epoch_microseconds(end_date),
+            "pattern": search_pattern,
+        })
+
+    def filter_by_text(self, search_pattern: str) -> List[Incident]:
+
+        return self.query(search_pattern=search_pattern)
\ No newline at end of file
@@ -0,0 +1,120 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterator, List, Optional
+
+
+class SortedBlockList:
+
+    # Values live in a list of sorted blocks. Inserting or removing only shifts one block,
+    # and range scans bisect the block maxima and then the first block before slicing.
+    def __init__(self, block_size: int = 512):
+
+        self.block_size = block_size
+        self._blocks: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._length = 0
+
+    def add(self, value: Any) -> None:
+
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            self._length = 1
+            return
+
+        position = bisect_right(self._maxes, value)
+        if position == len(self._maxes):
+            position -= 1
+            block = self._blocks[position]
+            block.append(value)
+            self._maxes[position] = value
+        else:
+            block = self._blocks[position]
+            insort(block, value)
+
+        if len(block) > 2 * self.block_size:
+            tail = block[self.block_size:]
+            del block[self.block_size:]
+            self._blocks.insert(position + 1, tail)
+            self._maxes.insert(position + 1, tail[-1])
+            self._maxes[position] = block[-1]
+        self._length += 1
+
+    def remove(self, value: Any) -> None:
+
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            raise ValueError(f"{value!r} is not in the list")
+        block = self._blocks[position]
+        index = bisect_left(block, value)
+        if index == len(block) or block[index] != value:
+            raise ValueError(f"{value!r} is not in the list")
+
+        del block[index]
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+        self._length -= 1
+
+    def __contains__(self, value: Any) -> bool:
+
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            return False
+        block = self._blocks[position]
+        index = bisect_left(block, value)
+        return index < len(block) and block[index] == value
+
+    def irange(self, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+               include_minimum: bool = True, include_maximum: bool = True) -> Iterator[Any]:
+
+        if minimum is None:
+            position, index = 0, 0
+        else:
+            find_block = bisect_left if include_minimum else bisect_right
+            position = find_block(self._maxes, minimum)
+            if position == len(self._maxes):
+                return
+            index = find_block(self._blocks[position], minimum)
+
+        if maximum is None:
+            stop_position = len(self._blocks)
+        else:
+            find_block = bisect_right if include_maximum else bisect_left
+            stop_position = find_block(self._maxes, maximum)
+            if stop_position < len(self._blocks):
+                stop_index = find_block(self._blocks[stop_position], maximum)
+
+        while position < stop_position:
+            yield from self._blocks[position][index:]
+            position += 1
+            index = 0
+        if maximum is not None and position == stop_position < len(self._blocks):
+            yield from self._blocks[position][index:stop_index]
+
+    def islice(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Any]:
+
+        stop = self._length if stop is None else min(stop, self._length)
+        remaining = stop - start
+        if remaining <= 0:
+            return
+        for block in self._blocks:
+            if start >= len(block):
+                start -= len(block)
+                continue
+            chunk = block[start:start + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            if remaining <= 0:
+                return
+            start = 0
+
+    def __iter__(self) -> Iterator[Any]:
+
+        for block in self._blocks:
+            yield from block
+
+    def __len__(self) -> int:
+
+        return self._length
\ No newline at end of file
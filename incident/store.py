@@ -0,0 +1,64 @@
+from typing import Dict, Iterator, List, Optional
+from .models import Incident
+
+
+INCIDENT_ID_WIDTH = 3
+
+
+def normalize_incident_id(incident_id: str) -> str:
+
+    incident_id = incident_id.strip()
+    if incident_id.isdigit():
+        return str(int(incident_id)).zfill(INCIDENT_ID_WIDTH)
+    return incident_id
+
+
+class IncidentStore:
+
+    # Python dicts keep insertion order and delete in O(1), so the record map doubles as
+    # the positional bookkeeping: replacing a record keeps its slot, removing it drops it.
+    def __init__(self, incidents: Optional[List[Incident]] = None):
+
+        self._records: Dict[str, Incident] = {}
+        for incident in incidents or []:
+            self.add(incident)
+
+    def add(self, incident: Incident) -> None:
+
+        if incident.id in self._records:
+            raise KeyError(f"Incident {incident.id} is already stored")
+        self._records[incident.id] = incident
+
+    def get(self, incident_id: str) -> Optional[Incident]:
+
+        return self._records.get(normalize_incident_id(incident_id))
+
+    def replace(self, incident: Incident) -> Incident:
+
+        previous = self._records[incident.id]
+        self._records[incident.id] = incident
+        return previous
+
+    def remove(self, incident_id: str) -> Incident:
+
+        return self._records.pop(normalize_incident_id(incident_id))
+
+    def values(self) -> List[Incident]:
+
+        return list(self._records.values())
+
+    def __contains__(self, incident_id: str) -> bool:
+
+        return normalize_incident_id(incident_id) in self._records
+
+    def __iter__(self) -> Iterator[Incident]:
+
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+
+        return len(self._records)
+
+    def __bool__(self) -> bool:
+
+        return bool(self._records)
\ No newline at end of file
@@ -0,0 +1,243 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from .indexes import OPEN_STATUSES, PRIORITY_RANKS
+from .models import (
+    INCIDENT_STATUSES,
+    NO_TIMESTAMP,
+    PRIORITY_LEVELS,
+    Incident,
+    datetime_to_epoch_microseconds,
+    epoch_microseconds_to_datetime,
+    optional_datetime_to_epoch_microseconds,
+    optional_epoch_microseconds_to_datetime
+)
+from .store import INCIDENT_ID_WIDTH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+LIFECYCLE_COLUMNS = ("assigned_at", "escalated_at", "resolved_at")
+
+
+def is_columnar_table_available() -> bool:
+
+    return np is not None
+
+
+class CategoryCodes:
+
+    # Maps categorical strings to small integer codes. Code 0 is reserved for None.
+    def __init__(self, values: Iterable[str] = ()):
+
+        self.values: List[Optional[str]] = [None]
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        for value in values:
+            self.code_for(value)
+
+    def code_for(self, value: Optional[str]) -> int:
+
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def lookup(self, value: Optional[str]) -> int:
+
+        return self._codes.get(value, -1)
+
+    def __len__(self) -> int:
+
+        return len(self.values)
+
+
+class IncidentTable:
+
+    def __init__(self, capacity: int = 1024, incident_types: Iterable[str] = ()):
+
+        if np is None:
+            raise ImportError("IncidentTable requires numpy. Install it with 'pip install numpy'.")
+
+        # Incident types come from the rules; any other type seen later gets its own code.
+        self.types = CategoryCodes(incident_types)
+        self.priorities = CategoryCodes(PRIORITY_LEVELS)
+        self.statuses = CategoryCodes(INCIDENT_STATUSES)
+        self.operators = CategoryCodes()
+
+        self._size = 0
+        self._allocate(max(capacity, 16))
+        self._rows_by_id: Dict[str, int] = {}
+        self._irregular_ids: Dict[int, str] = {}
+        self._arena = ""
+        self._arena_pending: List[str] = []
+        self._arena_length = 0
+
+    def _allocate(self, capacity: int) -> None:
+
+        self.numeric_ids = np.zeros(capacity, dtype=np.int64)
+        self.type_codes = np.zeros(capacity, dtype=np.int16)
+        self.priority_codes = np.zeros(capacity, dtype=np.int16)
+        self.status_codes = np.zeros(capacity, dtype=np.int16)
+        self.operator_codes = np.zeros(capacity, dtype=np.int32)
+        self.created_at = np.zeros(capacity, dtype=np.int64)
+        self.description_offsets = np.zeros(capacity, dtype=np.int64)
+        self.description_lengths = np.zeros(capacity, dtype=np.int64)
+        self.versions = np.zeros(capacity, dtype=np.int32)
+        # Lifecycle timestamps; NO_TIMESTAMP until the transition happens.
+        for name in LIFECYCLE_COLUMNS:
+            setattr(self, name, np.full(capacity, NO_TIMESTAMP, dtype=np.int64))
+
+    def _grow(self) -> None:
+
+        capacity = len(self.numeric_ids) * 2
+        for name in ("numeric_ids", "type_codes", "priority_codes", "status_codes", "operator_codes",
+                     "created_at", "description_offsets", "description_lengths", "versions") + LIFECYCLE_COLUMNS:
+            column = getattr(self, name)
+            grown = np.full(capacity, NO_TIMESTAMP if name in LIFECYCLE_COLUMNS else 0, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    @classmethod
+    def from_incidents(cls, incidents: Iterable[Incident], incident_types: Iterable[str] = ()) -> "IncidentTable":
+
+        incidents = list(incidents)
+        table = cls(capacity=len(incidents), incident_types=incident_types)
+        for incident in incidents:
+            table.append(incident)
+        return table
+
+    def _store_description(self, row: int, description: str) -> None:
+
+        self.description_offsets[row] = self._arena_length
+        self.description_lengths[row] = len(description)
+        self._arena_pending.append(description)
+        self._arena_length += len(description)
+
+    def _description_arena(self) -> str:
+
+        if self._arena_pending:
+            self._arena = self._arena + "".join(self._arena_pending)
+            self._arena_pending = []
+        return self._arena
+
+    def _write_row(self, row: int, incident: Incident) -> None:
+
+        numeric_id = int(incident.id) if incident.id.isdigit() else -1
+        if numeric_id < 0 or str(numeric_id).zfill(INCIDENT_ID_WIDTH) != incident.id:
+            self._irregular_ids[row] = incident.id
+        else:
+            self._irregular_ids.pop(row, None)
+        self.numeric_ids[row] = numeric_id
+        self.type_codes[row] = self.types.code_for(incident.incident_type)
+        self.priority_codes[row] = self.priorities.code_for(incident.priority_level)
+        self.status_codes[row] = self.statuses.code_for(incident.status)
+        self.operator_codes[row] = self.operators.code_for(incident.assigned_operator)
+        self.created_at[row] = datetime_to_epoch_microseconds(incident.created_at)
+        self.versions[row] = incident.version
+        self.assigned_at[row] = optional_datetime_to_epoch_microseconds(incident.assigned_at)
+        self.escalated_at[row] = optional_datetime_to_epoch_microseconds(incident.escalated_at)
+        self.resolved_at[row] = optional_datetime_to_epoch_microseconds(incident.resolved_at)
+
+    def append(self, incident: Incident) -> int:
+
+        if incident.id in self._rows_by_id:
+            raise KeyError(f"Incident {incident.id} is already in the table")
+        if self._size == len(self.numeric_ids):
+            self._grow()
+        row = self._size
+        self._write_row(row, incident)
+        self._store_description(row, incident.description)
+        self._rows_by_id[incident.id] = row
+        self._size += 1
+        return row
+
+    def update(self, incident: Incident) -> int:
+
+        row = self._rows_by_id[incident.id]
+        self._write_row(row, incident)
+        if self.description_at(row) != incident.description:
+            self._store_description(row, incident.description)
+        return row
+
+    def row_of(self, incident_id: str) -> Optional[int]:
+
+        return self._rows_by_id.get(incident_id)
+
+    def description_at(self, row: int) -> str:
+
+        start = int(self.description_offsets[row])
+        return self._description_arena()[start:start + int(self.description_lengths[row])]
+
+    def incident_at(self, row: int) -> Incident:
+
+        numeric_id = int(self.numeric_ids[row])
+        return Incident(
+            id=self._irregular_ids.get(row) or str(numeric_id).zfill(INCIDENT_ID_WIDTH),
+            incident_type=self.types.values[self.type_codes[row]],
+            priority_level=self.priorities.values[self.priority_codes[row]],
+            description=self.description_at(row),
+            created_at=epoch_microseconds_to_datetime(self.created_at[row]),
+            assigned_operator=self.operators.values[self.operator_codes[row]],
+            status=self.statuses.values[self.status_codes[row]],
+            version=int(self.versions[row]),
+            assigned_at=optional_epoch_microseconds_to_datetime(self.assigned_at[row]),
+            escalated_at=optional_epoch_microseconds_to_datetime(self.escalated_at[row]),
+            resolved_at=optional_epoch_microseconds_to_datetime(self.resolved_at[row])
+        )
+
+    def to_incidents(self, rows: Optional[Iterable[int]] = None) -> List[Incident]:
+
+        if rows is None:
+            rows = range(self._size)
+        return [self.incident_at(int(row)) for row in rows]
+
+    def __len__(self) -> int:
+
+        return self._size
+
+    def mask_status(self, *statuses: str) -> "np.ndarray":
+
+        codes = [self.statuses.lookup(status) for status in statuses]
+        return np.isin(self.status_codes[:self._size], codes)
+
+    def mask_operator(self, operator_name: Optional[str]) -> "np.ndarray":
+
+        return self.operator_codes[:self._size] == self.operators.lookup(operator_name)
+
+    def mask_created_between(self, start_date: datetime, end_date: datetime) -> "np.ndarray":
+
+        created_at = self.created_at[:self._size]
+        return (created_at >= datetime_to_epoch_microseconds(start_date)) & (created_at <= datetime_to_epoch_microseconds(end_date))
+
+    def rows_matching(self, mask: "np.ndarray", after: Optional[Tuple[int, str]] = None) -> "np.ndarray":
+
+        # In ID order. `after` is an id_key; rows sharing its numeric ID are kept, so callers
+        # still skip those one by one.
+        rows = np.flatnonzero(mask)
+        if after is not None:
+            rows = rows[self.numeric_ids[rows] >= after[0]]
+        return rows[np.argsort(self.numeric_ids[rows], kind="stable")]
+
+    def _counts(self, codes: "np.ndarray", categories: CategoryCodes, mask: Optional["np.ndarray"]) -> Dict[Optional[str], int]:
+
+        selected = codes[:self._size] if mask is None else codes[:self._size][mask]
+        counts = np.bincount(selected, minlength=len(categories))
+        return {categories.values[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def counts_by_status(self, mask: Optional["np.ndarray"] = None) -> Dict[Optional[str], int]:
+
+        return self._counts(self.status_codes, self.statuses, mask)
+
+    def open_rows_by_priority(self) -> "np.ndarray":
+
+        # Same ordering as IncidentCLI.show_pending_incidents_by_priority: escalated first,
+        # then high/medium/low, then oldest first.
+        rows = np.flatnonzero(self.mask_status(*OPEN_STATUSES))
+        priority_ranks = np.array([PRIORITY_RANKS.get(value, 3) for value in self.priorities.values], dtype=np.int16)
+        escalated_rank = (self.status_codes[rows] != self.statuses.lookup("escalated")).astype(np.int8)
+        order = np.lexsort((self.created_at[rows], priority_ranks[self.priority_codes[rows]], escalated_rank))
+        return rows[order]
\ No newline at end of file
@@ -0,0 +1,189 @@
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TRIGRAM_LENGTH = 3
+PATTERN_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=256)
+def incident_id_key(incident_id: str) -> Tuple[int, str]:
+
+    # ID order: numeric IDs by value, anything else first. indexes.id_key applies it to incidents.
+    return (int(incident_id) if incident_id.isdigit() else -1, incident_id)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_search_pattern(search_pattern: str) -> Pattern:
+
+    return re.compile(search_pattern)
+
+
+def description_trigrams(description: str) -> Set[str]:
+
+    return {description[i:i + TRIGRAM_LENGTH] for i in range(len(description) - TRIGRAM_LENGTH + 1)}
+
+
+def extract_required_terms(search_pattern: str) -> Tuple[List[str], List[str]]:
+
+    # Returns (literals, tokens) that every match of the pattern must contain. Literals
+    # are substrings of the description; tokens are whole \w+ words (from \bword\b).
+    # Anything the walker does not understand simply contributes nothing, so the
+    # result is always a safe over-approximation of the matching set.
+    try:
+        parsed = sre_parse.parse(search_pattern)
+    except Exception:
+        return [], []
+
+    flags = getattr(getattr(parsed, "state", None), "flags", None)
+    if flags is None:
+        flags = parsed.pattern.flags
+    if flags & re.IGNORECASE:
+        return [], []
+
+    literals: List[str] = []
+    tokens: List[str] = []
+    _collect_required_terms(list(parsed), not flags & re.ASCII, literals, tokens)
+    return literals, tokens
+
+
+def _collect_required_terms(items: list, unicode_words: bool, literals: List[str], tokens: List[str]) -> None:
+
+    run: List[str] = []
+    run_follows_boundary = False
+    previous_was_boundary = False
+
+    def close_run(followed_by_boundary: bool) -> None:
+        if not run:
+            return
+        literal = "".join(run)
+        literals.append(literal)
+        if unicode_words and run_follows_boundary and followed_by_boundary and TOKEN_PATTERN.fullmatch(literal):
+            tokens.append(literal)
+        run.clear()
+
+    for opcode, argument in items:
+        if opcode is sre_constants.LITERAL:
+            if not run:
+                run_follows_boundary = previous_was_boundary
+            run.append(chr(argument))
+            previous_was_boundary = False
+            continue
+
+        is_boundary = opcode is sre_constants.AT and argument is sre_constants.AT_BOUNDARY
+        close_run(is_boundary)
+        previous_was_boundary = is_boundary
+
+        if opcode is sre_constants.SUBPATTERN:
+            _, added_flags, _, content = argument
+            if not added_flags & re.IGNORECASE:
+                _collect_required_terms(list(content), unicode_words and not added_flags & re.ASCII, literals, tokens)
+        elif opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            minimum, _, content = argument
+            if minimum >= 1:
+                _collect_required_terms(list(content), unicode_words, literals, tokens)
+
+    close_run(False)
+
+
+class DescriptionTextIndex:
+
+    def __init__(self, result_cache_size: int = 64):
+
+        self.result_cache_size = result_cache_size
+        self._descriptions: Dict[str, str] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._results: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        # Postings are built by the first search that can use them, so start-up only keeps
+        # the descriptions; from then on add and remove keep them current.
+        self._indexed = False
+
+    def add(self, incident_id: str, description: str) -> None:
+
+        self._descriptions[incident_id] = description
+        if self._indexed:
+            self._index(incident_id, description)
+        self._results.clear()
+
+    def _index(self, incident_id: str, description: str) -> None:
+
+        for token in set(TOKEN_PATTERN.findall(description)):
+            self._tokens.setdefault(token, set()).add(incident_id)
+        for trigram in description_trigrams(description):
+            self._trigrams.setdefault(trigram, set()).add(incident_id)
+
+    def _build_postings(self) -> None:
+
+        for incident_id, description in self._descriptions.items():
+            self._index(incident_id, description)
+        self._indexed = True
+
+    def remove(self, incident_id: str) -> None:
+
+        description = self._descriptions.pop(incident_id)
+        if self._indexed:
+            for token in set(TOKEN_PATTERN.findall(description)):
+                self._discard(self._tokens, token, incident_id)
+            for trigram in description_trigrams(description):
+                self._discard(self._trigrams, trigram, incident_id)
+        self._results.clear()
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, incident_id: str) -> None:
+
+        posting = postings[key]
+        posting.discard(incident_id)
+        if not posting:
+            del postings[key]
+
+    def candidate_ids(self, search_pattern: str) -> Optional[Set[str]]:
+
+        literals, tokens = extract_required_terms(search_pattern)
+        trigrams = {trigram for literal in literals if len(literal) >= TRIGRAM_LENGTH for trigram in description_trigrams(literal)}
+        if not tokens and not trigrams:
+            return None
+        if not self._indexed:
+            self._build_postings()
+
+        postings: List[Set[str]] = [self._tokens.get(token, set()) for token in tokens]
+        postings.extend(self._trigrams.get(trigram, set()) for trigram in trigrams)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def search(self, search_pattern: str) -> Tuple[str, ...]:
+
+        pattern = compile_search_pattern(search_pattern)
+        cached = self._results.get(search_pattern)
+        if cached is not None:
+            self._results.move_to_end(search_pattern)
+            return cached
+
+        candidates = self.candidate_ids(search_pattern)
+        descriptions = self._descriptions
+        scanned: Iterable[str] = descriptions if candidates is None else candidates
+        matches = tuple(sorted(
+            (incident_id for incident_id in scanned if pattern.search(descriptions[incident_id])),
+            key=incident_id_key
+        ))
+
+        self._results[search_pattern] = matches
+        if len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+        return matches
\ No newline at end of file
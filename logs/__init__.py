@@ -1,2 +1,12 @@
-#Currently, it is a empty module.
-__all__ = []
\ No newline at end of file
+from incident.lazy import lazy_exports
+
+# Names are imported from their submodule on first access.
+_EXPORTS = {
+    'METRICS': '.metrics',
+    'Histogram': '.metrics',
+    'MetricsRegistry': '.metrics',
+    'EventLog': '.events'
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,277 @@
+import json
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from incident.models import Incident
+from .instrumentation import EVENTS_DROPPED
+from .metrics import METRICS
+
+
+DEFAULT_EVENT_DIRECTORY = "incident-events"
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".ndjson"
+DEFAULT_RING_CAPACITY = 65536
+DEFAULT_FLUSH_BATCH = 512
+DEFAULT_FLUSH_INTERVAL = 0.25
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+
+# (sequence, time, action, incident, reason) as queued by the hot path; serialized by the writer.
+PendingEvent = Tuple[int, datetime, str, Incident, Optional[str]]
+
+
+def segment_file_name(number: int) -> str:
+
+    return f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+
+def event_to_dict(event: PendingEvent) -> Dict:
+
+    sequence, at, action, incident, reason = event
+    return {
+        "seq": sequence,
+        "at": at.isoformat(),
+        "action": action,
+        "incident_id": incident.id,
+        "incident_type": incident.incident_type,
+        "priority_level": incident.priority_level,
+        "status": incident.status,
+        "operator": incident.assigned_operator,
+        "reason": reason,
+    }
+
+
+class EventLog:
+
+    # Transitions are appended to a bounded in-memory ring under a short lock; a writer thread
+    # drains it in batches into numbered NDJSON segments that rotate by size. If the writer
+    # falls a full ring behind, the oldest unwritten events are dropped and counted rather
+    # than stalling the caller.
+    def __init__(self, directory: str = DEFAULT_EVENT_DIRECTORY, capacity: int = DEFAULT_RING_CAPACITY,
+                 flush_batch: int = DEFAULT_FLUSH_BATCH, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, max_segments: Optional[int] = None):
+
+        if max_segments is not None and max_segments < 1:
+            raise ValueError(f"Invalid max_segments: {max_segments}. The segment being written is always kept, so use 1 or more.")
+        self.directory = directory
+        # The writer is woken once a batch is waiting, so a batch larger than the ring would never be reached.
+        self.flush_batch = min(flush_batch, capacity)
+        self.flush_interval = flush_interval
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._ring: Deque[PendingEvent] = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self._closing = False
+        self._sequence = self._last_sequence_on_disk()
+        self._written_sequence = self._sequence
+
+        # Every process starts a fresh segment, so segments written before it never change.
+        existing_segments = self.segment_numbers()
+        self._segment_number = existing_segments[-1] + 1 if existing_segments else 1
+        self._segment_file: Optional[TextIO] = None
+        self._segment_size = 0
+        self._unindexed_segments: List[int] = existing_segments
+        self._segments_by_incident: Dict[str, Set[int]] = {}
+        self._index_lock = threading.Lock()
+
+        self._writer = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+        self._writer.start()
+
+    def segment_numbers(self) -> List[int]:
+
+        numbers = []
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith(SEGMENT_PREFIX) and file_name.endswith(SEGMENT_SUFFIX):
+                number = file_name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    numbers.append(int(number))
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> str:
+
+        return os.path.join(self.directory, segment_file_name(number))
+
+    def _last_sequence_on_disk(self) -> int:
+
+        for number in reversed(self.segment_numbers()):
+            last_line = None
+            with open(self._segment_path(number), "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        last_line = line
+            if last_line is not None:
+                try:
+                    return json.loads(last_line)["seq"]
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        return 0
+
+    def record(self, action: str, incident: Incident, reason: Optional[str] = None,
+               at: Optional[datetime] = None) -> None:
+
+        at = at if at is not None else datetime.now()
+        with self._condition:
+            if self._closing:
+                return
+            dropping = len(self._ring) == self._ring.maxlen
+            if dropping:
+                self.dropped += 1
+            self._sequence += 1
+            self._ring.append((self._sequence, at, action, incident, reason))
+            if len(self._ring) >= self.flush_batch:
+                self._condition.notify_all()
+        if dropping:
+            METRICS.increment(EVENTS_DROPPED)
+
+    def _write_loop(self) -> None:
+
+        while True:
+            with self._condition:
+                if not self._ring and not self._closing:
+                    self._condition.wait(self.flush_interval)
+                batch = list(self._ring)
+                self._ring.clear()
+                closing = self._closing
+            if batch:
+                self._write_batch(batch)
+            with self._condition:
+                if batch:
+                    self._written_sequence = batch[-1][0]
+                self._condition.notify_all()
+            if closing and not batch:
+                break
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+
+    def _write_batch(self, batch: List[PendingEvent]) -> None:
+
+        lines = []
+        touched: Dict[str, int] = {}
+        for event in batch:
+            if self._segment_file is None or self._segment_size >= self.segment_bytes:
+                self._write_lines(lines)
+                lines = []
+                self._rotate()
+            line = json.dumps(event_to_dict(event), ensure_ascii=False) + "\n"
+            self._segment_size += len(line)
+            lines.append(line)
+            touched[event[3].id] = self._segment_number
+        self._write_lines(lines)
+        self._segment_file.flush()
+        with self._index_lock:
+            for incident_id, number in touched.items():
+                self._segments_by_incident.setdefault(incident_id, set()).add(number)
+
+    def _write_lines(self, lines: List[str]) -> None:
+
+        if lines:
+            self._segment_file.write("".join(lines))
+
+    def _rotate(self) -> None:
+
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_number += 1
+        self._segment_file = open(self._segment_path(self._segment_number), "a", encoding="utf-8")
+        self._segment_size = self._segment_file.tell()
+        if self.max_segments is not None:
+            for number in self.segment_numbers()[:-self.max_segments]:
+                os.remove(self._segment_path(number))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+
+        # Waits until everything recorded before the call is on disk; False on timeout.
+        with self._condition:
+            target = self._sequence
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: self._written_sequence >= target or not self._writer.is_alive(), timeout
+            ) and self._written_sequence >= target
+
+    def close(self) -> None:
+
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._writer.join()
+        if self.dropped:
+            print(f"Warning: the event log fell behind and dropped {self.dropped} events.", file=sys.stderr)
+
+    def _read_segment(self, number: int) -> Iterator[Dict]:
+
+        try:
+            file = open(self._segment_path(number), "r", encoding="utf-8")
+        except FileNotFoundError:
+            # Removed by retention since it was indexed.
+            return
+        with file:
+            for line in file:
+                # A line without its newline is still being written by the writer thread.
+                if line.endswith("\n") and line.strip():
+                    yield json.loads(line)
+
+    def _index_existing_segments(self) -> None:
+
+        # Segments from earlier runs are indexed on the first timeline query, not at start-up.
+        with self._index_lock:
+            while self._unindexed_segments:
+                number = self._unindexed_segments.pop()
+                for event in self._read_segment(number):
+                    self._segments_by_incident.setdefault(event["incident_id"], set()).add(number)
+
+    def iter_events(self) -> Iterator[Dict]:
+
+        self.flush()
+        for number in self.segment_numbers():
+            yield from self._read_segment(number)
+
+    def timeline(self, incident_id: str) -> List[Dict]:
+
+        self.flush()
+        self._index_existing_segments()
+        with self._index_lock:
+            segments = sorted(self._segments_by_incident.get(incident_id, ()))
+        # A cheap substring test skips most lines of shared segments before parsing.
+        # Escaped the way the writer escapes lines, or non-ASCII IDs would never match.
+        marker = f'"incident_id": {json.dumps(incident_id, ensure_ascii=False)}'
+        events = []
+        for number in segments:
+            try:
+                file = open(self._segment_path(number), "r", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with file:
+                for line in file:
+                    if marker in line and line.endswith("\n"):
+                        event = json.loads(line)
+                        if event["incident_id"] == incident_id:
+                            events.append(event)
+        events.sort(key=lambda event: event["seq"])
+        return events
+
+
+def main() -> None:
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m logs.events DIRECTORY INCIDENT_ID", file=sys.stderr)
+        sys.exit(2)
+    directory, incident_id = sys.argv[1:]
+    if not os.path.isdir(directory):
+        print(f"✖ No event log at {directory}", file=sys.stderr)
+        sys.exit(1)
+    event_log = EventLog(directory)
+    try:
+        for event in event_log.timeline(incident_id):
+            print(json.dumps(event, ensure_ascii=False))
+    finally:
+        event_log.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import importlib
+import io
+import os
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Mapping, Optional, Tuple
+from .metrics import METRICS, MetricsRegistry
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+OPERATION_SECONDS = "incident_operation_seconds"
+OPERATION_ERRORS = "incident_operation_errors_total"
+TRANSITIONS = "incident_transitions_total"
+ESCALATIONS = "incident_escalations_total"
+DISPATCHER_ASSIGNMENTS = "incident_dispatcher_assignments_total"
+EVENTS_DROPPED = "incident_events_dropped_total"
+
+STORAGE_METHODS = ("load_all_incidents", "save_all_incidents", "record_incident_change", "flush")
+
+# (module, class, methods) wrapped by install_instrumentation. Modules are imported only when
+# instrumentation is installed, so optional backends stay optional and cli is never imported
+# by logs at module level.
+INSTRUMENTED_METHODS: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("cli.interface", "IncidentCLI", (
+        "create_incident", "assign_incident", "resolve_incident", "auto_assign_pending_incidents",
+        "run_escalation_process", "query_incidents", "page_incidents",
+        "filter_and_display_incidents_by_status", "filter_and_display_incidents_by_operator",
+        "filter_and_display_incidents_by_date_range", "filter_and_display_incidents_by_text",
+        "display_history", "show_pending_incidents_by_priority", "save_all_incidents", "_record_transition",
+        "_read_storage",
+    )),
+    ("persistence.storage", "IncidentStorageHandler", STORAGE_METHODS),
+    ("persistence.journal", "JournaledIncidentStorageHandler", STORAGE_METHODS),
+    ("persistence.snapshot", "SnapshotIncidentStorageHandler", STORAGE_METHODS),
+    ("persistence.sqlite_storage", "SQLiteIncidentStorageHandler", STORAGE_METHODS + ("query_incidents",)),
+    ("persistence.tiered", "TieredIncidentStorageHandler", STORAGE_METHODS + ("query_incidents",)),
+    ("core.escalator", "IncidentEscalator", ("escalate_if_needed",)),
+    ("core.dispatcher", "IncidentDispatcher", ("select_operator", "assign_incident_to_operator", "assign_many")),
+)
+
+_originals: Dict[Tuple[type, str], Callable] = {}
+
+
+def _count_transition(registry: MetricsRegistry, args: tuple, result) -> None:
+
+    registry.increment(TRANSITIONS, action=args[1])
+
+
+def _count_escalations(registry: MetricsRegistry, args: tuple, result) -> None:
+
+    registry.increment(ESCALATIONS, result)
+
+
+def _count_assignment(registry: MetricsRegistry, args: tuple, result) -> None:
+
+    registry.increment(DISPATCHER_ASSIGNMENTS, outcome="assigned" if result is not None else "rejected")
+
+
+def _count_assignments(registry: MetricsRegistry, args: tuple, result) -> None:
+
+    registry.increment(DISPATCHER_ASSIGNMENTS, len(result), outcome="assigned")
+
+
+# Counters derived from a call's arguments or result, on top of its latency histogram.
+RESULT_COUNTERS: Dict[Tuple[str, str], Callable] = {
+    ("IncidentCLI", "_record_transition"): _count_transition,
+    ("IncidentCLI", "run_escalation_process"): _count_escalations,
+    ("IncidentDispatcher", "assign_incident_to_operator"): _count_assignment,
+    ("IncidentDispatcher", "assign_many"): _count_assignments,
+}
+
+
+def _instrument(function: Callable, registry: MetricsRegistry, component: str, operation: str,
+                count_result: Optional[Callable]) -> Callable:
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not registry.enabled:
+            return function(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            registry.increment(OPERATION_ERRORS, component=component, operation=operation)
+            raise
+        finally:
+            registry.observe(OPERATION_SECONDS, time.perf_counter() - started, component=component, operation=operation)
+        if count_result is not None:
+            count_result(registry, args, result)
+        return result
+    return wrapper
+
+
+def _describe(registry: MetricsRegistry) -> None:
+
+    registry.describe(OPERATION_SECONDS, "Latency of instrumented operations in seconds.")
+    registry.describe(OPERATION_ERRORS, "Instrumented operations that raised.")
+    registry.describe(TRANSITIONS, "Incident lifecycle transitions by action.")
+    registry.describe(ESCALATIONS, "Incidents escalated by escalation ticks.")
+    registry.describe(DISPATCHER_ASSIGNMENTS, "Dispatcher assignment attempts by outcome.")
+    registry.describe(EVENTS_DROPPED, "Events the event log dropped because its writer fell a full ring behind.")
+
+
+def install_instrumentation(registry: MetricsRegistry = METRICS) -> None:
+
+    # Wraps methods on the classes themselves, so existing call sites and signatures are untouched.
+    _describe(registry)
+    for module_name, class_name, methods in INSTRUMENTED_METHODS:
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except ImportError:
+            continue
+        for method in methods:
+            function = cls.__dict__.get(method)
+            if function is None or (cls, method) in _originals:
+                continue
+            _originals[(cls, method)] = function
+            setattr(cls, method, _instrument(function, registry, class_name, method,
+                                             RESULT_COUNTERS.get((class_name, method))))
+    registry.enabled = True
+
+
+def uninstall_instrumentation(registry: MetricsRegistry = METRICS) -> None:
+
+    registry.enabled = False
+    for (cls, method), function in _originals.items():
+        setattr(cls, method, function)
+    _originals.clear()
+
+
+def enable_metrics_from_environment(environ: Mapping[str, str] = os.environ,
+                                    registry: MetricsRegistry = METRICS) -> Optional[str]:
+
+    # INCIDENT_METRICS=1 collects in memory, INCIDENT_METRICS_PORT serves /metrics and
+    # INCIDENT_METRICS_FILE names the file the caller writes on exit, which is returned.
+    metrics_file = environ.get("INCIDENT_METRICS_FILE") or None
+    metrics_port = environ.get("INCIDENT_METRICS_PORT")
+    if environ.get("INCIDENT_METRICS", "0") != "1" and not metrics_file and not metrics_port:
+        return None
+    install_instrumentation(registry)
+    if metrics_port:
+        registry.serve_prometheus(int(metrics_port), environ.get("INCIDENT_METRICS_HOST", "127.0.0.1"))
+    return metrics_file
+
+
+@contextmanager
+def capture_profile(output_path: Optional[str] = None, sort: str = "cumulative", limit: int = 25,
+                    trace_memory: bool = False) -> Iterator["cProfile.Profile"]:
+
+    # Profiles one command. The report goes to output_path, or stderr when none is given.
+    import cProfile
+    import pstats
+    import tracemalloc
+    profiler = cProfile.Profile()
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            report.write(f"Memory: current {current / 1e6:.1f} MB | peak {peak / 1e6:.1f} MB\n")
+            for statistic in tracemalloc.take_snapshot().statistics("lineno")[:limit]:
+                report.write(f"{statistic}\n")
+            if tracing:
+                tracemalloc.stop()
+        if output_path is None:
+            sys.stderr.write(report.getvalue())
+        else:
+            with open(output_path, "w", encoding="utf-8") as file:
+                file.write(report.getvalue())
\ No newline at end of file
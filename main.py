@@ -1,5 +1,18 @@
+import argparse
+import os
+import sys
+from typing import Optional
 from cli.interface import IncidentCLI
+from cli.batch import DEFAULT_BATCH_SIZE, run_batch
+from persistence.factory import create_storage_handler
 from incident.models import clear_console, validate_input, validate_integer_input
+from logs import METRICS
+from logs.events import EventLog
+from rules.engine import DEFAULT_RULES_FILE, RulesEngine
+from logs.instrumentation import enable_metrics_from_environment
+
+
+PAGE_SIZE = 50
 
 
 def display_main_menu() -> None:
@@ -10,14 +23,16 @@ def display_main_menu() -> None:
     "4. Resolve incident")
     "5. Filter incidents")
     "6. Display history")
-    "7. Exit""")
+    "7. Show analytics")
+    "8. Exit""")
 
 
 def handle_create_incident(cli: IncidentCLI) -> None:
     print("\n=== Create New Incident ===")
+    incident_types = cli.rules.compiled.incident_types
     incident_type = validate_input(
-        "Incident type (infrastructure/application/security): ",
-        ["infrastructure", "application", "security"]
+        f"Incident type ({'/'.join(incident_types)}): ",
+        list(incident_types)
     )
     priority_level = validate_input(
         "Priority level (low/medium/high): ",
@@ -30,23 +45,33 @@ def handle_create_incident(cli: IncidentCLI) -> None:
         print("✖ Description cannot be empty.")
 
 
+def print_operator_capabilities(cli: IncidentCLI) -> None:
+
+    rules = cli.rules.compiled
+    for operator_name in rules.operators:
+        print(f"    - {operator_name}: {', '.join(sorted(rules.types_by_operator[operator_name]))} specialist")
+
+
+def prompt_operator_name(cli: IncidentCLI) -> str:
+
+    operators = cli.rules.compiled.operators
+    return validate_input(f"Operator name ({'/'.join(operators)}): ", list(operators))
+
+
 def handle_assign_incident(cli: IncidentCLI) -> None:
 
     print("\n=== Assign Incident to Operator ===")
     print("=== Pending Incidents to Assign ===")
     cli.show_assignable_incidents()
     
-    print("""\n=== Operator Capabilities ===
-    - alice: infrastructure specialist
-    - bob: application specialist
-    - carol: security specialist""")
+    print("\n=== Operator Capabilities ===")
+    print_operator_capabilities(cli)
     
-    incident_id = input("\nIncident ID: ").strip()
-    if incident_id:
-        operator_name = validate_input(
-            "Operator name (alice/bob/carol): ",
-            ["alice", "bob", "carol"]
-        )
+    incident_id = input("\nIncident ID (or 'all' to auto-assign every pending incident): ").strip()
+    if incident_id.lower() == "all":
+        cli.auto_assign_pending_incidents()
+    elif incident_id:
+        operator_name = prompt_operator_name(cli)
         cli.assign_incident_to_operator_by_id(incident_id, operator_name)
     else:
         print("✖ Incident ID cannot be empty.")
@@ -81,26 +106,77 @@ def handle_filter_incidents(cli: IncidentCLI) -> None:
             "Status (pending/in_progress/escalated/resolved): ",
             ["pending", "in_progress", "escalated", "resolved"]
         )
-        cli.filter_and_display_incidents_by_status(status)
+        cli.filter_and_display_incidents_by_status(status, PAGE_SIZE)
     elif filter_choice == "2":
-        operator = validate_input(
-            "Operator name (alice/bob/carol): ",
-            ["alice", "bob", "carol"]
-        )
-        cli.filter_and_display_incidents_by_operator(operator)
+        operator = prompt_operator_name(cli)
+        cli.filter_and_display_incidents_by_operator(operator, PAGE_SIZE)
     elif filter_choice == "3":
-        cli.filter_and_display_incidents_by_date_range()
+        cli.filter_and_display_incidents_by_date_range(PAGE_SIZE)
     elif filter_choice == "4":
         search_text = input("Search pattern (regex): ").strip()
         if search_text:
-            cli.filter_and_display_incidents_by_text(search_text)
+            cli.filter_and_display_incidents_by_text(search_text, PAGE_SIZE)
         else:
             print("✖ Search pattern cannot be empty.")
 
 
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Incident Management System")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="Apply NDJSON create/assign/resolve/query commands from FILE (or stdin) without prompts.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Commands applied between escalation runs and saves in batch mode.")
+    return parser.parse_args()
+
+
+def write_metrics(metrics_file: Optional[str]) -> None:
+
+    if metrics_file:
+        METRICS.write_prometheus_file(metrics_file)
+
+
+def run_batch_mode(cli: IncidentCLI, source_path: str, batch_size: int, metrics_file: Optional[str] = None,
+                   compact_journal: bool = False) -> None:
+
+    try:
+        if source_path == "-":
+            summary = run_batch(cli, sys.stdin, batch_size)
+        else:
+            with open(source_path, "r", encoding="utf-8") as source:
+                summary = run_batch(cli, source, batch_size)
+    finally:
+        if compact_journal:
+            # Folds the run into incidents.json, which is all the default json backend reads.
+            cli.storage.compact(wait=True)
+        cli.close()
+        write_metrics(metrics_file)
+    print(summary.report(), file=sys.stderr)
+
+
 def main() -> None:
 
-    cli = IncidentCLI()
+    args = parse_arguments()
+    # Installed before the CLI is built so that the initial load is timed too.
+    metrics_file = enable_metrics_from_environment()
+    # Batch feeds default to the journal: the json backend rewrites the whole file after
+    # every batch, which holds ingest to about a thousand commands a second.
+    default_backend = "journal" if args.batch is not None else "json"
+    storage_backend = os.environ.get("INCIDENT_STORAGE_BACKEND", default_backend)
+    use_columnar_table = os.environ.get("INCIDENT_COLUMNAR_TABLE", "0") == "1"
+    parallel_workers = os.environ.get("INCIDENT_PARALLEL_WORKERS")
+    fast_start = os.environ.get("INCIDENT_FAST_START", "0") == "1"
+    event_directory = os.environ.get("INCIDENT_EVENT_LOG")
+    rules = RulesEngine(os.environ.get("INCIDENT_RULES_FILE", DEFAULT_RULES_FILE))
+    cli = IncidentCLI(create_storage_handler(storage_backend), use_columnar_table=use_columnar_table,
+                      parallel_workers=int(parallel_workers) if parallel_workers else None,
+                      event_log=EventLog(event_directory) if event_directory else None, rules=rules,
+                      fast_start=fast_start)
+
+    if args.batch is not None:
+        run_batch_mode(cli, args.batch, args.batch_size, metrics_file,
+                       compact_journal="INCIDENT_STORAGE_BACKEND" not in os.environ)
+        return
     
     print("Welcome to the Incident Management System!")
     print("Loading existing incidents...")
@@ -110,7 +186,7 @@ def main() -> None:
             cli.run_escalation_process()
             
             display_main_menu()
-            choice = validate_integer_input("Select an option (1-7): ")
+            choice = validate_integer_input("Select an option (1-8): ")
             
             if choice == 1:
                 handle_create_incident(cli)
@@ -125,15 +201,20 @@ def main() -> None:
                 handle_filter_incidents(cli)
             elif choice == 6:
                 print("\n=== Incident History ===")
-                cli.display_history()
+                cli.display_history(PAGE_SIZE)
             elif choice == 7:
+                print("\n=== Analytics ===")
+                cli.show_analytics_dashboard()
+            elif choice == 8:
                 print("\n=== Saving and Exiting ===")
                 cli.save_all_incidents()
+                cli.close()
+                write_metrics(metrics_file)
                 print("✔ All incidents saved successfully.")
                 print("System terminated")
                 break
             else:
-                print("Invalid option. Please choose 1-7.")
+                print("Invalid option. Please choose 1-8.")
                 
             input("\nPress Enter to continue...")
             clear_console()
@@ -141,6 +222,8 @@ def main() -> None:
         except KeyboardInterrupt:
             print("\n\n=== Emergency Exit ===")
             cli.save_all_incidents()
+            cli.close()
+            write_metrics(metrics_file)
             print("✔ All incidents saved successfully.")
             print("System terminated")
             break
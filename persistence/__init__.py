@@ -1,5 +1,15 @@
-from .storage import IncidentStorageHandler
+from incident.lazy import lazy_exports
 
-__all__ = [
-    'IncidentStorageHandler'
-]
\ No newline at end of file
+# Names are imported from their submodule on first access.
+_EXPORTS = {
+    'IncidentStorageHandler': '.storage',
+    'JournaledIncidentStorageHandler': '.journal',
+    'create_storage_handler': '.factory',
+    'STORAGE_BACKENDS': '.factory',
+    'StartupManifest': '.manifest',
+    'read_manifest': '.manifest',
+    'write_manifest': '.manifest'
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+from typing import Union
+from .storage import IncidentStorageHandler
+from .journal import JournaledIncidentStorageHandler
+
+
+STORAGE_BACKENDS = ("json", "journal", "snapshot", "sqlite", "tiered")
+
+
+def create_storage_handler(backend: str = "json", file_path: str = "incidents.json") -> Union[IncidentStorageHandler, JournaledIncidentStorageHandler]:
+
+    if backend == "json":
+        return IncidentStorageHandler(file_path)
+    if backend == "journal":
+        return JournaledIncidentStorageHandler(file_path)
+    if backend == "snapshot":
+        # Imported here so `python -m persistence.snapshot` does not find itself preloaded.
+        from .snapshot import SnapshotIncidentStorageHandler
+        return SnapshotIncidentStorageHandler(os.path.splitext(file_path)[0] + ".snap")
+    if backend == "sqlite":
+        from .sqlite_storage import SQLiteIncidentStorageHandler, default_database_path, migrate_json_to_sqlite
+        database_path = default_database_path(file_path)
+        # One-shot migration: the first sqlite start copies the existing JSON archive.
+        if not os.path.exists(database_path) and os.path.exists(file_path):
+            migrate_json_to_sqlite(file_path, database_path)
+        return SQLiteIncidentStorageHandler(database_path)
+    if backend == "tiered":
+        from .tiered import TieredIncidentStorageHandler, default_archive_directory, migrate_json_to_tiered
+        directory = default_archive_directory(file_path)
+        if not os.path.exists(directory) and os.path.exists(file_path):
+            migrate_json_to_tiered(file_path, directory)
+        return TieredIncidentStorageHandler(directory)
+    raise ValueError(f"Unknown storage backend: {backend}. Valid options are: {list(STORAGE_BACKENDS)}")
\ No newline at end of file
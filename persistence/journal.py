@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Pattern
+from incident.models import Incident, incident_to_dict, incident_from_dict
+from .manifest import file_fingerprint
+from .storage import IncidentStorageHandler
+
+
+JOURNAL_ACTIONS = ("create", "assign", "escalate", "resolve")
+
+
+class JournaledIncidentStorageHandler:
+
+    journaled = True
+    supports_queries = False
+
+    def __init__(self, file_path: str, sync_every: int = 64, compact_every: int = 50000):
+
+        self.file_path = file_path
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self.snapshot = IncidentStorageHandler(file_path)
+        self._lock = threading.Lock()
+        self._segment_file = None
+        self._segment_sequence = self._last_segment_sequence()
+        self._unsynced_records = 0
+        self._records_since_compaction = 0
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    def _segment_pattern(self) -> Pattern:
+
+        return re.compile(re.escape(os.path.basename(self.file_path)) + r"\.journal\.(\d+)$")
+
+    def _segment_path(self, sequence: int) -> str:
+
+        return f"{self.file_path}.journal.{sequence:06d}"
+
+    def _list_segments(self) -> List[int]:
+
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        pattern = self._segment_pattern()
+        sequences = []
+        for name in os.listdir(directory):
+            match = pattern.match(name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return sorted(sequences)
+
+    def _last_segment_sequence(self) -> int:
+
+        sequences = self._list_segments()
+        return sequences[-1] if sequences else 0
+
+    def _replay(self, upto_sequence: Optional[int] = None) -> Dict[str, Incident]:
+
+        # Records carry the full incident state after each transition, so replaying a
+        # segment that a finished compaction already folded into the snapshot is harmless.
+        state = {incident.id: incident for incident in self.snapshot.load_all_incidents_from_json()}
+        for sequence in self._list_segments():
+            if upto_sequence is not None and sequence > upto_sequence:
+                break
+            with open(self._segment_path(sequence), "r", encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn write at the tail of the last segment is dropped.
+                        break
+                    incident = incident_from_dict(record["incident"])
+                    state[incident.id] = incident
+        return state
+
+    def _wait_for_compaction(self) -> None:
+
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+
+    def load_all_incidents(self) -> List[Incident]:
+
+        self._wait_for_compaction()
+        with self._lock:
+            return list(self._replay().values())
+
+    def iter_all_incidents(self) -> Iterator[Incident]:
+
+        return iter(self.load_all_incidents())
+
+    def save_all_incidents(self, incident_list: List[Incident]) -> None:
+
+        self._wait_for_compaction()
+        with self._lock:
+            sealed_sequence = self._rotate_segment()
+            self.snapshot.save_all_incidents_to_json(incident_list)
+            self._remove_segments(sealed_sequence)
+            self._records_since_compaction = 0
+
+    def record_incident_change(self, action: str, incident: Incident) -> None:
+
+        if action not in JOURNAL_ACTIONS:
+            raise ValueError(f"Unknown journal action: {action}")
+
+        line = json.dumps({"action": action, "incident": incident_to_dict(incident)}) + "\n"
+        with self._lock:
+            if self._segment_file is None:
+                self._segment_sequence += 1
+                self._segment_file = open(self._segment_path(self._segment_sequence), "a", encoding="utf-8")
+            self._segment_file.write(line)
+            self._unsynced_records += 1
+            self._records_since_compaction += 1
+            if self._unsynced_records >= self.sync_every:
+                self._sync_segment()
+
+        if self._records_since_compaction >= self.compact_every:
+            self.compact()
+
+    def _sync_segment(self) -> None:
+
+        if self._segment_file is not None and self._unsynced_records:
+            self._segment_file.flush()
+            os.fsync(self._segment_file.fileno())
+        self._unsynced_records = 0
+
+    def _rotate_segment(self) -> int:
+
+        self._sync_segment()
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+        return self._segment_sequence
+
+    def _remove_segments(self, upto_sequence: int) -> None:
+
+        for sequence in self._list_segments():
+            if sequence <= upto_sequence:
+                os.remove(self._segment_path(sequence))
+
+    def compact(self, wait: bool = False) -> None:
+
+        # A waiting caller lets a running compaction finish first, so the one it starts covers every segment.
+        if wait:
+            self._wait_for_compaction()
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            sealed_sequence = self._rotate_segment()
+            self._records_since_compaction = 0
+            self._compaction_thread = threading.Thread(
+                target=self._compact_sealed_segments,
+                args=(sealed_sequence,),
+                name="incident-journal-compaction",
+                daemon=True
+            )
+            self._compaction_thread.start()
+
+        if wait:
+            self._compaction_thread.join()
+
+    def _compact_sealed_segments(self, sealed_sequence: int) -> None:
+
+        state = self._replay(upto_sequence=sealed_sequence)
+        temporary_path = self.file_path + ".compacting"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump([incident_to_dict(incident) for incident in state.values()], file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.file_path)
+        self._remove_segments(sealed_sequence)
+
+    def fingerprint(self) -> List:
+
+        # The snapshot plus every journal segment, so an appended record changes it too.
+        with self._lock:
+            self._sync_segment()
+            segments = [[sequence, file_fingerprint(self._segment_path(sequence))] for sequence in self._list_segments()]
+        return [self.snapshot.fingerprint(), segments]
+
+    def flush(self) -> None:
+
+        with self._lock:
+            self._sync_segment()
+
+    def close(self) -> None:
+
+        with self._lock:
+            self._rotate_segment()
+        self._wait_for_compaction()
\ No newline at end of file
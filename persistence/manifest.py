@@ -0,0 +1,66 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+from incident.models import Incident, incident_to_dict, incident_from_dict
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+@dataclass
+class StartupManifest:
+
+    next_incident_id: int
+    open_incidents: List[Incident]
+
+
+def manifest_path(file_path: str) -> str:
+
+    return os.path.splitext(file_path)[0] + MANIFEST_SUFFIX
+
+
+def file_fingerprint(file_path: str) -> Optional[List[int]]:
+
+    # Size, modification time and inode; None while the file does not exist. Writers replace
+    # files by renaming, which always changes the inode.
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def write_manifest(file_path: str, next_incident_id: int, open_incidents: Iterable[Incident], fingerprint) -> None:
+
+    # The fingerprint is the storage's own description of the archive this header was taken
+    # from; any later write to the archive changes it and retires the manifest.
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump({
+            "version": MANIFEST_VERSION,
+            "next_incident_id": next_incident_id,
+            "fingerprint": fingerprint,
+            "open_incidents": [incident_to_dict(incident) for incident in open_incidents],
+        }, file)
+    os.replace(temporary_path, file_path)
+
+
+def read_manifest(file_path: str, fingerprint) -> Optional[StartupManifest]:
+
+    # A missing, damaged or stale manifest is not an error: the caller loads the archive instead.
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or data.get("fingerprint") != fingerprint:
+        return None
+    try:
+        return StartupManifest(
+            int(data["next_incident_id"]),
+            [incident_from_dict(item) for item in data["open_incidents"]]
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
\ No newline at end of file
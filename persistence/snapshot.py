@@ -0,0 +1,351 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional
+from incident.models import (
+    NO_TIMESTAMP,
+    Incident,
+    datetime_to_epoch_microseconds,
+    epoch_microseconds_to_datetime,
+    optional_datetime_to_epoch_microseconds,
+    optional_epoch_microseconds_to_datetime
+)
+from .manifest import file_fingerprint
+from .storage import IncidentStorageHandler
+from .streaming import OPEN_STATUSES
+
+
+SNAPSHOT_MAGIC = b"IMSNAP01"
+SNAPSHOT_VERSION = 4
+
+# magic, version, record count, then the section offset table:
+# vocabulary (offset, length), records offset, id index offset, string heap (offset, length)
+HEADER = struct.Struct("<8sIQQQQQQQ")
+# numeric id, created_at (epoch microseconds), description (offset, length), id text (offset, length),
+# operator code, type code, priority code, status code, incident version,
+# assigned_at, escalated_at, resolved_at (epoch microseconds or NO_TIMESTAMP)
+RECORD = struct.Struct("<qqQIQIIIIIIqqq")
+# Older records are padded: version 1 predates incident versions (read as version 0) and
+# neither version 1 nor 2 has lifecycle timestamps. Versions 1 to 3 kept the operator code
+# in two bytes and the other codes in one, which rules files with more values outgrow.
+RECORD_FORMATS = {
+    1: struct.Struct("<qqQIQIHBBBx"),
+    2: struct.Struct("<qqQIQIHBBBxI"),
+    3: struct.Struct("<qqQIQIHBBBxIqqq"),
+    4: RECORD,
+}
+RECORD_PADDING = {1: (0, NO_TIMESTAMP, NO_TIMESTAMP, NO_TIMESTAMP), 2: (NO_TIMESTAMP, NO_TIMESTAMP, NO_TIMESTAMP), 3: (), 4: ()}
+# numeric id, row
+ID_INDEX_ENTRY = struct.Struct("<qI")
+
+
+class _Vocabulary:
+
+    def __init__(self, values: Optional[List[Optional[str]]] = None):
+
+        self.values: List[Optional[str]] = values if values is not None else []
+        self._codes: Dict[Optional[str], int] = {value: code for code, value in enumerate(self.values)}
+
+    def code_for(self, value: Optional[str]) -> int:
+
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+
+def write_snapshot(file_path: str, incidents: Iterable[Incident]) -> int:
+
+    types, priorities, statuses = _Vocabulary(), _Vocabulary(), _Vocabulary()
+    operators = _Vocabulary([None])
+    records = bytearray()
+    heap = bytearray()
+    id_index = []
+
+    count = 0
+    for incident in incidents:
+        description = incident.description.encode("utf-8")
+        incident_id = incident.id.encode("utf-8")
+        numeric_id = int(incident.id) if incident.id.isdigit() else -1
+        description_offset = len(heap)
+        heap += description
+        id_offset = len(heap)
+        heap += incident_id
+        records += RECORD.pack(
+            numeric_id,
+            datetime_to_epoch_microseconds(incident.created_at),
+            description_offset, len(description),
+            id_offset, len(incident_id),
+            operators.code_for(incident.assigned_operator),
+            types.code_for(incident.incident_type),
+            priorities.code_for(incident.priority_level),
+            statuses.code_for(incident.status),
+            incident.version,
+            optional_datetime_to_epoch_microseconds(incident.assigned_at),
+            optional_datetime_to_epoch_microseconds(incident.escalated_at),
+            optional_datetime_to_epoch_microseconds(incident.resolved_at)
+        )
+        id_index.append((numeric_id, count))
+        count += 1
+
+    vocabulary = json.dumps({
+        "types": types.values,
+        "priorities": priorities.values,
+        "statuses": statuses.values,
+        "operators": operators.values,
+    }).encode("utf-8")
+    id_index.sort()
+    index_bytes = b"".join(ID_INDEX_ENTRY.pack(numeric_id, row) for numeric_id, row in id_index)
+
+    vocabulary_offset = HEADER.size
+    records_offset = vocabulary_offset + len(vocabulary)
+    index_offset = records_offset + len(records)
+    heap_offset = index_offset + len(index_bytes)
+    header = HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, count,
+        vocabulary_offset, len(vocabulary),
+        records_offset, index_offset,
+        heap_offset, len(heap)
+    )
+
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        for section in (header, vocabulary, records, index_bytes, heap):
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, file_path)
+    return count
+
+
+class SnapshotReader:
+
+    # Maps the snapshot and decodes a record only when it is touched. Field accessors
+    # return memoryview slices of the mapping, so nothing is copied until decoded;
+    # release those views before closing the reader.
+    def __init__(self, file_path: str):
+
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, self._count, vocabulary_offset, vocabulary_length,
+         self._records_offset, self._index_offset, self._heap_offset, _) = HEADER.unpack_from(self._view, 0)
+        if magic != SNAPSHOT_MAGIC or version not in RECORD_FORMATS:
+            self.close()
+            raise ValueError(f"{file_path} is not an incident snapshot (version {SNAPSHOT_VERSION}).")
+        self._record_format = RECORD_FORMATS[version]
+        self._padded_record = RECORD_PADDING[version]
+
+        vocabulary = json.loads(bytes(self._view[vocabulary_offset:vocabulary_offset + vocabulary_length]))
+        self._types = vocabulary["types"]
+        self._priorities = vocabulary["priorities"]
+        self._statuses = vocabulary["statuses"]
+        self._operators = vocabulary["operators"]
+
+    def __enter__(self) -> "SnapshotReader":
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def close(self) -> None:
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._mmap.close()
+            self._file.close()
+
+    def __len__(self) -> int:
+
+        return self._count
+
+    def _record(self, row: int) -> tuple:
+
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return self._record_format.unpack_from(self._view, self._records_offset + row * self._record_format.size) + self._padded_record
+
+    def _heap_view(self, offset: int, length: int) -> memoryview:
+
+        start = self._heap_offset + offset
+        return self._view[start:start + length]
+
+    def description_view(self, row: int) -> memoryview:
+
+        _, _, description_offset, description_length, _, _, _, _, _, _, _, _, _, _ = self._record(row)
+        return self._heap_view(description_offset, description_length)
+
+    def id_view(self, row: int) -> memoryview:
+
+        _, _, _, _, id_offset, id_length, _, _, _, _, _, _, _, _ = self._record(row)
+        return self._heap_view(id_offset, id_length)
+
+    def status_at(self, row: int) -> str:
+
+        return self._statuses[self._record(row)[9]]
+
+    def max_numeric_id(self) -> Optional[int]:
+
+        # The ID index is sorted, so its last entry holds the highest numeric ID.
+        if not self._count:
+            return None
+        numeric_id = ID_INDEX_ENTRY.unpack_from(self._view, self._index_offset + (self._count - 1) * ID_INDEX_ENTRY.size)[0]
+        return numeric_id if numeric_id >= 0 else None
+
+    def incident_at(self, row: int) -> Incident:
+
+        (_, created_at, description_offset, description_length, id_offset, id_length,
+         operator_code, type_code, priority_code, status_code, version,
+         assigned_at, escalated_at, resolved_at) = self._record(row)
+        return Incident(
+            id=str(self._heap_view(id_offset, id_length), "utf-8"),
+            incident_type=self._types[type_code],
+            priority_level=self._priorities[priority_code],
+            description=str(self._heap_view(description_offset, description_length), "utf-8"),
+            created_at=epoch_microseconds_to_datetime(created_at),
+            assigned_operator=self._operators[operator_code],
+            status=self._statuses[status_code],
+            version=version,
+            assigned_at=optional_epoch_microseconds_to_datetime(assigned_at),
+            escalated_at=optional_epoch_microseconds_to_datetime(escalated_at),
+            resolved_at=optional_epoch_microseconds_to_datetime(resolved_at)
+        )
+
+    def row_of(self, incident_id: str) -> Optional[int]:
+
+        if not incident_id.isdigit():
+            for row in range(self._count):
+                if self.id_view(row) == incident_id.encode("utf-8"):
+                    return row
+            return None
+
+        numeric_id = int(incident_id)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if ID_INDEX_ENTRY.unpack_from(self._view, self._index_offset + middle * ID_INDEX_ENTRY.size)[0] < numeric_id:
+                low = middle + 1
+            else:
+                high = middle
+        while low < self._count:
+            entry_id, row = ID_INDEX_ENTRY.unpack_from(self._view, self._index_offset + low * ID_INDEX_ENTRY.size)
+            if entry_id != numeric_id:
+                return None
+            if self.id_view(row) == incident_id.encode("utf-8"):
+                return row
+            low += 1
+        return None
+
+    def get(self, incident_id: str) -> Optional[Incident]:
+
+        row = self.row_of(incident_id)
+        return None if row is None else self.incident_at(row)
+
+    def __iter__(self) -> Iterator[Incident]:
+
+        for row in range(self._count):
+            yield self.incident_at(row)
+
+
+class SnapshotIncidentStorageHandler:
+
+    journaled = False
+    supports_queries = False
+
+    def __init__(self, file_path: str):
+
+        self.file_path = file_path
+
+    def load_all_incidents(self) -> List[Incident]:
+
+        return list(self.iter_all_incidents())
+
+    def iter_all_incidents(self) -> Iterator[Incident]:
+
+        if not os.path.exists(self.file_path):
+            return
+        with SnapshotReader(self.file_path) as reader:
+            yield from reader
+
+    def iter_open_incidents(self) -> Iterator[Incident]:
+
+        # Reads each record's status code first, so resolved history is never decoded.
+        if not os.path.exists(self.file_path):
+            return
+        with SnapshotReader(self.file_path) as reader:
+            for row in range(len(reader)):
+                if reader.status_at(row) in OPEN_STATUSES:
+                    yield reader.incident_at(row)
+
+    def max_incident_id(self) -> Optional[int]:
+
+        if not os.path.exists(self.file_path):
+            return None
+        with SnapshotReader(self.file_path) as reader:
+            return reader.max_numeric_id()
+
+    def save_all_incidents(self, incident_list: List[Incident]) -> None:
+
+        write_snapshot(self.file_path, incident_list)
+
+    def record_incident_change(self, action: str, incident: Incident) -> None:
+
+        pass
+
+    def fingerprint(self) -> Optional[List[int]]:
+
+        return file_fingerprint(self.file_path)
+
+    def flush(self) -> None:
+
+        pass
+
+    def close(self) -> None:
+
+        pass
+
+
+def convert_json_to_snapshot(json_path: str, snapshot_path: str) -> int:
+
+    return write_snapshot(snapshot_path, IncidentStorageHandler(json_path).iter_incidents_from_json())
+
+
+def convert_snapshot_to_json(snapshot_path: str, json_path: str) -> int:
+
+    with SnapshotReader(snapshot_path) as reader:
+        incidents = list(reader)
+    IncidentStorageHandler(json_path).save_all_incidents_to_json(incidents)
+    return len(incidents)
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Convert between incidents.json and the binary snapshot format.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_snapshot = subparsers.add_parser("to-snapshot", help="Convert a JSON archive into a snapshot.")
+    to_snapshot.add_argument("json_path")
+    to_snapshot.add_argument("snapshot_path")
+    to_json = subparsers.add_parser("to-json", help="Convert a snapshot back into a JSON archive.")
+    to_json.add_argument("snapshot_path")
+    to_json.add_argument("json_path")
+    args = parser.parse_args()
+
+    if args.command == "to-snapshot":
+        count = convert_json_to_snapshot(args.json_path, args.snapshot_path)
+        print(f"✔ Wrote {count} incidents to {args.snapshot_path}")
+    else:
+        count = convert_snapshot_to_json(args.snapshot_path, args.json_path)
+        print(f"✔ Wrote {count} incidents to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
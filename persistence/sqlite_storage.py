@@ -0,0 +1,296 @@
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from incident.models import Incident, datetime_to_epoch_microseconds, epoch_microseconds_to_datetime
+from incident.text_index import compile_search_pattern
+from .storage import IncidentStorageHandler
+
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS incidents (
+        id TEXT PRIMARY KEY,
+        numeric_id INTEGER NOT NULL,
+        incident_type TEXT NOT NULL,
+        priority_level TEXT NOT NULL,
+        description TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        assigned_operator TEXT,
+        status TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        assigned_at INTEGER,
+        escalated_at INTEGER,
+        resolved_at INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS incidents_status ON incidents (status, numeric_id)",
+    "CREATE INDEX IF NOT EXISTS incidents_operator ON incidents (assigned_operator, numeric_id)",
+    "CREATE INDEX IF NOT EXISTS incidents_created_at ON incidents (created_at, numeric_id)",
+    "CREATE INDEX IF NOT EXISTS incidents_type ON incidents (incident_type, numeric_id)",
+)
+
+COLUMNS = ("id, incident_type, priority_level, description, created_at, assigned_operator, status, version, "
+           "assigned_at, escalated_at, resolved_at")
+# Databases created before incidents were versioned or timestamped gain the columns on open.
+ADDED_COLUMNS = {
+    "version": "ALTER TABLE incidents ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+    "assigned_at": "ALTER TABLE incidents ADD COLUMN assigned_at INTEGER",
+    "escalated_at": "ALTER TABLE incidents ADD COLUMN escalated_at INTEGER",
+    "resolved_at": "ALTER TABLE incidents ADD COLUMN resolved_at INTEGER",
+}
+
+# The statement texts are constants so sqlite3's statement cache prepares each one once per connection.
+UPSERT_INCIDENT = (
+    "INSERT INTO incidents (id, numeric_id, incident_type, priority_level, description, created_at, assigned_operator, status, version, "
+    "assigned_at, escalated_at, resolved_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    "numeric_id = excluded.numeric_id, incident_type = excluded.incident_type, "
+    "priority_level = excluded.priority_level, description = excluded.description, "
+    "created_at = excluded.created_at, assigned_operator = excluded.assigned_operator, status = excluded.status, "
+    "version = excluded.version, assigned_at = excluded.assigned_at, escalated_at = excluded.escalated_at, "
+    "resolved_at = excluded.resolved_at"
+)
+SELECT_ALL = f"SELECT {COLUMNS} FROM incidents ORDER BY numeric_id, id"
+SELECT_OPEN = f"SELECT {COLUMNS} FROM incidents WHERE status IN ('pending', 'in_progress', 'escalated') ORDER BY numeric_id, id"
+SELECT_MAX_ID = "SELECT MAX(numeric_id) FROM incidents"
+
+QUERY_ORDERS = {
+    "id": "numeric_id, id",
+    "created_at": "created_at, numeric_id, id",
+}
+# Row-value comparisons that resume a query past the last key of the previous page.
+RESUME_CLAUSES = {
+    "id": "(numeric_id, id) > (?, ?)",
+    "created_at": "(created_at, numeric_id, id) > (?, ?, ?)",
+}
+
+
+def _incident_row(incident: Incident) -> Tuple:
+
+    return (
+        incident.id,
+        int(incident.id) if incident.id.isdigit() else -1,
+        incident.incident_type,
+        incident.priority_level,
+        incident.description,
+        datetime_to_epoch_microseconds(incident.created_at),
+        incident.assigned_operator,
+        incident.status,
+        incident.version,
+        _optional_epoch_microseconds(incident.assigned_at),
+        _optional_epoch_microseconds(incident.escalated_at),
+        _optional_epoch_microseconds(incident.resolved_at)
+    )
+
+
+def _incident_from_row(row: Tuple) -> Incident:
+
+    (incident_id, incident_type, priority_level, description, created_at, assigned_operator, status, version,
+     assigned_at, escalated_at, resolved_at) = row
+    return Incident(
+        id=incident_id,
+        incident_type=incident_type,
+        priority_level=priority_level,
+        description=description,
+        created_at=epoch_microseconds_to_datetime(created_at),
+        assigned_operator=assigned_operator,
+        status=status,
+        version=version,
+        assigned_at=_optional_datetime(assigned_at),
+        escalated_at=_optional_datetime(escalated_at),
+        resolved_at=_optional_datetime(resolved_at)
+    )
+
+
+def _optional_epoch_microseconds(value: Optional[datetime]) -> Optional[int]:
+
+    return None if value is None else datetime_to_epoch_microseconds(value)
+
+
+def _optional_datetime(value: Optional[int]) -> Optional[datetime]:
+
+    return None if value is None else epoch_microseconds_to_datetime(value)
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+
+    return value is not None and compile_search_pattern(pattern).search(value) is not None
+
+
+class SQLiteIncidentStorageHandler:
+
+    # Every transition is written as it happens, so save_all_incidents only has to commit.
+    journaled = True
+    supports_queries = True
+
+    def __init__(self, file_path: str, batch_size: int = 500):
+
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self._pending_changes = 0
+        self._connection = sqlite3.connect(file_path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(incidents)")}
+        for column, statement in ADDED_COLUMNS.items():
+            if column not in columns:
+                self._connection.execute(statement)
+
+    def _begin(self) -> None:
+
+        if not self._connection.in_transaction:
+            self._connection.execute("BEGIN")
+
+    def _commit(self) -> None:
+
+        if self._connection.in_transaction:
+            self._connection.execute("COMMIT")
+        self._pending_changes = 0
+
+    def insert_incidents(self, incidents: Iterable[Incident]) -> int:
+
+        # Bulk writes go through one executemany per batch inside a single transaction.
+        count = 0
+        batch: List[Tuple] = []
+        self._begin()
+        try:
+            for incident in incidents:
+                batch.append(_incident_row(incident))
+                if len(batch) >= self.batch_size:
+                    self._connection.executemany(UPSERT_INCIDENT, batch)
+                    count += len(batch)
+                    batch.clear()
+            if batch:
+                self._connection.executemany(UPSERT_INCIDENT, batch)
+                count += len(batch)
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            self._pending_changes = 0
+            raise
+        self._commit()
+        return count
+
+    def load_all_incidents(self) -> List[Incident]:
+
+        return list(self.iter_all_incidents())
+
+    def iter_all_incidents(self) -> Iterator[Incident]:
+
+        for row in self._connection.execute(SELECT_ALL):
+            yield _incident_from_row(row)
+
+    def iter_open_incidents(self) -> Iterator[Incident]:
+
+        for row in self._connection.execute(SELECT_OPEN):
+            yield _incident_from_row(row)
+
+    def max_incident_id(self) -> Optional[int]:
+
+        return self._connection.execute(SELECT_MAX_ID).fetchone()[0]
+
+    def query_incidents(self, status: Optional[str] = None, operator: Optional[str] = None,
+                        incident_type: Optional[str] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None, pattern: Optional[str] = None,
+                        order_by: str = "id", after: Optional[Tuple] = None,
+                        limit: Optional[int] = None) -> Iterator[Incident]:
+
+        clauses = []
+        parameters: List = []
+        if status is not None:
+            clauses.append("status = ?")
+            parameters.append(status)
+        if operator is not None:
+            clauses.append("assigned_operator = ?")
+            parameters.append(operator)
+        if incident_type is not None:
+            clauses.append("incident_type = ?")
+            parameters.append(incident_type)
+        if start_date is not None:
+            clauses.append("created_at >= ?")
+            parameters.append(datetime_to_epoch_microseconds(start_date))
+        if end_date is not None:
+            clauses.append("created_at <= ?")
+            parameters.append(datetime_to_epoch_microseconds(end_date))
+        if pattern is not None:
+            # Compiled up front so a bad pattern raises re.error rather than a SQLite error.
+            compile_search_pattern(pattern)
+            clauses.append("description REGEXP ?")
+            parameters.append(pattern)
+
+        if order_by not in QUERY_ORDERS:
+            raise ValueError(f"Unknown order: {order_by}. Valid options are: {list(QUERY_ORDERS)}")
+        if after is not None:
+            # Keys come from the in-memory orderings, where created_at is a datetime.
+            clauses.append(RESUME_CLAUSES[order_by])
+            parameters.extend(datetime_to_epoch_microseconds(value) if isinstance(value, datetime) else value for value in after)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        statement = f"SELECT {COLUMNS} FROM incidents{where} ORDER BY {QUERY_ORDERS[order_by]}"
+        if limit is not None:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+        for row in self._connection.execute(statement, parameters):
+            yield _incident_from_row(row)
+
+    def save_all_incidents(self, incident_list: List[Incident]) -> None:
+
+        # Upserts rather than replaces: the database also holds history the caller never loaded.
+        self.insert_incidents(incident_list)
+
+    def record_incident_change(self, action: str, incident: Incident) -> None:
+
+        self._begin()
+        self._connection.execute(UPSERT_INCIDENT, _incident_row(incident))
+        self._pending_changes += 1
+        if self._pending_changes >= self.batch_size:
+            self._commit()
+
+    def flush(self) -> None:
+
+        self._commit()
+
+    def close(self) -> None:
+
+        if self._connection is not None:
+            self._commit()
+            self._connection.close()
+            self._connection = None
+
+
+def migrate_json_to_sqlite(json_path: str, database_path: str) -> int:
+
+    # Built beside the target and renamed into place, so a failed migration leaves no database behind.
+    temporary_path = database_path + ".tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    storage = SQLiteIncidentStorageHandler(temporary_path)
+    try:
+        count = storage.insert_incidents(IncidentStorageHandler(json_path).iter_incidents_from_json())
+    finally:
+        storage.close()
+    os.replace(temporary_path, database_path)
+    return count
+
+
+def default_database_path(json_path: str) -> str:
+
+    return os.path.splitext(json_path)[0] + ".db"
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Copy an incidents.json archive into an SQLite database.")
+    parser.add_argument("json_path", nargs="?", default="incidents.json")
+    parser.add_argument("database_path", nargs="?")
+    args = parser.parse_args()
+
+    database_path = args.database_path or default_database_path(args.json_path)
+    count = migrate_json_to_sqlite(args.json_path, database_path)
+    print(f"✔ Migrated {count} incidents to {database_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
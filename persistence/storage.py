@@ -1,20 +1,125 @@
 import json
 import os
-from datetime import datetime
-from typing import List
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 from incident.models import Incident, incident_to_dict
+from .manifest import file_fingerprint
+from .streaming import DEFAULT_CHUNK_SIZE, LazyIncidentArchive, iter_incidents_from_json
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+LOCK_SUFFIX = ".lock"
+NEXT_ID_SUFFIX = ".next-id"
+# The counter is zero-padded to a fixed width and overwritten in place: truncating the file
+# first makes ext4 flush it to disk, which costs tens of milliseconds per create.
+NEXT_ID_WIDTH = 20
+
+
+@contextmanager
+def exclusive_lock(file) -> Iterator[None]:
+
+    # Advisory: it only excludes other processes (and threads) that take the same lock.
+    # Without fcntl, as on Windows, writers are not coordinated.
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
 
 
 class IncidentStorageHandler:
+
+    journaled = False
+    supports_queries = False
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
 
         self.file_path = file_path
+        self.chunk_size = chunk_size
+        # The archive as this process last read or wrote it; anything else means another writer.
+        self._synced_fingerprint: Optional[List[int]] = None
+        # (fingerprint, highest numeric ID) from the last open-incident read.
+        self._max_incident_id: Optional[Tuple[Optional[List[int]], Optional[int]]] = None
 
-    def save_all_incidents_to_json(self, incident_list: List[Incident]) -> None:
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+
+        with open(self.file_path + LOCK_SUFFIX, "a", encoding="utf-8") as lock_file:
+            with exclusive_lock(lock_file):
+                yield
 
-        with open(self.file_path, "w", encoding="utf-8") as file:
+    def _write_json(self, incident_list: List[Incident]) -> None:
+
+        # Written beside the archive and renamed over it, so readers see the old or the new file, never half of one.
+        temporary_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
             json.dump([incident_to_dict(incident) for incident in incident_list], file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.file_path)
+        self._synced_fingerprint = self.fingerprint()
+
+    def mark_synced(self, fingerprint: Optional[List[int]]) -> None:
+
+        # For callers whose in-memory state came from somewhere other than this handler's own
+        # last read, such as a startup manifest: saves merge unless the archive still matches.
+        self._synced_fingerprint = fingerprint
+
+    def save_all_incidents_to_json(self, incident_list: List[Incident]) -> None:
+
+        with self.locked():
+            self._write_json(incident_list)
+
+    def merge_and_save(self, incident_list: List[Incident],
+                       base_versions: Mapping[str, Optional[int]]) -> Tuple[Optional[List[Incident]], List[Incident]]:
+
+        # base_versions holds, for every incident this process changed, the version it started
+        # from (None when it created the incident). If another process wrote the archive since
+        # it was last read here, only those changes are applied, and only where the stored
+        # version is still the one they started from. Returns the merged archive (None when
+        # nothing had to be merged) and the local changes that lost.
+        with self.locked():
+            if self._synced_fingerprint is not None and self.fingerprint() == self._synced_fingerprint:
+                self._write_json(incident_list)
+                return None, []
+
+            stored: Dict[str, Incident] = {incident.id: incident for incident in self.iter_incidents_from_json()}
+            rejected = []
+            for incident in incident_list:
+                current = stored.get(incident.id)
+                if incident.id not in base_versions:
+                    if current is None:
+                        stored[incident.id] = incident
+                    continue
+                base_version = base_versions[incident.id]
+                if current is None or (base_version is not None and current.version == base_version):
+                    stored[incident.id] = incident
+                else:
+                    rejected.append(incident)
+            merged = list(stored.values())
+            self._write_json(merged)
+            return merged, rejected
+
+    def reserve_incident_ids(self, minimum: int, count: int = 1) -> int:
+
+        # Every process using this archive draws IDs from one counter file, so concurrent
+        # creates never collide. Returns the first of count consecutive IDs.
+        descriptor = os.open(self.file_path + NEXT_ID_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(descriptor, "r+", encoding="utf-8") as file:
+            with exclusive_lock(file):
+                text = file.read().strip()
+                first_id = max(int(text) if text.isdigit() else 0, minimum)
+                file.seek(0)
+                file.write(str(first_id + count).zfill(NEXT_ID_WIDTH))
+                file.flush()
+        return first_id
 
     def load_all_incidents_from_json(self) -> List[Incident]:
 
@@ -22,24 +127,60 @@ class IncidentStorageHandler:
             return []
         
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                content = file.read().strip()
-                if not content:
-                    return []
-                raw_data = json.loads(content)
+            return list(self.iter_incidents_from_json())
         except json.JSONDecodeError:
             print("Warning: incidents.json is invalid or empty. Starting with an empty list.")
             return []
-        
-        return [
-            Incident(
-                id=item["id"],
-                incident_type=item["incident_type"],
-                priority_level=item["priority_level"],
-                description=item["description"],
-                created_at=datetime.fromisoformat(item["created_at"]),
-                assigned_operator=item["assigned_operator"],
-                status=item["status"]
-            )
-            for item in raw_data
-        ]
\ No newline at end of file
+
+    def iter_incidents_from_json(self) -> Iterator[Incident]:
+
+        if not os.path.exists(self.file_path):
+            return iter(())
+        # Taken before reading: if the file is replaced in between, the next save merges rather than overwrites.
+        self._synced_fingerprint = self.fingerprint()
+        return iter_incidents_from_json(self.file_path, self.chunk_size)
+
+    def iter_open_incidents(self) -> Iterator[Incident]:
+
+        # Only open incidents are decoded; resolved records are skipped as byte ranges.
+        self._synced_fingerprint = self.fingerprint()
+        archive = LazyIncidentArchive(self.file_path, self.chunk_size)
+        self._max_incident_id = (self._synced_fingerprint, archive.max_numeric_id)
+        return iter(archive.open_incidents)
+
+    def max_incident_id(self) -> Optional[int]:
+
+        if self._max_incident_id is None or self._max_incident_id[0] != self.fingerprint():
+            self.iter_open_incidents()
+        return self._max_incident_id[1]
+
+    def load_all_incidents(self) -> List[Incident]:
+
+        return self.load_all_incidents_from_json()
+
+    def iter_all_incidents(self) -> Iterator[Incident]:
+
+        # Streams records for callers that fold them as they arrive. Unlike
+        # load_all_incidents, a corrupt file raises json.JSONDecodeError mid-iteration.
+        return self.iter_incidents_from_json()
+
+    def save_all_incidents(self, incident_list: List[Incident]) -> None:
+
+        self.save_all_incidents_to_json(incident_list)
+
+    def record_incident_change(self, action: str, incident: Incident) -> None:
+
+        # The plain JSON file is only written by save_all_incidents.
+        pass
+
+    def fingerprint(self) -> Optional[List[int]]:
+
+        return file_fingerprint(self.file_path)
+
+    def flush(self) -> None:
+
+        pass
+
+    def close(self) -> None:
+
+        pass
\ No newline at end of file
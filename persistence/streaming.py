@@ -0,0 +1,151 @@
+import codecs
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+from incident.models import Incident, incident_from_dict
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+OPEN_STATUSES = ("pending", "in_progress", "escalated")
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def iter_json_array_records(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, int, Dict]]:
+
+    # Yields (byte offset, byte length, record) for every object of a top-level JSON array,
+    # holding at most one chunk plus one record in memory at a time.
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    with open(file_path, "rb") as file:
+        buffer = ""
+        position = 0
+        byte_position = 0
+        end_of_file = False
+        started = False
+        # After a record only ',' or ']' may follow; after a ',' only another record.
+        after_record = False
+        after_comma = False
+
+        def read_more() -> bool:
+            nonlocal buffer, position, end_of_file
+            chunk = file.read(chunk_size)
+            if not chunk:
+                buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+                end_of_file = True
+            else:
+                buffer = buffer[position:] + text_decoder.decode(chunk)
+            position = 0
+            return not end_of_file
+
+        while True:
+            skip_from = position
+            while True:
+                position = _WHITESPACE.match(buffer, position).end()
+                if position < len(buffer) or end_of_file:
+                    break
+                byte_position += len(buffer[skip_from:position].encode("utf-8"))
+                read_more()
+                skip_from = position
+            byte_position += len(buffer[skip_from:position].encode("utf-8"))
+
+            if position >= len(buffer):
+                if started:
+                    raise json.JSONDecodeError("Unterminated JSON array", buffer, position)
+                return
+
+            if not started:
+                if buffer[position] != "[":
+                    raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+                started = True
+                position += 1
+                byte_position += 1
+                continue
+
+            character = buffer[position]
+            if after_record:
+                if character == "]":
+                    return
+                if character != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                after_record = False
+                after_comma = True
+                position += 1
+                byte_position += 1
+                continue
+            if character == "]" and not after_comma:
+                return
+            if character in ",]":
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if end_of_file:
+                    raise
+                read_more()
+                continue
+            if not isinstance(record, dict):
+                raise json.JSONDecodeError("Expected a JSON object", buffer, position)
+            after_record = True
+            after_comma = False
+
+            record_length = len(buffer[position:end].encode("utf-8"))
+            yield byte_position, record_length, record
+            byte_position += record_length
+            position = end
+
+
+def iter_incidents_from_json(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Incident]:
+
+    for _, _, record in iter_json_array_records(file_path, chunk_size):
+        yield incident_from_dict(record)
+
+
+class LazyIncidentArchive:
+
+    # Open incidents are decoded while streaming; resolved ones are kept as byte ranges
+    # into the JSON file and only decoded when asked for.
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+
+        self.file_path = file_path
+        self.open_incidents: List[Incident] = []
+        self._resolved_offsets: Dict[str, Tuple[int, int]] = {}
+        self.max_numeric_id: Optional[int] = None
+
+        if not os.path.exists(file_path):
+            return
+        for offset, length, record in iter_json_array_records(file_path, chunk_size):
+            incident_id = record["id"]
+            if record.get("status") in OPEN_STATUSES:
+                self.open_incidents.append(incident_from_dict(record))
+            else:
+                self._resolved_offsets[incident_id] = (offset, length)
+            if incident_id.isdigit() and (self.max_numeric_id is None or int(incident_id) > self.max_numeric_id):
+                self.max_numeric_id = int(incident_id)
+
+    def resolved_ids(self) -> List[str]:
+
+        return list(self._resolved_offsets)
+
+    def get_resolved(self, incident_id: str) -> Optional[Incident]:
+
+        location = self._resolved_offsets.get(incident_id)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.file_path, "rb") as file:
+            file.seek(offset)
+            return incident_from_dict(json.loads(file.read(length).decode("utf-8")))
+
+    def iter_resolved(self) -> Iterator[Incident]:
+
+        with open(self.file_path, "rb") as file:
+            for offset, length in self._resolved_offsets.values():
+                file.seek(offset)
+                yield incident_from_dict(json.loads(file.read(length).decode("utf-8")))
+
+    def __len__(self) -> int:
+
+        return len(self.open_incidents) + len(self._resolved_offsets)
\ No newline at end of file
@@ -0,0 +1,464 @@
+import argparse
+import heapq
+import itertools
+import json
+import lzma
+import os
+import shutil
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from incident.indexes import OPEN_STATUSES, created_at_key, id_key
+from incident.models import Incident, incident_from_dict, incident_to_dict
+from incident.text_index import compile_search_pattern
+from .journal import JournaledIncidentStorageHandler
+from .storage import IncidentStorageHandler
+
+
+SEGMENT_SUFFIX = ".seg"
+HOT_FILE_NAME = "hot.json"
+SEALED_FILE_NAME = "sealed.json"
+DEFAULT_SEAL_THRESHOLD = 10000
+DEFAULT_PARTITION_FORMAT = "%Y-%m"
+DEFAULT_CACHED_SEGMENTS = 4
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "lzma": (lzma.compress, lzma.decompress),
+    "zlib": (zlib.compress, zlib.decompress),
+}
+QUERY_KEYS = {
+    "id": id_key,
+    "created_at": created_at_key,
+}
+
+
+@dataclass
+class SegmentSummary:
+    file_name: str
+    generation: int
+    partition: str
+    codec: str
+    count: int
+    min_id: Tuple[int, str]
+    max_id: Tuple[int, str]
+    start: datetime
+    end: datetime
+    statuses: Dict[str, int] = field(default_factory=dict)
+    operators: Dict[str, int] = field(default_factory=dict)
+    incident_types: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, file_name: str, generation: int, partition: str, codec: str,
+           incidents: List[Incident]) -> "SegmentSummary":
+
+        summary = cls(
+            file_name, generation, partition, codec, len(incidents),
+            id_key(incidents[0]), id_key(incidents[-1]),
+            min(incident.created_at for incident in incidents),
+            max(incident.created_at for incident in incidents)
+        )
+        for incident in incidents:
+            summary.statuses[incident.status] = summary.statuses.get(incident.status, 0) + 1
+            if incident.assigned_operator:
+                summary.operators[incident.assigned_operator] = summary.operators.get(incident.assigned_operator, 0) + 1
+            summary.incident_types[incident.incident_type] = summary.incident_types.get(incident.incident_type, 0) + 1
+        return summary
+
+    def to_dict(self) -> Dict:
+
+        return {
+            "generation": self.generation,
+            "partition": self.partition,
+            "codec": self.codec,
+            "count": self.count,
+            "min_id": list(self.min_id),
+            "max_id": list(self.max_id),
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "statuses": self.statuses,
+            "operators": self.operators,
+            "incident_types": self.incident_types,
+        }
+
+    @classmethod
+    def from_dict(cls, file_name: str, item: Dict) -> "SegmentSummary":
+
+        return cls(
+            file_name, item["generation"], item["partition"], item["codec"], item["count"],
+            tuple(item["min_id"]), tuple(item["max_id"]),
+            datetime.fromisoformat(item["start"]), datetime.fromisoformat(item["end"]),
+            item["statuses"], item["operators"], item["incident_types"]
+        )
+
+    def may_match(self, status: Optional[str], operator: Optional[str], incident_type: Optional[str],
+                  start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+
+        if status is not None and status not in self.statuses:
+            return False
+        if operator is not None and operator not in self.operators:
+            return False
+        if incident_type is not None and incident_type not in self.incident_types:
+            return False
+        if start_date is not None and self.end < start_date:
+            return False
+        return end_date is None or self.start <= end_date
+
+    def min_key(self, order_by: str) -> Tuple:
+
+        # A one-element (start,) sorts before every full (created_at, numeric_id, id) key at start.
+        return self.min_id if order_by == "id" else (self.start,)
+
+    def ends_after(self, order_by: str, after: Tuple) -> bool:
+
+        return self.max_id > after if order_by == "id" else self.end >= after[0]
+
+
+def write_segment(file_path: str, summary: SegmentSummary, incidents: List[Incident]) -> None:
+
+    # One uncompressed summary line, so planning a query never decompresses anything, then
+    # the compressed NDJSON body. Written beside the target and renamed into place.
+    compress = CODECS[summary.codec][0]
+    body = "".join(json.dumps(incident_to_dict(incident)) + "\n" for incident in incidents).encode("utf-8")
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(json.dumps(summary.to_dict()).encode("utf-8") + b"\n")
+        file.write(compress(body))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, file_path)
+
+
+def read_segment_summary(file_path: str) -> SegmentSummary:
+
+    with open(file_path, "rb") as file:
+        return SegmentSummary.from_dict(os.path.basename(file_path), json.loads(file.readline()))
+
+
+def read_segment(file_path: str) -> List[Incident]:
+
+    with open(file_path, "rb") as file:
+        summary = json.loads(file.readline())
+        body = CODECS[summary["codec"]][1](file.read())
+    return [incident_from_dict(json.loads(line)) for line in body.decode("utf-8").splitlines() if line]
+
+
+class TieredIncidentStorageHandler:
+
+    # Open incidents and recently resolved ones form the hot tier, a journaled JSON file that
+    # is all that start-up loads. Once seal_threshold resolved incidents have built up, a
+    # background thread seals them into immutable compressed segments, one per created_at
+    # partition, each headed by a summary. Queries skip every segment whose summary cannot
+    # match and open the rest lazily, in key order, through a small decoded-segment cache.
+    journaled = True
+    supports_queries = True
+
+    def __init__(self, directory: str, seal_threshold: int = DEFAULT_SEAL_THRESHOLD, codec: str = "lzma",
+                 partition_format: str = DEFAULT_PARTITION_FORMAT, cached_segments: int = DEFAULT_CACHED_SEGMENTS):
+
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}. Valid options are: {list(CODECS)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file_path = directory
+        self.seal_threshold = seal_threshold
+        self.codec = codec
+        self.partition_format = partition_format
+        self.cached_segments = cached_segments
+        self._lock = threading.RLock()
+        self._seal_thread: Optional[threading.Thread] = None
+        self._cache: "OrderedDict[str, List[Incident]]" = OrderedDict()
+
+        self._hot_storage = JournaledIncidentStorageHandler(os.path.join(directory, HOT_FILE_NAME))
+        self._hot: Dict[str, Incident] = {}
+        self._hot_resolved: Set[str] = set()
+        for incident in self._hot_storage.load_all_incidents():
+            self._put_hot(incident)
+
+        self._segments: List[SegmentSummary] = [
+            read_segment_summary(os.path.join(directory, file_name))
+            for file_name in sorted(os.listdir(directory)) if file_name.endswith(SEGMENT_SUFFIX)
+        ]
+        self._generation = max((summary.generation for summary in self._segments), default=0)
+        self._drop_unconfirmed_duplicates()
+        if len(self._hot_resolved) >= self.seal_threshold:
+            self.seal()
+
+    def _put_hot(self, incident: Incident) -> None:
+
+        self._hot[incident.id] = incident
+        if incident.status == "resolved":
+            self._hot_resolved.add(incident.id)
+        else:
+            self._hot_resolved.discard(incident.id)
+
+    def _sealed_path(self) -> str:
+
+        return os.path.join(self.directory, SEALED_FILE_NAME)
+
+    def _confirmed_generation(self) -> int:
+
+        try:
+            with open(self._sealed_path(), "r", encoding="utf-8") as file:
+                return json.load(file)["generation"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return 0
+
+    def _confirm_generation(self, generation: int) -> None:
+
+        temporary_path = self._sealed_path() + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"generation": generation}, file)
+        os.replace(temporary_path, self._sealed_path())
+
+    def _drop_unconfirmed_duplicates(self) -> None:
+
+        # A seal writes its segments, then rewrites the hot tier, then confirms its generation.
+        # After a crash between the first two steps the sealed incidents are in both tiers; only
+        # unconfirmed segments can hold such copies, so only they are checked.
+        confirmed = self._confirmed_generation()
+        unconfirmed = [summary for summary in self._segments if summary.generation > confirmed]
+        if not unconfirmed:
+            return
+        if self._hot_resolved:
+            duplicates = {
+                incident.id for summary in unconfirmed for incident in self._load_segment(summary)
+                if incident.id in self._hot_resolved
+            }
+            if duplicates:
+                for incident_id in duplicates:
+                    del self._hot[incident_id]
+                    self._hot_resolved.discard(incident_id)
+                self._hot_storage.save_all_incidents(list(self._hot.values()))
+        self._confirm_generation(self._generation)
+
+    def seal(self, wait: bool = False) -> None:
+
+        with self._lock:
+            if self._seal_thread is not None and self._seal_thread.is_alive():
+                thread = self._seal_thread
+            else:
+                # Resolved incidents never change again, so the batch can be written outside the lock.
+                batch = [self._hot[incident_id] for incident_id in self._hot_resolved]
+                if not batch:
+                    return
+                self._generation += 1
+                thread = self._seal_thread = threading.Thread(
+                    target=self._seal_batch, args=(batch, self._generation), name="incident-tier-seal", daemon=True
+                )
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _seal_batch(self, batch: List[Incident], generation: int) -> None:
+
+        partitions: Dict[str, List[Incident]] = {}
+        for incident in batch:
+            partitions.setdefault(incident.created_at.strftime(self.partition_format), []).append(incident)
+
+        summaries = []
+        for partition, incidents in sorted(partitions.items()):
+            incidents.sort(key=id_key)
+            file_name = f"{partition}-{generation:06d}{SEGMENT_SUFFIX}"
+            summary = SegmentSummary.of(file_name, generation, partition, self.codec, incidents)
+            write_segment(os.path.join(self.directory, file_name), summary, incidents)
+            summaries.append(summary)
+
+        # The new segments and the shrunken hot tier become visible together.
+        with self._lock:
+            self._segments.extend(summaries)
+            for incident in batch:
+                if self._hot.get(incident.id) is incident:
+                    del self._hot[incident.id]
+                    self._hot_resolved.discard(incident.id)
+            self._hot_storage.save_all_incidents(list(self._hot.values()))
+            self._confirm_generation(generation)
+
+    def _load_segment(self, summary: SegmentSummary) -> List[Incident]:
+
+        with self._lock:
+            incidents = self._cache.get(summary.file_name)
+            if incidents is not None:
+                self._cache.move_to_end(summary.file_name)
+                return incidents
+        incidents = read_segment(os.path.join(self.directory, summary.file_name))
+        with self._lock:
+            self._cache[summary.file_name] = incidents
+            while len(self._cache) > self.cached_segments:
+                self._cache.popitem(last=False)
+        return incidents
+
+    def segment_summaries(self) -> List[SegmentSummary]:
+
+        with self._lock:
+            return list(self._segments)
+
+    def load_all_incidents(self) -> List[Incident]:
+
+        return list(self.iter_all_incidents())
+
+    def iter_all_incidents(self) -> Iterator[Incident]:
+
+        return self.query_incidents()
+
+    def iter_open_incidents(self) -> Iterator[Incident]:
+
+        with self._lock:
+            open_incidents = [incident for incident in self._hot.values() if incident.status in OPEN_STATUSES]
+        return iter(sorted(open_incidents, key=id_key))
+
+    def max_incident_id(self) -> Optional[int]:
+
+        with self._lock:
+            numeric_ids = [numeric_id for numeric_id, _ in map(id_key, self._hot.values())]
+            numeric_ids.extend(summary.max_id[0] for summary in self._segments)
+        return max(numeric_ids, default=None)
+
+    def query_incidents(self, status: Optional[str] = None, operator: Optional[str] = None,
+                        incident_type: Optional[str] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None, pattern: Optional[str] = None,
+                        order_by: str = "id", after: Optional[Tuple] = None,
+                        limit: Optional[int] = None) -> Iterator[Incident]:
+
+        if order_by not in QUERY_KEYS:
+            raise ValueError(f"Unknown order: {order_by}. Valid options are: {list(QUERY_KEYS)}")
+        # Compiled up front so a bad pattern raises re.error here rather than mid-iteration.
+        search = compile_search_pattern(pattern).search if pattern is not None else None
+        key = QUERY_KEYS[order_by]
+        after = tuple(after) if after is not None else None
+
+        def matches(incident: Incident) -> bool:
+            return ((status is None or incident.status == status) and
+                    (operator is None or incident.assigned_operator == operator) and
+                    (incident_type is None or incident.incident_type == incident_type) and
+                    (start_date is None or incident.created_at >= start_date) and
+                    (end_date is None or incident.created_at <= end_date) and
+                    (after is None or key(incident) > after) and
+                    (search is None or search(incident.description) is not None))
+
+        with self._lock:
+            hot = sorted(filter(matches, self._hot.values()), key=key)
+            segments = [
+                summary for summary in self._segments
+                if summary.may_match(status, operator, incident_type, start_date, end_date)
+                and (after is None or summary.ends_after(order_by, after))
+            ]
+        segments.sort(key=lambda summary: summary.min_key(order_by))
+        return self._merge(hot, segments, matches, key, order_by, limit)
+
+    def _merge(self, hot: List[Incident], segments: List[SegmentSummary], matches: Callable[[Incident], bool],
+               key: Callable[[Incident], Tuple], order_by: str, limit: Optional[int]) -> Iterator[Incident]:
+
+        # k-way merge that opens a segment only once the smallest pending key reaches the
+        # segment's minimum, so a limited query decompresses just the segments it reads.
+        heap: List[Tuple] = []
+        tie_breaker = itertools.count()
+
+        def push(iterator: Iterator[Incident]) -> None:
+            for incident in iterator:
+                heapq.heappush(heap, (key(incident), next(tie_breaker), incident, iterator))
+                return
+
+        def segment_matches(summary: SegmentSummary) -> Iterator[Incident]:
+            incidents = filter(matches, self._load_segment(summary))
+            # Segments are stored in ID order; date-ordered reads sort the survivors.
+            return iter(incidents if order_by == "id" else sorted(incidents, key=key))
+
+        push(iter(hot))
+        position = 0
+        produced = 0
+        while limit is None or produced < limit:
+            while position < len(segments) and (not heap or segments[position].min_key(order_by) <= heap[0][0]):
+                push(segment_matches(segments[position]))
+                position += 1
+            if not heap:
+                return
+            _, _, incident, iterator = heapq.heappop(heap)
+            yield incident
+            produced += 1
+            push(iterator)
+
+    def import_incidents(self, incidents: Iterable[Incident]) -> int:
+
+        # Bulk load for migrations: skips the hot journal and seals as resolved incidents pile up.
+        count = 0
+        for incident in incidents:
+            with self._lock:
+                self._put_hot(incident)
+                ready = len(self._hot_resolved) >= self.seal_threshold
+            if ready:
+                self.seal(wait=True)
+            count += 1
+        self.seal(wait=True)
+        with self._lock:
+            self._hot_storage.save_all_incidents(list(self._hot.values()))
+        return count
+
+    def save_all_incidents(self, incident_list: List[Incident]) -> None:
+
+        # Upserts rather than replaces, like the SQLite backend: sealed history is not passed in.
+        with self._lock:
+            for incident in incident_list:
+                self._put_hot(incident)
+            self._hot_storage.save_all_incidents(list(self._hot.values()))
+            ready = len(self._hot_resolved) >= self.seal_threshold
+        if ready:
+            self.seal()
+
+    def record_incident_change(self, action: str, incident: Incident) -> None:
+
+        with self._lock:
+            self._put_hot(incident)
+            self._hot_storage.record_incident_change(action, incident)
+            ready = len(self._hot_resolved) >= self.seal_threshold
+        if ready:
+            self.seal()
+
+    def flush(self) -> None:
+
+        self._hot_storage.flush()
+
+    def close(self) -> None:
+
+        if self._seal_thread is not None:
+            self._seal_thread.join()
+        self._hot_storage.close()
+
+
+def default_archive_directory(json_path: str) -> str:
+
+    return os.path.splitext(json_path)[0] + ".archive"
+
+
+def migrate_json_to_tiered(json_path: str, directory: str, **options) -> int:
+
+    # Built beside the target and renamed into place, so a failed migration leaves no archive behind.
+    temporary_directory = directory.rstrip(os.sep) + ".tmp"
+    if os.path.exists(temporary_directory):
+        shutil.rmtree(temporary_directory)
+    storage = TieredIncidentStorageHandler(temporary_directory, **options)
+    try:
+        count = storage.import_incidents(IncidentStorageHandler(json_path).iter_incidents_from_json())
+    finally:
+        storage.close()
+    os.replace(temporary_directory, directory)
+    return count
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Split an incidents.json archive into a hot tier and compressed segments.")
+    parser.add_argument("json_path", nargs="?", default="incidents.json")
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="lzma")
+    parser.add_argument("--seal-threshold", type=int, default=DEFAULT_SEAL_THRESHOLD)
+    args = parser.parse_args()
+
+    directory = args.directory or default_archive_directory(args.json_path)
+    count = migrate_json_to_tiered(args.json_path, directory, codec=args.codec, seal_threshold=args.seal_threshold)
+    print(f"✔ Migrated {count} incidents to {directory}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
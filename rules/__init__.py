@@ -1,5 +1,11 @@
-from .default_rules import INCIDENT_TYPE_ROLE_RULES
+from incident.lazy import lazy_exports
 
-__all__ = [
-    'INCIDENT_TYPE_ROLE_RULES'
-]
\ No newline at end of file
+# Names are imported from their submodule on first access.
+_EXPORTS = {
+    'INCIDENT_TYPE_ROLE_RULES': '.default_rules',
+    'CompiledRules': '.engine',
+    'RulesEngine': '.engine'
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
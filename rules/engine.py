@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import time
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from .default_rules import INCIDENT_TYPE_ROLE_RULES
+
+
+DEFAULT_RULES_FILE = "rules.json"
+DEFAULT_CHECK_INTERVAL = 1.0
+_NO_TYPES: FrozenSet[str] = frozenset()
+
+
+class RuleFileError(Exception):
+    pass
+
+
+class CompiledRules:
+
+    # Immutable lookup tables built once per rule set. Each incident type maps to its sorted
+    # eligible operators, and each operator to the frozen set of types it may take, so
+    # validation is one dict probe and one set probe however many operators exist.
+    def __init__(self, rules_by_type: Mapping[str, Iterable[str]]):
+
+        operators_by_type: Dict[str, List[str]] = {}
+        for incident_type, operator_names in rules_by_type.items():
+            operators_by_type[_normalize_name(incident_type)] = sorted({_normalize_name(name) for name in operator_names})
+
+        self.operators: Tuple[str, ...] = tuple(sorted({name for names in operators_by_type.values() for name in names}))
+        self.incident_types: Tuple[str, ...] = tuple(sorted(operators_by_type))
+        self.eligible_by_type: Dict[str, Tuple[str, ...]] = {}
+        types_by_operator: Dict[str, List[str]] = {name: [] for name in self.operators}
+
+        for incident_type, operator_names in operators_by_type.items():
+            for name in operator_names:
+                types_by_operator[name].append(incident_type)
+            self.eligible_by_type[incident_type] = tuple(operator_names)
+        self.types_by_operator: Dict[str, FrozenSet[str]] = {
+            name: frozenset(incident_types) for name, incident_types in types_by_operator.items()
+        }
+
+    def allows(self, operator_name: str, incident_type: str) -> bool:
+
+        return incident_type in self.types_by_operator.get(operator_name, _NO_TYPES)
+
+    def rules_by_type(self) -> Dict[str, List[str]]:
+
+        return {incident_type: list(operators) for incident_type, operators in self.eligible_by_type.items()}
+
+
+def _normalize_name(name: str) -> str:
+
+    # Prompts lower-case what the user types, so names are matched in lower case.
+    if not isinstance(name, str) or not name.strip():
+        raise RuleFileError(f"Invalid name in rules: {name!r}")
+    return name.strip().lower()
+
+
+def load_rules_file(file_path: str) -> CompiledRules:
+
+    # The file mirrors INCIDENT_TYPE_ROLE_RULES: {"incident_type": ["operator", ...], ...}
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except json.JSONDecodeError as error:
+        raise RuleFileError(f"{file_path} is not valid JSON: {error}")
+    except (ValueError, RecursionError) as error:
+        # Bytes that are not UTF-8, or nesting too deep for the parser.
+        raise RuleFileError(f"{file_path} could not be read as JSON: {error}")
+    if not isinstance(data, dict) or not all(isinstance(names, list) for names in data.values()):
+        raise RuleFileError(f"{file_path} must map each incident type to a list of operator names")
+    return CompiledRules(data)
+
+
+def write_rules_file(file_path: str, rules_by_type: Mapping[str, Iterable[str]]) -> None:
+
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump({incident_type: sorted(names) for incident_type, names in rules_by_type.items()}, file, indent=4)
+    os.replace(temporary_path, file_path)
+
+
+class RulesEngine:
+
+    # Holds the current CompiledRules. refresh() looks at the rules file's mtime at most once
+    # per check_interval and, when it changed, compiles the new file before swapping it in
+    # with one assignment, so readers only ever see a complete rule set. A file that fails to
+    # load keeps the previous rules.
+    def __init__(self, file_path: Optional[str] = None,
+                 default_rules: Mapping[str, Iterable[str]] = INCIDENT_TYPE_ROLE_RULES,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL):
+
+        self.file_path = file_path
+        self.check_interval = check_interval
+        self.compiled = CompiledRules(default_rules)
+        self.last_error: Optional[str] = None
+        self._loaded_mtime: Optional[int] = None
+        self._next_check = 0.0
+        if file_path is not None:
+            self.refresh(force=True)
+
+    @classmethod
+    def from_mapping(cls, rules_by_type: Mapping[str, Iterable[str]]) -> "RulesEngine":
+
+        return cls(None, rules_by_type)
+
+    def refresh(self, force: bool = False) -> bool:
+
+        if self.file_path is None:
+            return False
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+
+        try:
+            mtime = os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
+            # Until the file exists the defaults (or the last good rules) stay in force.
+            return False
+        if mtime == self._loaded_mtime:
+            return False
+        self._loaded_mtime = mtime
+        try:
+            compiled = load_rules_file(self.file_path)
+        except (OSError, RuleFileError) as error:
+            self.last_error = str(error)
+            print(f"Warning: {error}. Keeping the previous assignment rules.", file=sys.stderr)
+            return False
+        self.compiled = compiled
+        self.last_error = None
+        return True
+
+
+def main() -> None:
+
+    # python -m rules.engine [FILE] writes the built-in rules to FILE as a starting point.
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_RULES_FILE
+    if os.path.exists(file_path):
+        print(f"✖ {file_path} already exists.")
+        sys.exit(1)
+    write_rules_file(file_path, INCIDENT_TYPE_ROLE_RULES)
+    print(f"✔ Wrote the default assignment rules to {file_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
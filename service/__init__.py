@@ -0,0 +1,6 @@
+from .server import IncidentServer, serve
+
+__all__ = [
+    'IncidentServer',
+    'serve'
+]
\ No newline at end of file
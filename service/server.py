@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+from typing import Callable, Dict, Optional, Set
+from cli.batch import BatchCommandError, BatchCommandRunner
+from cli.interface import IncidentCLI, IncidentOperationError
+from logs import METRICS
+from logs.events import EventLog
+from rules.engine import DEFAULT_RULES_FILE, RulesEngine
+from logs.instrumentation import enable_metrics_from_environment
+from persistence.factory import create_storage_handler
+
+
+READ_OPERATIONS = ("query", "timeline", "analytics")
+DEFAULT_PORT = 8765
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class IncidentServer:
+
+    # Serves the batch-mode command set as JSON lines over TCP. Queries and saves run in worker
+    # threads, since the CLI locks its own state, so neither holds up the event loop;
+    # create/assign/resolve and escalation ticks go through one bounded queue drained by a
+    # single writer task, so a full queue stops the connection readers.
+    def __init__(self, cli: IncidentCLI, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 queue_size: int = 1024, escalation_interval: float = 1.0, save_interval: float = 5.0,
+                 max_connections: int = 256):
+
+        self.cli = cli
+        self.host = host
+        self.port = port
+        self.escalation_interval = escalation_interval
+        self.save_interval = save_interval
+        self.commands = BatchCommandRunner(cli, output=io.StringIO(), allow_profile=False)
+        self._mutations: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._connections = asyncio.Semaphore(max_connections)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._tasks = []
+        self._unsaved_changes = 0
+        self._last_save = time.monotonic()
+
+    async def start(self) -> None:
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_LINE_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [
+            asyncio.create_task(self._writer()),
+            asyncio.create_task(self._escalation_ticker()),
+        ]
+
+    async def serve_forever(self) -> None:
+
+        await self._server.serve_forever()
+
+    async def stop(self) -> None:
+
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        await self._mutations.join()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self._save()
+        await asyncio.to_thread(self.cli.close)
+
+    async def _save(self) -> None:
+
+        if self._unsaved_changes:
+            await asyncio.to_thread(self.cli.save_all_incidents)
+        self._unsaved_changes = 0
+        self._last_save = time.monotonic()
+
+    async def submit(self, operation: Callable[[], Dict]) -> Dict:
+
+        # Waits for a free queue slot first: this is where backpressure reaches the caller.
+        future = asyncio.get_running_loop().create_future()
+        await self._mutations.put((operation, future))
+        return await future
+
+    async def _writer(self) -> None:
+
+        while True:
+            operation, future = await self._mutations.get()
+            try:
+                result = operation()
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if result:
+                    self._unsaved_changes += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._mutations.task_done()
+
+            # Journal and SQLite saves only flush, so they run whenever the queue drains;
+            # the plain JSON file is rewritten at most once per save interval.
+            if self._mutations.empty() and (self.cli.storage.journaled or time.monotonic() - self._last_save >= self.save_interval):
+                # A failed save keeps the changes counted as unsaved, so the next drain retries it.
+                try:
+                    await self._save()
+                except Exception as error:
+                    print(f"Warning: saving incidents failed: {error}", file=sys.stderr)
+
+    def _escalate(self) -> Dict:
+
+        escalations_made = self.cli.run_escalation_process()
+        return {"escalated": escalations_made} if escalations_made else {}
+
+    async def _escalation_ticker(self) -> None:
+
+        while True:
+            await asyncio.sleep(self.escalation_interval)
+            # The writer saves once the queue drains after the tick, if the save interval has passed.
+            try:
+                await self.submit(self._escalate)
+            except Exception as error:
+                print(f"Warning: escalation tick failed: {error}", file=sys.stderr)
+
+    async def handle_command(self, command: Dict) -> Dict:
+
+        try:
+            if not isinstance(command, dict):
+                raise BatchCommandError("Each line must be a JSON object.")
+            if command.get("op") in READ_OPERATIONS:
+                result = await asyncio.to_thread(self.commands.execute, command)
+            else:
+                result = await self.submit(lambda: self.commands.execute(command))
+            response = {"ok": True, **result}
+        except (BatchCommandError, IncidentOperationError) as error:
+            response = {"ok": False, "error": str(error)}
+        except Exception as error:
+            # Anything else is a bug, but it fails this command only, not the connection.
+            response = {"ok": False, "error": f"Internal error: {type(error).__name__}: {error}"}
+        if isinstance(command, dict) and "request_id" in command:
+            response["request_id"] = command["request_id"]
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+
+        if self._connections.locked():
+            writer.write(b'{"ok": false, "error": "Server busy. Too many connections."}\n')
+            await writer.drain()
+            writer.close()
+            return
+
+        async with self._connections:
+            self._writers.add(writer)
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        command = json.loads(line)
+                    except (ValueError, RecursionError) as error:
+                        # Malformed JSON, bytes that are not UTF-8, or nesting too deep for the parser.
+                        response = {"ok": False, "error": f"Invalid JSON: {error}"}
+                    else:
+                        response = await self.handle_command(command)
+                    try:
+                        payload = json.dumps(response)
+                    except (TypeError, ValueError) as error:
+                        payload = json.dumps({"ok": False, "error": f"Internal error: {error}", "request_id": response.get("request_id")})
+                    writer.write(payload.encode("utf-8") + b"\n")
+                    await writer.drain()
+            except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                pass
+            finally:
+                self._writers.discard(writer)
+                writer.close()
+                with contextlib.suppress(ConnectionError):
+                    await writer.wait_closed()
+
+
+async def serve(cli: IncidentCLI, host: str, port: int, **options) -> None:
+
+    server = IncidentServer(cli, host, port, **options)
+    await server.start()
+    print(f"✔ Serving incidents on {server.host}:{server.port}", flush=True)
+
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal_number, stop_requested.set)
+
+    serving = asyncio.create_task(server.serve_forever())
+    await stop_requested.wait()
+    serving.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await serving
+    await server.stop()
+    print("✔ All incidents saved successfully.")
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Serve the incident system as JSON lines over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--queue-size", type=int, default=1024, help="Mutations waiting for the writer before clients are held back.")
+    parser.add_argument("--escalation-interval", type=float, default=1.0, help="Seconds between escalation ticks.")
+    parser.add_argument("--save-interval", type=float, default=5.0, help="Seconds between rewrites of the plain JSON file.")
+    parser.add_argument("--max-connections", type=int, default=256)
+    args = parser.parse_args()
+
+    metrics_file = enable_metrics_from_environment()
+    storage_backend = os.environ.get("INCIDENT_STORAGE_BACKEND", "json")
+    event_directory = os.environ.get("INCIDENT_EVENT_LOG")
+    rules = RulesEngine(os.environ.get("INCIDENT_RULES_FILE", DEFAULT_RULES_FILE))
+    cli = IncidentCLI(create_storage_handler(storage_backend), event_log=EventLog(event_directory) if event_directory else None,
+                      rules=rules, fast_start=os.environ.get("INCIDENT_FAST_START", "0") == "1")
+    try:
+        asyncio.run(serve(
+            cli, args.host, args.port,
+            queue_size=args.queue_size,
+            escalation_interval=args.escalation_interval,
+            save_interval=args.save_interval,
+            max_connections=args.max_connections
+        ))
+    finally:
+        if metrics_file:
+            METRICS.write_prometheus_file(metrics_file)
\ No newline at end of file
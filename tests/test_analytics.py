@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+from core.analytics import IncidentAnalytics, QuantileSketch, TimeRollup
+from incident.models import Incident
+
+
+def _resolved(number: int, hours: float) -> Incident:
+
+    created_at = datetime(2024, 3, 1, 9) + timedelta(hours=number)
+    return Incident(
+        id=str(number).zfill(3), incident_type="security", priority_level="high", description=f"incident {number}",
+        created_at=created_at, assigned_operator="alice", status="resolved", version=3,
+        assigned_at=created_at + timedelta(minutes=5), resolved_at=created_at + timedelta(hours=hours)
+    )
+
+
+def test_latest_returns_nothing_for_a_non_positive_count():
+
+    rollup = TimeRollup(timedelta(hours=1), retention=10)
+    for hour in range(5):
+        rollup.bucket(datetime(2024, 3, 1, hour))
+    assert rollup.latest(0) == []
+    assert rollup.latest(-2) == []
+    assert [start.hour for start, _ in rollup.latest(2)] == [3, 4]
+
+
+def test_dashboard_with_zero_windows_has_no_rollups():
+
+    analytics = IncidentAnalytics.from_incidents(_resolved(number, hours=number % 6 + 1) for number in range(1, 13))
+    dashboard = analytics.dashboard(hours=0, days=0)
+    assert dashboard["hourly"] == [] and dashboard["daily"] == []
+    assert dashboard["overall"]["resolved"] == 12
+    # High priority allows four hours, so runs of five and six hours breach it.
+    assert dashboard["overall"]["sla_breaches"] == 4
+
+
+def test_quantile_sketch_stays_within_its_relative_accuracy():
+
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    values = [float(value) for value in range(1, 10001)]
+    for value in values:
+        sketch.add(value)
+    for fraction in (0.5, 0.9, 0.99):
+        exact = values[int(fraction * (len(values) - 1))]
+        assert abs(sketch.quantile(fraction) - exact) <= exact * 0.01
\ No newline at end of file
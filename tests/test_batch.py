@@ -0,0 +1,104 @@
+import contextlib
+import io
+import json
+import pytest
+from cli.batch import BatchCommandRunner, run_batch
+from cli.interface import IncidentCLI
+from main import run_batch_mode
+from persistence.journal import JournaledIncidentStorageHandler
+from persistence.storage import IncidentStorageHandler
+
+
+def _cli(file_path: str) -> IncidentCLI:
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return IncidentCLI(IncidentStorageHandler(file_path))
+
+
+def _run(cli: IncidentCLI, commands) -> list:
+
+    output = io.StringIO()
+    run_batch(cli, [json.dumps(command) if not isinstance(command, str) else command for command in commands], output=output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_batch_commands_are_saved_and_reloaded(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    cli = _cli(file_path)
+    results = _run(cli, [
+        {"op": "create", "incident_type": "security", "priority_level": "high", "description": "breach"},
+        {"op": "create", "incident_type": "application", "priority_level": "low", "description": "slow page",
+         "created_at": "2024-03-01T09:00:00+00:00"},
+        {"op": "assign", "id": "1"},
+        {"op": "resolve", "id": "001", "version": 2},
+        {"op": "query", "status": "resolved"},
+    ])
+    cli.close()
+    assert [incident["id"] for incident in results[-1]["incidents"]] == ["001"]
+
+    reloaded = _cli(file_path)
+    assert [(incident.id, incident.status) for incident in reloaded.query_incidents()] == [("001", "resolved"), ("002", "escalated")]
+    reloaded.close()
+
+
+@pytest.mark.parametrize("command", [
+    {"op": "query", "text": 123},
+    {"op": "query", "operator": ["x"]},
+    {"op": "query", "status": ["pending"]},
+    {"op": "query", "page_size": True},
+    {"op": "query", "limit": "10"},
+    {"op": "query", "page_size": 2, "resume_token": 5},
+    {"op": "query", "start": "2020-01-01", "page_size": 2, "resume_token": "WzEsIjAwMSJd"},
+    {"op": "assign", "id": "001", "operator": {"name": "x"}},
+    {"op": "analytics", "hours": 1.5},
+    {"op": ["create"]},
+    {"op": "create", "incident_type": "security", "priority_level": "high", "description": "x", "profile": "report.txt"},
+    "[1, 2]",
+    "{not json",
+])
+def test_a_bad_command_fails_alone_and_the_batch_is_still_saved(tmp_path, command):
+
+    file_path = str(tmp_path / "incidents.json")
+    cli = _cli(file_path)
+    create = {"op": "create", "incident_type": "security", "priority_level": "high", "description": "kept"}
+    results = _run(cli, [create, create, command, create])
+    cli.close()
+
+    assert len(results) == 1 and results[0]["line"] == 3
+    assert not results[0]["error"].startswith("Internal error")
+    assert not (tmp_path / "report.txt").exists()
+    reloaded = _cli(file_path)
+    assert [incident.id for incident in reloaded.query_incidents()] == ["001", "002", "003"]
+    reloaded.close()
+
+
+def test_unexpected_errors_fail_only_their_command(tmp_path):
+
+    cli = _cli(str(tmp_path / "incidents.json"))
+    runner = BatchCommandRunner(cli, output=io.StringIO())
+
+    def broken(command):
+        raise KeyError("boom")
+
+    runner._handlers["query"] = broken
+    assert runner.apply(1, '{"op": "query"}') == {"line": 1, "error": "Internal error: KeyError: 'boom'"}
+    cli.close()
+
+def test_journaled_batch_runs_leave_a_complete_json_file(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    source = tmp_path / "commands.ndjson"
+    source.write_text("\n".join(
+        json.dumps({"op": "create", "incident_type": "security", "priority_level": "high", "description": f"incident {number}"})
+        for number in range(50)
+    ), encoding="utf-8")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(JournaledIncidentStorageHandler(file_path, compact_every=20))
+    with contextlib.redirect_stderr(io.StringIO()):
+        run_batch_mode(cli, str(source), batch_size=7, compact_journal=True)
+
+    assert not [path.name for path in tmp_path.iterdir() if ".journal." in path.name]
+    reloaded = _cli(file_path)
+    assert len(reloaded.query_incidents()) == 50
+    reloaded.close()
\ No newline at end of file
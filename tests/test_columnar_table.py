@@ -0,0 +1,70 @@
+import contextlib
+import io
+import shutil
+from datetime import datetime, timedelta
+import pytest
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from cli.interface import IncidentCLI
+from persistence.storage import IncidentStorageHandler
+
+pytest.importorskip("numpy")
+
+
+def _pages(cli: IncidentCLI, **filters) -> list:
+
+    incidents, token = [], None
+    while True:
+        page = cli.page_incidents(page_size=23, resume_token=token, **filters)
+        incidents += [(incident.id, incident.status, incident.version, incident.assigned_operator) for incident in page.incidents]
+        token = page.next_token
+        if token is None:
+            return incidents
+
+
+def test_table_queries_match_the_index(tmp_path):
+
+    # Separate archives, so both sessions draw the same incident IDs.
+    plain_path, table_path = str(tmp_path / "plain.json"), str(tmp_path / "table.json")
+    IncidentStorageHandler(plain_path).save_all_incidents_to_json(generate_incidents(WorkloadSpec(count=500, seed=5)))
+    shutil.copy(plain_path, table_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = IncidentCLI(IncidentStorageHandler(plain_path))
+        table = IncidentCLI(IncidentStorageHandler(table_path), use_columnar_table=True)
+    assert table.table is not None
+    for cli in (plain, table):
+        for number in range(30):
+            incident = cli.create_incident("security", "high", f"new {number}", created_at=datetime(2024, 1, 1) + timedelta(hours=number * 7))
+            if number % 3 == 0:
+                cli.assign_incident(incident.id)
+
+    operator = next(incident.assigned_operator for incident in plain.index if incident.assigned_operator)
+    for filters in (dict(status="pending"), dict(status="resolved"), dict(operator_name=operator),
+                    dict(status="in_progress", operator_name=operator), dict(start_date=datetime(2024, 1, 3)),
+                    dict(start_date=datetime(2023, 1, 1), end_date=datetime(2024, 1, 5), status="pending")):
+        assert _pages(table, **filters) == _pages(plain, **filters)
+
+    outputs = []
+    for cli in (plain, table):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cli.show_pending_incidents_by_priority(limit=10, offset=3)
+            cli.show_resolvable_incidents(limit=3)
+        outputs.append(output.getvalue())
+    assert outputs[0] == outputs[1]
+    plain.close()
+    table.close()
+
+def test_table_keeps_irregular_ids_and_seeds_types_from_the_rules():
+
+    from incident.models import Incident
+    from incident.table import IncidentTable
+
+    created_at = datetime(2024, 1, 1)
+    incidents = [
+        Incident(incident_id, "network", "High", "link down", created_at, None, "pending")
+        for incident_id in ("007", "7", "1234", "web-1")
+    ]
+    table = IncidentTable.from_incidents(incidents, ("database", "network"))
+
+    assert table.types.values[1:] == ["database", "network"]
+    assert [table.incident_at(row) for row in range(len(table))] == incidents
\ No newline at end of file
@@ -0,0 +1,23 @@
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from incident.compact import FlyweightPool, compact_incident_from_dict
+from incident.models import incident_to_dict
+
+
+def test_compact_incidents_accept_rule_defined_values():
+
+    pool = FlyweightPool()
+    items = [incident_to_dict(incident) for incident in generate_incidents(WorkloadSpec(count=50, seed=3))]
+    for number, item in enumerate(items):
+        item["incident_type"] = f"type-{number % 7}"
+    compact = [compact_incident_from_dict(item, pool) for item in items]
+
+    assert [incident.incident_type for incident in compact] == [item["incident_type"] for item in items]
+    # Equal values share one string object.
+    assert compact[0].incident_type is compact[7].incident_type
+    assert compact[0].status is next(incident.status for incident in compact[1:] if incident.status == compact[0].status)
+
+def test_compact_incidents_keep_non_numeric_ids():
+
+    item = incident_to_dict(generate_incidents(WorkloadSpec(count=1, seed=3))[0])
+    item["id"] = "INC-7"
+    assert compact_incident_from_dict(item, FlyweightPool()).id == "INC-7"
\ No newline at end of file
@@ -0,0 +1,68 @@
+import json
+import threading
+from benchmarks.concurrent_writers import find_lost_updates, run_processes
+from cli.interface import ID_BLOCK_SIZE, IncidentCLI
+from persistence.storage import IncidentStorageHandler
+
+
+def test_concurrent_writers_lose_no_acknowledged_update(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    totals = run_processes(file_path, processes=3, threads=2, operations=40, save_every=4, seed=3)
+
+    acknowledged = [record for total in totals for record in total["acknowledged"]]
+    assert acknowledged
+    assert find_lost_updates(file_path, acknowledged) == []
+    with open(file_path, "r", encoding="utf-8") as file:
+        stored_ids = [item["id"] for item in json.load(file)]
+    assert len(stored_ids) == len(set(stored_ids))
+
+def test_each_process_reserves_ids_in_blocks(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    first, second = IncidentCLI(IncidentStorageHandler(file_path)), IncidentCLI(IncidentStorageHandler(file_path))
+    reservations = []
+    reserve = first.storage.reserve_incident_ids
+    first.storage.reserve_incident_ids = lambda minimum, count=1: reservations.append(count) or reserve(minimum, count)
+
+    created = [first.create_incident("security", "High", "first").id for _ in range(ID_BLOCK_SIZE + 1)]
+    created.append(second.create_incident("security", "High", "second").id)
+
+    assert reservations == [ID_BLOCK_SIZE, ID_BLOCK_SIZE]
+    assert len(created) == len(set(created))
+
+
+class BlockingStorage(IncidentStorageHandler):
+
+    def __init__(self, file_path):
+
+        super().__init__(file_path)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def merge_and_save(self, incidents, base_versions):
+
+        self.writing.set()
+        self.release.wait(timeout=10)
+        return super().merge_and_save(incidents, base_versions)
+
+
+def test_transitions_carry_on_while_a_save_writes(tmp_path):
+
+    storage = BlockingStorage(str(tmp_path / "incidents.json"))
+    cli = IncidentCLI(storage)
+    saved = cli.create_incident("security", "High", "saved first")
+    saver = threading.Thread(target=cli.save_all_incidents)
+    saver.start()
+    assert storage.writing.wait(timeout=10)
+
+    created_meanwhile = cli.create_incident("security", "High", "created during the save")
+    storage.release.set()
+    saver.join(timeout=10)
+
+    assert cli.index.get(created_meanwhile.id) is not None
+    with open(storage.file_path, "r", encoding="utf-8") as file:
+        assert [item["id"] for item in json.load(file)] == [saved.id]
+    cli.save_all_incidents()
+    with open(storage.file_path, "r", encoding="utf-8") as file:
+        assert sorted(item["id"] for item in json.load(file)) == [saved.id, created_meanwhile.id]
\ No newline at end of file
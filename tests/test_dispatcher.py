@@ -0,0 +1,54 @@
+from collections import Counter
+from datetime import datetime
+from core.dispatcher import IncidentDispatcher
+from core.validator import IncidentAssignmentValidator
+from incident.models import Incident
+
+
+RULES = {"security": {"alice", "bob", "carol"}, "application": {"bob"}}
+
+
+def _dispatcher(**options) -> IncidentDispatcher:
+
+    return IncidentDispatcher({"alice", "bob", "carol"}, IncidentAssignmentValidator(RULES), **options)
+
+
+def _incident(number: int, incident_type: str = "security", priority_level: str = "low", status: str = "pending") -> Incident:
+
+    return Incident(f"{number:03d}", incident_type, priority_level, "x", datetime(2024, 1, 1), None, status)
+
+
+def test_the_least_loaded_eligible_operator_is_picked():
+
+    dispatcher = _dispatcher()
+    assert dispatcher.select_operator(_incident(1)) == "alice"
+    assert dispatcher.assign_incident_to_operator(_incident(1), "alice").assigned_operator == "alice"
+    assert dispatcher.select_operator(_incident(2)) == "bob"
+    assert dispatcher.select_operator(_incident(3, "application")) == "bob"
+    assert dispatcher.select_operator(_incident(4, "hardware")) is None
+    assert dispatcher.assign_incident_to_operator(_incident(5, "application"), "alice") is None
+
+
+def test_assign_many_spreads_load_and_stops_at_capacity():
+
+    dispatcher = _dispatcher(default_max_load=2)
+    incidents = [_incident(number) for number in range(7)] + [_incident(7, status="resolved")]
+    assigned = dispatcher.assign_many(incidents)
+
+    assert len(assigned) == 6
+    assert Counter(incident.assigned_operator for incident in assigned) == {"alice": 2, "bob": 2, "carol": 2}
+    assert all(incident.status == "in_progress" and incident.version == 1 for incident in assigned)
+    assert dispatcher.select_operator(_incident(8)) is None
+
+
+def test_weighted_incidents_go_to_an_operator_with_room_for_them():
+
+    dispatcher = _dispatcher(max_load_per_operator={"alice": 3}, default_max_load=2, priority_weights={"high": 2})
+    assigned = dispatcher.assign_many([_incident(1), _incident(2), _incident(3), _incident(4, priority_level="high")])
+
+    # Everyone holds one low incident; only alice's limit of 3 leaves room for a high one.
+    assert [incident.assigned_operator for incident in assigned] == ["alice", "bob", "carol", "alice"]
+    assert dispatcher.operator_loads == {"alice": 3, "bob": 1, "carol": 1}
+
+    dispatcher.release_assignment(assigned[-1])
+    assert dispatcher.operator_loads["alice"] == 1
\ No newline at end of file
@@ -0,0 +1,70 @@
+import dataclasses
+import threading
+from datetime import datetime
+import pytest
+from incident.models import Incident
+from logs.events import EventLog
+from logs.instrumentation import EVENTS_DROPPED
+from logs.metrics import METRICS
+
+
+def _incident(number: int) -> Incident:
+
+    return Incident(id=str(number).zfill(3), incident_type="security", priority_level="high",
+                    description=f"incident {number}", created_at=datetime(2024, 3, 1, 9),
+                    assigned_operator=None, status="pending")
+
+
+def test_dropped_events_are_counted_and_reported_on_close(tmp_path, monkeypatch, capsys):
+
+    # The writer takes the first event and then stalls, so the ring fills behind it.
+    taken = threading.Event()
+    release = threading.Event()
+    write_batch = EventLog._write_batch
+
+    def stalled_write_batch(self, batch):
+
+        taken.set()
+        release.wait(5)
+        write_batch(self, batch)
+
+    monkeypatch.setattr(EventLog, "_write_batch", stalled_write_batch)
+    monkeypatch.setattr(METRICS, "enabled", True)
+    before = METRICS.counter_value(EVENTS_DROPPED)
+
+    log = EventLog(str(tmp_path), capacity=4, flush_batch=1, flush_interval=0.01)
+    log.record("create", _incident(0))
+    assert taken.wait(5)
+    for number in range(1, 8):
+        log.record("create", _incident(number))
+    release.set()
+    log.close()
+
+    assert log.dropped == 3
+    assert METRICS.counter_value(EVENTS_DROPPED) - before == 3
+    assert "dropped 3 events" in capsys.readouterr().err
+
+def test_timelines_find_non_ascii_ids(tmp_path):
+
+    log = EventLog(str(tmp_path))
+    incident = dataclasses.replace(_incident(1), id="café-1")
+    log.record("create", incident)
+    log.record("create", _incident(2))
+    log.record("assign", dataclasses.replace(incident, status="in_progress", assigned_operator="zoë"))
+
+    assert [(event["action"], event["operator"]) for event in log.timeline("café-1")] == [("create", None), ("assign", "zoë")]
+    log.close()
+
+
+def test_retention_keeps_the_newest_segments(tmp_path):
+
+    with pytest.raises(ValueError):
+        EventLog(str(tmp_path), max_segments=0)
+
+    log = EventLog(str(tmp_path), flush_batch=1, segment_bytes=1, max_segments=2)
+    for number in range(1, 6):
+        log.record("create", _incident(number))
+        log.flush()
+    assert log.segment_numbers() == [4, 5]
+    assert [event["incident_id"] for event in log.iter_events()] == ["004", "005"]
+    log.close()
\ No newline at end of file
@@ -0,0 +1,138 @@
+import contextlib
+import io
+import random
+from datetime import datetime, timedelta
+import pytest
+from cli.interface import IncidentCLI
+from incident.indexes import id_key
+from incident.pagination import decode_resume_token, encode_resume_token
+from incident.sorted_blocks import SortedBlockList
+from persistence.storage import IncidentStorageHandler
+
+
+@pytest.fixture
+def cli(tmp_path):
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        session = IncidentCLI(IncidentStorageHandler(str(tmp_path / "incidents.json")))
+    yield session
+    session.close()
+
+
+def test_index_stays_consistent_through_the_lifecycle(cli):
+
+    rng = random.Random(4)
+    for number in range(60):
+        created_at = datetime.now() - timedelta(days=2) if number % 4 == 0 else None
+        cli.create_incident(rng.choice(("infrastructure", "application", "security")), rng.choice(("low", "medium", "high")),
+                            f"incident {number}", created_at=created_at)
+    for incident in list(cli.page_incidents(status="pending", page_size=30).incidents):
+        cli.assign_incident(incident.id)
+    assert cli.run_escalation_process() > 0
+    for incident in list(cli.page_incidents(status="escalated", page_size=100).incidents)[::2]:
+        cli.resolve_incident(incident.id)
+    for incident in list(cli.page_incidents(status="in_progress", page_size=100).incidents)[::3]:
+        cli.resolve_incident(incident.id)
+
+    assert cli.check_index_consistency() == []
+    statuses = {incident.status for incident in cli.page_incidents(page_size=100).incidents}
+    assert statuses == {"pending", "in_progress", "escalated", "resolved"}
+
+
+def test_sorted_block_list_matches_a_sorted_list():
+
+    rng = random.Random(9)
+    values = SortedBlockList(block_size=8)
+    expected = []
+    for _ in range(2000):
+        value = rng.randrange(500)
+        if expected and rng.random() < 0.3:
+            value = rng.choice(expected)
+            values.remove(value)
+            expected.remove(value)
+        elif value not in expected:
+            values.add(value)
+            expected.append(value)
+    expected.sort()
+
+    assert list(values) == expected
+    assert len(values) == len(expected)
+    assert all(value in values for value in expected[::7])
+    assert list(values.islice(10, 40)) == expected[10:40]
+    assert list(values.irange(100, 200)) == [value for value in expected if 100 <= value <= 200]
+    assert list(values.irange(100, 200, include_minimum=False, include_maximum=False)) == [
+        value for value in expected if 100 < value < 200
+    ]
+
+
+def test_resume_tokens_round_trip_and_reject_garbage():
+
+    key = (datetime(2024, 5, 1, 12, 30, 15, 250), 42, "042")
+    assert decode_resume_token(encode_resume_token((42, "042"), "id"), "id") == (42, "042")
+    for token in ("not-a-token", "W10=", 123, encode_resume_token((), "id"), encode_resume_token((42, "042"), "created_at"),
+                  encode_resume_token(key, "id"), encode_resume_token((True, "042"), "id"), encode_resume_token(("042", 42), "id"),
+                  # An untagged token from before orderings were recorded.
+                  "WzEsIjAwMSJd"):
+        with pytest.raises(ValueError):
+            decode_resume_token(token, "id")
+
+
+def test_malformed_tokens_are_reported_as_invalid(cli):
+
+    for number in range(5):
+        cli.create_incident("security", "high", f"incident {number}")
+    with pytest.raises(ValueError, match="Invalid resume token"):
+        cli.page_incidents(start_date=datetime(2020, 1, 1), page_size=2, resume_token="WzEsIjAwMSJd")
+
+
+def test_date_range_pages_come_in_id_order_when_creation_times_are_not(cli):
+
+    # Back-dated creates give later IDs earlier creation times.
+    base = datetime(2024, 3, 1)
+    for number in range(1, 61):
+        cli.create_incident("security", "high", f"incident {number}", created_at=base + timedelta(hours=(number * 37) % 60))
+    for start, end in ((base, base + timedelta(hours=5)), (base, base + timedelta(days=3))):
+        seen, token = [], None
+        while True:
+            page = cli.page_incidents(start_date=start, end_date=end, page_size=4, resume_token=token)
+            seen += [incident.id for incident in page.incidents]
+            token = page.next_token
+            if token is None:
+                break
+        assert seen == [incident.id for incident in cli.query_incidents() if start <= incident.created_at <= end]
+
+
+def test_paging_resumes_after_the_last_incident_shown(cli):
+
+    for number in range(25):
+        cli.create_incident("security", "high", f"incident {number}")
+    first = cli.page_incidents(status="pending", page_size=10)
+    # Changes between pages neither repeat nor skip what is left.
+    cli.assign_incident(first.incidents[0].id)
+    cli.create_incident("security", "low", "late arrival")
+    seen = [incident.id for incident in first.incidents]
+    token = first.next_token
+    while token is not None:
+        page = cli.page_incidents(status="pending", page_size=10, resume_token=token)
+        seen += [incident.id for incident in page.incidents]
+        token = page.next_token
+
+    assert seen == sorted(seen, key=lambda incident_id: (int(incident_id), incident_id))
+    assert len(seen) == len(set(seen)) == 26
+    assert id_key(cli.page_incidents(status="pending", page_size=100).incidents[-1]) == (26, "026")
+
+
+def test_text_search_pages_resume_in_id_order(cli):
+
+    for number in range(1, 40):
+        cli.create_incident("application", "medium", f"disk {'full' if number % 3 else 'slow'} on host-{number}")
+    seen, token = [], None
+    while True:
+        page = cli.page_incidents(search_pattern=r"full", page_size=7, resume_token=token)
+        seen += [incident.id for incident in page.incidents]
+        token = page.next_token
+        if token is None:
+            break
+
+    assert seen == [incident.id for incident in cli.query_incidents(search_pattern=r"full")]
+    assert seen == sorted(seen, key=int) and len(seen) == 26
\ No newline at end of file
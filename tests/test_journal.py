@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+from datetime import datetime
+import pytest
+from cli.interface import IncidentCLI
+from incident.models import Incident, incident_to_dict
+from persistence.journal import JournaledIncidentStorageHandler
+
+
+def _cli(file_path: str) -> IncidentCLI:
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return IncidentCLI(JournaledIncidentStorageHandler(file_path))
+
+
+def _state(cli: IncidentCLI) -> list:
+
+    return [incident_to_dict(incident) for incident in cli.query_incidents()]
+
+
+def _session(file_path: str) -> list:
+
+    cli = _cli(file_path)
+    first = cli.create_incident("security", "high", "breach")
+    second = cli.create_incident("application", "low", "slow page")
+    cli.create_incident("infrastructure", "medium", "disk full")
+    cli.assign_incident(first.id)
+    cli.resolve_incident(first.id)
+    cli.assign_incident(second.id)
+    state = _state(cli)
+    cli.close()
+    return state
+
+
+def _segments(tmp_path) -> list:
+
+    return sorted(name for name in os.listdir(tmp_path) if ".journal." in name)
+
+
+def test_journaled_changes_survive_a_restart_without_a_save(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    expected = _session(file_path)
+    assert _segments(tmp_path)
+
+    reloaded = _cli(file_path)
+    assert _state(reloaded) == expected
+    reloaded.close()
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    expected = _session(file_path)
+    storage = JournaledIncidentStorageHandler(file_path)
+    storage.compact(wait=True)
+    storage.close()
+
+    assert _segments(tmp_path) == []
+    reloaded = _cli(file_path)
+    assert _state(reloaded) == expected
+    reloaded.close()
+
+
+def test_a_torn_record_at_the_tail_is_dropped(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    expected = _session(file_path)
+    with open(tmp_path / _segments(tmp_path)[-1], "a", encoding="utf-8") as file:
+        file.write('{"action": "create", "incident": {"id": "0')
+
+    reloaded = _cli(file_path)
+    assert _state(reloaded) == expected
+    reloaded.close()
+
+
+def test_unknown_actions_are_rejected(tmp_path):
+
+    storage = JournaledIncidentStorageHandler(str(tmp_path / "incidents.json"))
+    incident = Incident("001", "security", "high", "breach", datetime(2024, 1, 1), None, "pending")
+    with pytest.raises(ValueError):
+        storage.record_incident_change("delete", incident)
+    storage.close()
\ No newline at end of file
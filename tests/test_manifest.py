@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+from datetime import datetime
+import pytest
+from cli.interface import IncidentCLI
+from incident.models import Incident, incident_to_dict
+from persistence import manifest as manifest_module
+from persistence.journal import JournaledIncidentStorageHandler
+from persistence.manifest import manifest_path, read_manifest, write_manifest
+
+
+def _incident(number: int) -> Incident:
+
+    return Incident(f"{number:03d}", "security", "high", "breach", datetime(2024, 1, 1), None, "pending")
+
+
+def _cli(file_path: str) -> IncidentCLI:
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return IncidentCLI(JournaledIncidentStorageHandler(file_path), fast_start=True)
+
+
+def test_a_manifest_is_read_back_only_for_the_archive_it_describes(tmp_path):
+
+    file_path = str(tmp_path / "incidents.manifest.json")
+    write_manifest(file_path, 12, [_incident(3), _incident(11)], [[10, 20, 30], []])
+
+    manifest = read_manifest(file_path, [[10, 20, 30], []])
+    assert manifest.next_incident_id == 12
+    assert manifest.open_incidents == [_incident(3), _incident(11)]
+    assert read_manifest(file_path, [[10, 21, 30], []]) is None
+    assert read_manifest(str(tmp_path / "missing.json"), None) is None
+
+
+@pytest.mark.parametrize("content", [
+    "{broken",
+    "[]",
+    json.dumps({"version": 0, "next_incident_id": 2, "fingerprint": None, "open_incidents": []}),
+    json.dumps({"version": manifest_module.MANIFEST_VERSION, "fingerprint": None, "open_incidents": []}),
+    json.dumps({"version": manifest_module.MANIFEST_VERSION, "next_incident_id": "x", "fingerprint": None, "open_incidents": []}),
+    json.dumps({"version": manifest_module.MANIFEST_VERSION, "next_incident_id": 2, "fingerprint": None, "open_incidents": [{}]}),
+])
+def test_a_damaged_or_outdated_manifest_is_ignored(tmp_path, content):
+
+    file_path = tmp_path / "incidents.manifest.json"
+    file_path.write_text(content, encoding="utf-8")
+    assert read_manifest(str(file_path), None) is None
+
+
+def test_fast_start_resumes_from_the_manifest_and_loads_history_later(tmp_path, monkeypatch):
+
+    file_path = str(tmp_path / "incidents.json")
+    cli = _cli(file_path)
+    first = cli.create_incident("security", "high", "breach")
+    cli.create_incident("application", "low", "slow page")
+    cli.assign_incident(first.id)
+    cli.resolve_incident(first.id)
+    expected = [incident_to_dict(incident) for incident in cli.query_incidents()]
+    cli.close()
+
+    used = []
+    read = manifest_module.read_manifest
+    monkeypatch.setattr("cli.interface.read_manifest", lambda *args: used.append(read(*args)) or used[-1])
+    reloaded = _cli(file_path)
+    assert [incident.id for incident in used[0].open_incidents] == ["002"]
+    assert [incident_to_dict(incident) for incident in reloaded.query_incidents()] == expected
+    assert reloaded.create_incident("security", "low", "next").id == "003"
+    reloaded.close()
+
+
+def test_a_change_made_without_fast_start_retires_the_manifest(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    cli = _cli(file_path)
+    cli.create_incident("security", "high", "breach")
+    cli.close()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = IncidentCLI(JournaledIncidentStorageHandler(file_path))
+    plain.create_incident("application", "low", "slow page")
+    plain.close()
+
+    storage = JournaledIncidentStorageHandler(file_path)
+    assert read_manifest(manifest_path(file_path), storage.fingerprint()) is None
+    storage.close()
+    reloaded = _cli(file_path)
+    assert [incident.id for incident in reloaded.query_incidents()] == ["001", "002"]
+    reloaded.close()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import contextlib
+import io
+import shutil
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from cli.interface import IncidentCLI
+from incident.filters import filter_incidents_by_text
+from incident.parallel import ParallelQueryEngine
+from persistence.storage import IncidentStorageHandler
+
+
+def test_engine_matches_a_single_process_scan():
+
+    incidents = generate_incidents(WorkloadSpec(count=3000, seed=2))
+    with ParallelQueryEngine(incidents, workers=2) as engine:
+        for pattern in (r"(\w+)\s+\1", r"host-1\d\b", "lag"):
+            assert [incident.id for incident in engine.filter_by_text(pattern)] == [
+                incident.id for incident in filter_incidents_by_text(incidents, pattern)
+            ]
+
+
+def test_parallel_sessions_answer_text_searches_like_serial_ones(tmp_path):
+
+    serial_path, parallel_path = str(tmp_path / "serial.json"), str(tmp_path / "parallel.json")
+    IncidentStorageHandler(serial_path).save_all_incidents_to_json(generate_incidents(WorkloadSpec(count=3000, seed=2)))
+    shutil.copy(serial_path, parallel_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial = IncidentCLI(IncidentStorageHandler(serial_path))
+        parallel = IncidentCLI(IncidentStorageHandler(parallel_path), parallel_workers=2)
+
+    # The first pattern can only be scanned; the others are narrowed by the text index.
+    assert not parallel.index.narrows_text_search(r"(\w+)\s+\1")
+    assert parallel.index.narrows_text_search(r"\bdatabase\b.*lag")
+    for pattern in (r"(\w+)\s+\1", r"\bdatabase\b.*lag", "host-00[1-3]"):
+        assert [incident.id for incident in parallel.query_incidents(search_pattern=pattern)] == [
+            incident.id for incident in serial.query_incidents(search_pattern=pattern)
+        ]
+    assert parallel.parallel_engine is not None
+    serial.close()
+    parallel.close()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import os
+import pytest
+from cli.interface import IncidentCLI, IncidentOperationError
+from persistence.storage import IncidentStorageHandler
+from rules.default_rules import INCIDENT_TYPE_ROLE_RULES
+from rules.engine import CompiledRules, RuleFileError, RulesEngine, load_rules_file, write_rules_file
+
+
+def _write(file_path: str, rules, step: int) -> None:
+
+    write_rules_file(file_path, rules)
+    # Move the mtime on explicitly: two writes can land within the file system's timestamp resolution.
+    os.utime(file_path, ns=(step * 10 ** 9, step * 10 ** 9))
+
+
+def test_compiled_rules_normalize_names_and_answer_both_directions():
+
+    compiled = CompiledRules({" Security ": ["Carol", "alice ", "carol"], "network": []})
+
+    assert compiled.incident_types == ("network", "security")
+    assert compiled.eligible_by_type == {"network": (), "security": ("alice", "carol")}
+    assert compiled.operators == ("alice", "carol")
+    assert compiled.allows("alice", "security") and not compiled.allows("alice", "network")
+    assert not compiled.allows("dave", "security")
+    with pytest.raises(RuleFileError):
+        CompiledRules({"security": ["  "]})
+    with pytest.raises(RuleFileError):
+        CompiledRules({"security": [7]})
+
+
+@pytest.mark.parametrize("content", [b"{not json", b'["security"]', b'{"security": "alice"}', b"\xff\xfe", b"[" * 100000])
+def test_malformed_rule_files_raise_rule_file_error(tmp_path, content):
+
+    file_path = tmp_path / "rules.json"
+    file_path.write_bytes(content)
+    with pytest.raises(RuleFileError):
+        load_rules_file(str(file_path))
+
+
+def test_the_engine_reloads_changed_files_and_keeps_the_last_good_rules(tmp_path, capsys):
+
+    file_path = str(tmp_path / "rules.json")
+    engine = RulesEngine(file_path, check_interval=0)
+    assert engine.compiled.rules_by_type() == {name: sorted(names) for name, names in INCIDENT_TYPE_ROLE_RULES.items()}
+
+    _write(file_path, {"security": ["dave"]}, 1)
+    assert engine.refresh()
+    assert engine.compiled.rules_by_type() == {"security": ["dave"]}
+    assert not engine.refresh()
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("{broken")
+    os.utime(file_path, ns=(2 * 10 ** 9, 2 * 10 ** 9))
+    assert not engine.refresh()
+    assert engine.compiled.rules_by_type() == {"security": ["dave"]}
+    assert engine.last_error and "Keeping the previous assignment rules" in capsys.readouterr().err
+
+    _write(file_path, {"security": ["erin"]}, 3)
+    assert engine.refresh() and engine.last_error is None
+
+
+def test_the_cli_picks_up_new_operators_and_types(tmp_path):
+
+    rules_path = str(tmp_path / "rules.json")
+    _write(rules_path, {"security": ["carol"]}, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(IncidentStorageHandler(str(tmp_path / "incidents.json")), rules=RulesEngine(rules_path, check_interval=0))
+    incident = cli.create_incident("database", "high", "replica lag")
+    with pytest.raises(IncidentOperationError):
+        cli.assign_incident(incident.id)
+
+    _write(rules_path, {"security": ["carol"], "database": ["dave"]}, 2)
+    assert cli.refresh_rules()
+    assert cli.assign_incident(incident.id).assigned_operator == "dave"
+    cli.close()
\ No newline at end of file
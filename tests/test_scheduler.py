@@ -0,0 +1,60 @@
+import contextlib
+import io
+from datetime import datetime, timedelta
+from cli.interface import IncidentCLI
+from core.escalator import IncidentEscalator
+from core.scheduler import EscalationScheduler
+from incident.models import Incident
+from persistence.storage import IncidentStorageHandler
+
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+def _incident(incident_id: str, minutes_ago: int = 0) -> Incident:
+
+    return Incident(incident_id, "security", "high", "breach", START - timedelta(minutes=minutes_ago), None, "pending")
+
+
+def test_due_incidents_pop_in_deadline_order_once_the_threshold_is_exceeded():
+
+    scheduler = EscalationScheduler(IncidentEscalator(10))
+    for incident in (_incident("001", 5), _incident("002", 20), _incident("003", 15), _incident("004")):
+        scheduler.schedule(incident)
+
+    # Exactly at the threshold is not yet overdue.
+    assert scheduler.pop_due(START + timedelta(minutes=5)) == ["002", "003"]
+    assert scheduler.pop_due(START + timedelta(minutes=5, seconds=1)) == ["001"]
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(START + timedelta(hours=1)) == ["004"]
+    assert scheduler.pop_due(START + timedelta(hours=1)) == []
+
+
+def test_cancelled_and_rescheduled_incidents_are_not_popped_twice():
+
+    scheduler = EscalationScheduler(IncidentEscalator(10))
+    for number in range(200):
+        scheduler.schedule(_incident(f"{number:03d}", 20))
+    for number in range(1, 200):
+        scheduler.cancel(f"{number:03d}")
+    scheduler.schedule(_incident("000"))
+
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(START) == []
+    assert scheduler.pop_due(START + timedelta(minutes=11)) == ["000"]
+
+
+def test_the_cli_escalates_only_overdue_open_incidents(tmp_path):
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(IncidentStorageHandler(str(tmp_path / "incidents.json")))
+        overdue = cli.create_incident("security", "high", "old", created_at=datetime.now() - timedelta(minutes=5))
+        resolved = cli.create_incident("security", "high", "done", created_at=datetime.now() - timedelta(minutes=5))
+        cli.assign_incident(resolved.id)
+        cli.resolve_incident(resolved.id)
+        recent = cli.create_incident("security", "high", "new")
+
+        assert cli.run_escalation_process() == 1
+        assert cli.run_escalation_process() == 0
+    assert [cli.index.get(incident.id).status for incident in (overdue, resolved, recent)] == ["escalated", "resolved", "pending"]
+    cli.close()
\ No newline at end of file
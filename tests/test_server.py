@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+import io
+import json
+import threading
+from typing import Dict, List
+from cli.interface import IncidentCLI
+from persistence.storage import IncidentStorageHandler
+from service.server import MAX_LINE_BYTES, IncidentServer
+
+
+def _run(tmp_path, commands: List[Dict]) -> List[Dict]:
+
+    async def session() -> List[Dict]:
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli = IncidentCLI(IncidentStorageHandler(str(tmp_path / "incidents.json")))
+        server = IncidentServer(cli, port=0)
+        await server.start()
+        try:
+            return [await server.handle_command(command) for command in commands]
+        finally:
+            await server.stop()
+
+    return asyncio.run(session())
+
+
+def test_profile_is_rejected_over_the_network(tmp_path):
+
+    target = tmp_path / "report.txt"
+    responses = _run(tmp_path, [
+        {"op": "query", "profile": str(target), "request_id": 1},
+        {"op": "query", "profile": True},
+        {"op": "create", "incident_type": "security", "priority_level": "high", "description": "x", "profile": True},
+    ])
+    assert [response["ok"] for response in responses] == [False, False, False]
+    assert responses[0]["request_id"] == 1
+    assert not target.exists()
+
+class SlowSavingStorage(IncidentStorageHandler):
+
+    def __init__(self, file_path):
+
+        super().__init__(file_path)
+        self.saving = threading.Event()
+        self.release = threading.Event()
+        self.saved = threading.Event()
+
+    def merge_and_save(self, incidents, base_versions):
+
+        self.saving.set()
+        self.release.wait(timeout=10)
+        try:
+            return super().merge_and_save(incidents, base_versions)
+        finally:
+            self.saved.set()
+
+
+def test_queries_are_answered_while_the_archive_is_saved(tmp_path):
+
+    async def session() -> Dict:
+
+        storage = SlowSavingStorage(str(tmp_path / "incidents.json"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli = IncidentCLI(storage)
+        server = IncidentServer(cli, port=0, save_interval=0)
+        await server.start()
+        try:
+            created = await server.handle_command({"op": "create", "incident_type": "security", "priority_level": "high", "description": "x"})
+            assert created["ok"]
+            assert await asyncio.to_thread(storage.saving.wait, 10)
+            response = await asyncio.wait_for(server.handle_command({"op": "query", "status": "pending"}), timeout=5)
+            assert not storage.saved.is_set()
+            return response
+        finally:
+            storage.release.set()
+            await server.stop()
+
+    response = asyncio.run(session())
+    assert response["ok"] and len(response["incidents"]) == 1
+
+def _exchange(tmp_path, lines: List[bytes]) -> List[Dict]:
+
+    async def session() -> List[Dict]:
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli = IncidentCLI(IncidentStorageHandler(str(tmp_path / "incidents.json")))
+        server = IncidentServer(cli, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port, limit=MAX_LINE_BYTES * 4)
+            responses = []
+            for line in lines:
+                writer.write(line + b"\n")
+                await writer.drain()
+                reply = await asyncio.wait_for(reader.readline(), timeout=10)
+                responses.append(json.loads(reply) if reply else None)
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.stop()
+
+    return asyncio.run(session())
+
+
+def test_bad_lines_get_an_error_and_the_connection_stays_open(tmp_path):
+
+    responses = _exchange(tmp_path, [
+        b"{not json",
+        b"[1, 2]",
+        b'"create"',
+        b'{"op": "delete", "request_id": 7}',
+        b'{"op": ["query"]}',
+        b'{"op": "query", "page_size": true}',
+        b'{"op": "assign", "id": "999"}',
+        b'{"op": "create", "incident_type": "security", "priority_level": "high"}',
+        b"\xff\xfe{}",
+        b'{"op": "query", "request_id": ' + b"[" * 100000 + b"]" * 100000 + b"}",
+        b'{"op": "create", "incident_type": "security", "priority_level": "high", "description": "x", "request_id": "last"}',
+    ])
+
+    assert [response["ok"] for response in responses] == [False] * 10 + [True]
+    assert responses[3]["request_id"] == 7 and "delete" in responses[3]["error"]
+    assert (responses[-1]["id"], responses[-1]["request_id"]) == ("001", "last")
+
+
+def test_an_oversized_line_closes_only_that_connection(tmp_path):
+
+    responses = _exchange(tmp_path, [b'{"op": "query", "text": "' + b"a" * (MAX_LINE_BYTES + 1) + b'"}'])
+    assert responses == [None]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import contextlib
+import dataclasses
+import io
+import struct
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from cli.interface import IncidentCLI
+from persistence import snapshot
+from persistence.snapshot import SnapshotIncidentStorageHandler, SnapshotReader, write_snapshot
+
+
+def test_open_incidents_are_read_without_decoding_history(tmp_path):
+
+    file_path = str(tmp_path / "incidents.snap")
+    incidents = generate_incidents(WorkloadSpec(count=2000, seed=3))
+    write_snapshot(file_path, incidents)
+    storage = SnapshotIncidentStorageHandler(file_path)
+
+    assert list(storage.iter_open_incidents()) == [incident for incident in incidents if incident.status != "resolved"]
+    assert storage.max_incident_id() == max(int(incident.id) for incident in incidents)
+    assert SnapshotIncidentStorageHandler(str(tmp_path / "missing.snap")).max_incident_id() is None
+
+
+def test_fast_start_without_a_manifest_reads_open_rows_from_the_snapshot(tmp_path):
+
+    file_path = str(tmp_path / "incidents.snap")
+    write_snapshot(file_path, generate_incidents(WorkloadSpec(count=2000, seed=3)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        fast = IncidentCLI(SnapshotIncidentStorageHandler(file_path), fast_start=True)
+        full = IncidentCLI(SnapshotIncidentStorageHandler(file_path))
+    assert fast._history_loader is not None
+    assert fast.create_incident("security", "high", "new").id == full.create_incident("security", "high", "new").id
+
+    assert [(incident.id, incident.status) for incident in fast.query_incidents()] == [
+        (incident.id, incident.status) for incident in full.query_incidents()
+    ]
+    assert fast.check_index_consistency() == []
+    fast.close()
+    full.close()
+
+
+def test_rule_defined_types_and_operators_past_one_byte_round_trip(tmp_path):
+
+    file_path = str(tmp_path / "incidents.snap")
+    incidents = [
+        dataclasses.replace(incident, incident_type=f"type-{number}", assigned_operator=f"operator-{number}")
+        for number, incident in enumerate(generate_incidents(WorkloadSpec(count=700, seed=3)))
+    ]
+    write_snapshot(file_path, incidents)
+    with SnapshotReader(file_path) as reader:
+        assert list(reader) == incidents
+
+
+def test_snapshots_written_in_the_previous_format_still_load(tmp_path, monkeypatch):
+
+    file_path = str(tmp_path / "incidents.snap")
+    incidents = generate_incidents(WorkloadSpec(count=200, seed=3))
+    monkeypatch.setattr(snapshot, "RECORD", struct.Struct("<qqQIQIHBBBxIqqq"))
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", 3)
+    write_snapshot(file_path, incidents)
+    monkeypatch.undo()
+
+    with SnapshotReader(file_path) as reader:
+        assert list(reader) == incidents
+
+def test_cli_changes_survive_a_save_and_reload(tmp_path):
+
+    file_path = str(tmp_path / "incidents.snap")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(SnapshotIncidentStorageHandler(file_path))
+        first = cli.create_incident("security", "high", "breach")
+        second = cli.create_incident("application", "low", "slow page")
+        cli.assign_incident(first.id)
+        cli.resolve_incident(first.id)
+        cli.assign_incident(second.id)
+        cli.save_all_incidents()
+        expected = cli.query_incidents()
+        cli.close()
+
+        reloaded = IncidentCLI(SnapshotIncidentStorageHandler(file_path))
+    assert reloaded.query_incidents() == expected
+    assert [incident.status for incident in expected] == ["resolved", "in_progress"]
+    reloaded.close()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import re
+import pytest
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from cli.interface import IncidentCLI
+from incident.models import incident_to_dict
+from persistence.factory import create_storage_handler
+from persistence.storage import IncidentStorageHandler
+
+
+def _cli(file_path: str) -> IncidentCLI:
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return IncidentCLI(create_storage_handler("sqlite", file_path))
+
+
+def _ids(incidents) -> list:
+
+    return [incident.id for incident in incidents]
+
+
+def test_sqlite_changes_survive_a_restart(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    cli = _cli(file_path)
+    first = cli.create_incident("security", "high", "breach")
+    second = cli.create_incident("application", "low", "slow page")
+    cli.create_incident("infrastructure", "medium", "disk full")
+    cli.assign_incident(first.id)
+    cli.resolve_incident(first.id)
+    cli.assign_incident(second.id)
+    cli.save_all_incidents()
+    expected = [incident_to_dict(incident) for incident in cli.query_incidents()]
+    cli.close()
+
+    reloaded = _cli(file_path)
+    assert [incident_to_dict(incident) for incident in reloaded.query_incidents()] == expected
+    assert [incident["status"] for incident in expected] == ["resolved", "in_progress", "pending"]
+    assert reloaded.create_incident("security", "low", "next").id == "004"
+    reloaded.close()
+
+
+def test_the_first_start_migrates_the_json_archive(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    incidents = generate_incidents(WorkloadSpec(count=300, seed=11))
+    IncidentStorageHandler(file_path).save_all_incidents_to_json(incidents)
+
+    storage = create_storage_handler("sqlite", file_path)
+    assert [incident_to_dict(incident) for incident in storage.load_all_incidents()] == [incident_to_dict(incident) for incident in incidents]
+    assert storage.max_incident_id() == 300
+    storage.close()
+
+
+def test_pushed_down_queries_match_filtering_in_python(tmp_path):
+
+    incidents = generate_incidents(WorkloadSpec(count=400, seed=3))
+    storage = create_storage_handler("sqlite", str(tmp_path / "incidents.json"))
+    storage.insert_incidents(incidents)
+    operator = next(incident.assigned_operator for incident in incidents if incident.assigned_operator)
+    start, end = incidents[50].created_at, incidents[250].created_at
+
+    assert _ids(storage.query_incidents(status="escalated")) == _ids(i for i in incidents if i.status == "escalated")
+    assert _ids(storage.query_incidents(operator=operator, start_date=start, end_date=end)) == _ids(
+        i for i in incidents if i.assigned_operator == operator and start <= i.created_at <= end
+    )
+    assert _ids(storage.query_incidents(pattern=r"disk|lat\w+")) == _ids(i for i in incidents if re.search(r"disk|lat\w+", i.description))
+
+    pages, after = [], None
+    while True:
+        page = list(storage.query_incidents(status="resolved", after=after, limit=37))
+        if not page:
+            break
+        pages += page
+        after = (int(page[-1].id), page[-1].id)
+    assert _ids(pages) == _ids(i for i in incidents if i.status == "resolved")
+
+    with pytest.raises(re.error):
+        list(storage.query_incidents(pattern="(unclosed"))
+    with pytest.raises(ValueError):
+        list(storage.query_incidents(order_by="priority"))
+    storage.close()
+
+
+def test_a_failed_bulk_insert_leaves_nothing_behind(tmp_path):
+
+    storage = create_storage_handler("sqlite", str(tmp_path / "incidents.json"))
+    incidents = generate_incidents(WorkloadSpec(count=10, seed=1))
+
+    def broken():
+        yield from incidents
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        storage.insert_incidents(broken())
+    assert storage.load_all_incidents() == []
+    storage.close()
\ No newline at end of file
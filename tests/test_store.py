@@ -0,0 +1,39 @@
+from datetime import datetime
+import pytest
+from incident.models import Incident
+from incident.store import IncidentStore, normalize_incident_id
+
+
+def _incident(incident_id: str, status: str = "pending") -> Incident:
+
+    return Incident(incident_id, "security", "high", "breach", datetime(2024, 1, 1), None, status)
+
+
+@pytest.mark.parametrize("typed, stored", [("1", "001"), (" 007 ", "007"), ("0042", "042"), ("1234", "1234"), ("web-1", "web-1")])
+def test_typed_ids_are_normalized(typed, stored):
+
+    assert normalize_incident_id(typed) == stored
+
+
+def test_lookup_replace_and_remove_keep_insertion_order():
+
+    store = IncidentStore([_incident("001"), _incident("002"), _incident("003")])
+    assert store.get("2").id == "002" and "3" in store and store.get("9") is None
+
+    store.replace(_incident("002", "in_progress"))
+    assert [(incident.id, incident.status) for incident in store] == [("001", "pending"), ("002", "in_progress"), ("003", "pending")]
+
+    assert store.remove("1").id == "001"
+    assert [incident.id for incident in store.values()] == ["002", "003"]
+    assert len(store) == 2 and store
+
+
+def test_duplicates_and_unknown_ids_are_rejected():
+
+    store = IncidentStore([_incident("001")])
+    with pytest.raises(KeyError):
+        store.add(_incident("001"))
+    with pytest.raises(KeyError):
+        store.replace(_incident("002"))
+    with pytest.raises(KeyError):
+        store.remove("002")
\ No newline at end of file
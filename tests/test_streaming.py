@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+from datetime import datetime
+import pytest
+from cli.interface import IncidentCLI
+from incident.models import Incident, incident_from_dict, incident_to_dict
+from persistence import streaming
+from persistence.storage import IncidentStorageHandler
+from persistence.streaming import LazyIncidentArchive, iter_incidents_from_json, iter_json_array_records
+
+
+def _incident(number: int, status: str = "pending") -> Incident:
+
+    return Incident(
+        id=str(number).zfill(3), incident_type="security", priority_level="high",
+        description=f"café ☃ incident {number}", created_at=datetime(2024, 1, 1, 8, number % 60),
+        assigned_operator="alice" if status != "pending" else None, status=status, version=1
+    )
+
+
+def _write(path, text: str) -> str:
+
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_streaming_matches_json_load(tmp_path, chunk_size):
+
+    incidents = [_incident(number, "resolved" if number % 3 == 0 else "pending") for number in range(40)]
+    file_path = _write(tmp_path / "incidents.json", json.dumps([incident_to_dict(incident) for incident in incidents], indent=4))
+
+    assert list(iter_incidents_from_json(file_path, chunk_size)) == incidents
+    raw = open(file_path, "rb").read()
+    for offset, length, record in iter_json_array_records(file_path, chunk_size):
+        assert json.loads(raw[offset:offset + length]) == record
+
+    archive = LazyIncidentArchive(file_path, chunk_size)
+    assert [incident.id for incident in archive.open_incidents] == [incident.id for incident in incidents if incident.status != "resolved"]
+    assert archive.get_resolved("003") == incidents[3]
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", ""])
+def test_streaming_accepts_empty_archives(tmp_path, text):
+
+    assert list(iter_json_array_records(_write(tmp_path / "incidents.json", text))) == []
+
+
+@pytest.mark.parametrize("text", [
+    '{"id": "001"}', '[{"id": "001"}', '[{"id": "001"} garbage]',
+    # Exactly one comma between records, none before the first or after the last.
+    '[{"id": "001"} {"id": "002"}]', '[{"id": "001"},, {"id": "002"}]', '[, {"id": "001"}]',
+    '[{"id": "001"},]', '[,]',
+    # Every element must be an object.
+    '[{"id": "001"}, 5]', '["001"]', '[null]', '[[{"id": "001"}]]',
+])
+def test_streaming_rejects_malformed_archives(tmp_path, text):
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array_records(_write(tmp_path / "incidents.json", text), chunk_size=4))
+
+def test_json_storage_reads_open_incidents_for_fast_start(tmp_path, monkeypatch):
+
+    file_path = str(tmp_path / "incidents.json")
+    incidents = [_incident(number, "resolved" if number % 3 == 0 else "pending") for number in range(1, 40)]
+    IncidentStorageHandler(file_path).save_all_incidents_to_json(incidents)
+    storage = IncidentStorageHandler(file_path, chunk_size=7)
+    assert list(storage.iter_open_incidents()) == [incident for incident in incidents if incident.status != "resolved"]
+    assert storage.max_incident_id() == 39
+
+    # Without a manifest, start-up decodes no resolved record; they arrive with the history load.
+    decoded = []
+    monkeypatch.setattr(streaming, "incident_from_dict", lambda record: decoded.append(record["status"]) or incident_from_dict(record))
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(IncidentStorageHandler(file_path), fast_start=True)
+    assert set(decoded) == {"pending"}
+    assert cli.create_incident("security", "high", "new").id == "040"
+    assert len(cli.query_incidents(status="resolved")) == 13
+    cli.close()
+
+
+def test_fast_start_reports_a_damaged_archive(tmp_path, capsys):
+
+    file_path = _write(tmp_path / "incidents.json", "[" + json.dumps(incident_to_dict(_incident(1))) + ",, ]")
+    cli = IncidentCLI(IncidentStorageHandler(file_path), fast_start=True)
+    assert "invalid or empty" in capsys.readouterr().out
+    assert cli.query_incidents() == []
+    cli.close()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import re
+import pytest
+from incident.text_index import DescriptionTextIndex, compile_search_pattern, incident_id_key
+
+PATTERNS = [r"disk full", r"\bdisk\b", r"timeout|refused", r"host-\d+", r"(?i)DISK", r"(\w)\1", r"full on host-1\b"]
+
+
+def _brute_force(descriptions: dict, pattern: str) -> tuple:
+
+    return tuple(sorted((incident_id for incident_id, description in descriptions.items() if re.search(pattern, description)),
+                        key=incident_id_key))
+
+
+def test_postings_are_built_on_the_first_search_and_kept_current():
+
+    index = DescriptionTextIndex()
+    descriptions = {}
+    for number in range(1, 60):
+        descriptions[str(number).zfill(3)] = f"disk {'full' if number % 3 else 'slow'} on host-{number} {'timeout' if number % 5 else 'refused'}"
+        index.add(str(number).zfill(3), descriptions[str(number).zfill(3)])
+    assert not index._tokens and not index._trigrams
+    # A pattern without literals scans descriptions and needs no postings.
+    assert index.search(r"(\w)\1") == _brute_force(descriptions, r"(\w)\1")
+    assert not index._tokens
+
+    for pattern in PATTERNS:
+        assert index.search(pattern) == _brute_force(descriptions, pattern), pattern
+    assert index._tokens
+
+    for incident_id in ("003", "010", "011"):
+        index.remove(incident_id)
+        del descriptions[incident_id]
+    descriptions["100"] = "disk full on host-100 refused"
+    index.add("100", descriptions["100"])
+    for pattern in PATTERNS:
+        assert index.search(pattern) == _brute_force(descriptions, pattern), pattern
+
+
+def test_compiled_patterns_are_cached():
+
+    assert compile_search_pattern(r"disk \d+") is compile_search_pattern(r"disk \d+")
+    with pytest.raises(re.error):
+        compile_search_pattern("(")
\ No newline at end of file
@@ -0,0 +1,117 @@
+import contextlib
+import io
+import os
+import re
+from benchmarks.workload import WorkloadSpec, generate_incidents
+from cli.interface import IncidentCLI
+from incident.indexes import created_at_key
+from incident.models import incident_to_dict
+from persistence import tiered
+from persistence.factory import create_storage_handler
+from persistence.journal import JournaledIncidentStorageHandler
+from persistence.storage import IncidentStorageHandler
+from persistence.tiered import HOT_FILE_NAME, SEALED_FILE_NAME, TieredIncidentStorageHandler, migrate_json_to_tiered
+
+
+def _dicts(incidents) -> list:
+
+    return [incident_to_dict(incident) for incident in incidents]
+
+
+def _archive(tmp_path, count: int = 600):
+
+    # Six hours apart, so the incidents span several monthly partitions.
+    incidents = generate_incidents(WorkloadSpec(count=count, seed=9, spacing_seconds=6 * 3600))
+    json_path = str(tmp_path / "incidents.json")
+    IncidentStorageHandler(json_path).save_all_incidents_to_json(incidents)
+    directory = str(tmp_path / "incidents.archive")
+    migrate_json_to_tiered(json_path, directory, codec="zlib", seal_threshold=100)
+    return incidents, directory
+
+
+def test_tiered_changes_survive_a_restart(tmp_path):
+
+    file_path = str(tmp_path / "incidents.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = IncidentCLI(create_storage_handler("tiered", file_path))
+    first = cli.create_incident("security", "high", "breach")
+    second = cli.create_incident("application", "low", "slow page")
+    cli.assign_incident(first.id)
+    cli.resolve_incident(first.id)
+    cli.assign_incident(second.id)
+    cli.save_all_incidents()
+    expected = _dicts(cli.query_incidents())
+    cli.close()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        reloaded = IncidentCLI(create_storage_handler("tiered", file_path))
+    assert _dicts(reloaded.query_incidents()) == expected
+    assert [incident["status"] for incident in expected] == ["resolved", "in_progress"]
+    reloaded.close()
+
+
+def test_migration_seals_resolved_incidents_into_monthly_segments(tmp_path):
+
+    incidents, directory = _archive(tmp_path)
+    storage = TieredIncidentStorageHandler(directory, codec="zlib", seal_threshold=100)
+    summaries = storage.segment_summaries()
+    open_ids = [incident.id for incident in incidents if incident.status != "resolved"]
+
+    assert len({summary.partition for summary in summaries}) > 1
+    assert sum(summary.count for summary in summaries) + len(storage._hot) == len(incidents)
+    assert all(summary.statuses.keys() == {"resolved"} for summary in summaries)
+    assert [incident.id for incident in storage.iter_open_incidents()] == open_ids
+    assert _dicts(storage.load_all_incidents()) == _dicts(incidents)
+    assert storage.max_incident_id() == len(incidents)
+    storage.close()
+
+
+def test_queries_match_filtering_in_python_and_skip_segments_that_cannot_match(tmp_path, monkeypatch):
+
+    incidents, directory = _archive(tmp_path)
+    storage = TieredIncidentStorageHandler(directory, codec="zlib", seal_threshold=100)
+    operator = next(incident.assigned_operator for incident in incidents if incident.assigned_operator)
+    start, end = incidents[100].created_at, incidents[300].created_at
+
+    assert _dicts(storage.query_incidents(operator=operator, start_date=start, end_date=end)) == _dicts(
+        incident for incident in incidents if incident.assigned_operator == operator and start <= incident.created_at <= end
+    )
+    assert _dicts(storage.query_incidents(pattern=r"disk|lat\w+")) == _dicts(
+        incident for incident in incidents if re.search(r"disk|lat\w+", incident.description)
+    )
+    assert _dicts(storage.query_incidents(order_by="created_at", limit=50)) == _dicts(sorted(incidents, key=created_at_key)[:50])
+
+    pages, after = [], None
+    while True:
+        page = list(storage.query_incidents(status="resolved", after=after, limit=41))
+        if not page:
+            break
+        pages += page
+        after = (int(page[-1].id), page[-1].id)
+    assert _dicts(pages) == _dicts(incident for incident in incidents if incident.status == "resolved")
+
+    opened = []
+    monkeypatch.setattr(tiered, "read_segment", lambda file_path: opened.append(file_path) or [])
+    fresh = TieredIncidentStorageHandler(directory, codec="zlib", seal_threshold=100)
+    assert len(list(fresh.query_incidents(status="pending"))) == sum(incident.status == "pending" for incident in incidents)
+    assert opened == []
+    storage.close()
+    fresh.close()
+
+
+def test_a_seal_interrupted_before_its_confirmation_leaves_no_duplicates(tmp_path):
+
+    incidents, directory = _archive(tmp_path)
+    storage = TieredIncidentStorageHandler(directory, codec="zlib", seal_threshold=100)
+    everything = storage.load_all_incidents()
+    storage.close()
+
+    # As if the process died after writing the segments but before shrinking the hot tier.
+    hot = JournaledIncidentStorageHandler(os.path.join(directory, HOT_FILE_NAME))
+    hot.save_all_incidents(everything)
+    hot.close()
+    os.remove(os.path.join(directory, SEALED_FILE_NAME))
+
+    recovered = TieredIncidentStorageHandler(directory, codec="zlib", seal_threshold=100000)
+    assert _dicts(recovered.load_all_incidents()) == _dicts(incidents)
+    recovered.close()
\ No newline at end of file